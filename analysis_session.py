@@ -0,0 +1,221 @@
+# analysis_session.py
+#
+# Keeps one JD and a pool of candidates analysed, and updates the results
+# incrementally as either side is edited:
+#
+#   session = AnalysisSession(jd_skills)
+#   session.set_resume("alice", alice_skills)
+#   session.set_jd(edited_jd_skills)        # -> what changed for every candidate
+#   session.result("alice"), session.ranking(top_k=10)
+#
+# Every skill string is encoded once per session. For each (JD skill,
+# candidate) pair only the best resume score and its position are stored,
+# as the columns of two (n_jd, n_candidates) matrices:
+#   - a JD edit drops the rows of removed skills and scores only the added
+#     skills against the pool
+#   - a resume edit rescores that candidate's column only
+#   - a threshold change re-applies the threshold to the stored scores
+
+import numpy as np
+
+import metrics
+from nlp_utils import (encode_skills, lexical_matches, _segment_best, _apply_lexical_matches,
+                       _column_result)
+
+
+class AnalysisSession:
+    def __init__(self, jd_skills=(), threshold=0.60):
+        self.threshold = threshold
+        self.jd_skills = []
+        self.candidates = []        # candidate ids, in column order
+        self.resume_skills = {}     # id -> skill list
+
+        self._vectors = {}          # skill -> unit embedding
+        self._column = {}           # id -> column in _best / _best_pos
+        self._best = np.empty((0, 0), dtype=np.float32)
+        self._best_pos = np.empty((0, 0), dtype=np.int64)
+        self._pool = None           # stacked resume embeddings, rebuilt after resume edits
+
+        if jd_skills:
+            self.set_jd(jd_skills)
+
+    # ---------- EMBEDDINGS ----------
+    def _embed(self, skills):
+        new = [s for s in dict.fromkeys(skills) if s not in self._vectors]
+        if new:
+            self._vectors.update(zip(new, encode_skills(new)))
+        if not skills:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([self._vectors[s] for s in skills])
+
+    def _score_column(self, jd_skills, skills):
+        """Best score and position in `skills` for each JD row, for one candidate."""
+        if not skills or not jd_skills:
+            return (np.full(len(jd_skills), -np.inf, dtype=np.float32),
+                    np.full(len(jd_skills), -1, dtype=np.int64))
+        sim = self._embed(jd_skills) @ self._embed(skills).T
+        pos = sim.argmax(axis=1)
+        best = sim[np.arange(len(sim)), pos]
+        _apply_lexical_matches(best[:, None], pos[:, None], [skills], jd_skills)
+        return best, pos
+
+    # ---------- EDITS ----------
+    def set_jd(self, jd_skills):
+        """Replace the JD skills; returns {candidate: diff} for every candidate."""
+        jd_skills = list(dict.fromkeys(jd_skills))
+        with metrics.span("session_update"):
+            wanted = set(jd_skills)
+            kept = [i for i, s in enumerate(self.jd_skills) if s in wanted]
+            removed = [s for s in self.jd_skills if s not in wanted]
+            row = {self.jd_skills[i]: r for r, i in enumerate(kept)}
+            best = self._best[kept]
+            best_pos = self._best_pos[kept]
+
+            added = [s for s in jd_skills if s not in row]
+            if added:
+                new_best, new_pos = self._score_pool(added)
+                best = np.concatenate((best, new_best))
+                best_pos = np.concatenate((best_pos, new_pos))
+                row.update((s, len(kept) + k) for k, s in enumerate(added))
+
+            # Rows follow the new JD order
+            order = [row[s] for s in jd_skills]
+            self._best, self._best_pos = best[order], best_pos[order]
+            self.jd_skills = jd_skills
+
+            # Kept rows are unchanged, so only the added skills can flip
+            added_hit = self._best[[row[s] for s in added]] >= self.threshold
+            diffs = self._empty_diffs(removed)
+            for k, col in zip(*np.nonzero(added_hit)):
+                diffs[self.candidates[col]]["matched"].append(added[k])
+            for k, col in zip(*np.nonzero(~added_hit)):
+                diffs[self.candidates[col]]["missing"].append(added[k])
+            return diffs
+
+    def _score_pool(self, jd_skills):
+        """(n_added, n_candidates) best scores / positions for new JD rows."""
+        n = len(self.candidates)
+        best = np.full((len(jd_skills), n), -np.inf, dtype=np.float32)
+        best_pos = np.full((len(jd_skills), n), -1, dtype=np.int64)
+
+        cols, offsets, pool = self._pool_matrix()
+        if not len(cols):
+            return best, best_pos
+
+        seg_best, seg_cols = _segment_best(self._embed(jd_skills) @ pool.T, offsets)
+        seg_pos = seg_cols - offsets
+        lists = [self.resume_skills[self.candidates[col]] for col in cols]
+        _apply_lexical_matches(seg_best, seg_pos, lists, jd_skills)
+        best[:, cols] = seg_best
+        best_pos[:, cols] = seg_pos
+        return best, best_pos
+
+    def _pool_matrix(self):
+        """All non-empty candidates side by side as column segments of one matrix."""
+        if self._pool is None:
+            cols = [self._column[c] for c in self.candidates if self.resume_skills[c]]
+            lists = [self.resume_skills[self.candidates[col]] for col in cols]
+            lengths = np.array([len(s) for s in lists], dtype=np.int64)
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+            self._pool = (np.array(cols, dtype=np.int64), offsets,
+                          self._embed([s for skills in lists for s in skills]))
+        return self._pool
+
+    def set_resume(self, candidate, skills):
+        """Add or replace one candidate's skills; returns its diff."""
+        skills = list(dict.fromkeys(skills))
+        with metrics.span("session_update"):
+            new = candidate not in self._column
+            if new:
+                before = set()
+                self._column[candidate] = len(self.candidates)
+                self.candidates.append(candidate)
+                m = len(self.jd_skills)
+                self._best = np.hstack((self._best, np.full((m, 1), -np.inf, dtype=np.float32)))
+                self._best_pos = np.hstack((self._best_pos, np.full((m, 1), -1, dtype=np.int64)))
+            else:
+                before = self._matched(candidate)
+
+            self.resume_skills[candidate] = skills
+            self._pool = None
+            col = self._column[candidate]
+            self._best[:, col], self._best_pos[:, col] = self._score_column(self.jd_skills, skills)
+
+            return self._diff(before, self._matched(candidate), new)
+
+    def remove_resume(self, candidate):
+        col = self._column.pop(candidate)
+        del self.resume_skills[candidate]
+        self._pool = None
+        self.candidates.pop(col)
+        self._best = np.delete(self._best, col, axis=1)
+        self._best_pos = np.delete(self._best_pos, col, axis=1)
+        for c in self.candidates[col:]:
+            self._column[c] -= 1
+
+    def set_threshold(self, threshold):
+        """Re-apply a new threshold to the stored scores; returns {candidate: diff}."""
+        old_hit = self._best >= self.threshold
+        self.threshold = threshold
+        new_hit = self._best >= threshold
+
+        diffs = self._empty_diffs([])
+        for j, col in zip(*np.nonzero(new_hit & ~old_hit)):
+            diffs[self.candidates[col]]["matched"].append(self.jd_skills[j])
+        for j, col in zip(*np.nonzero(old_hit & ~new_hit)):
+            diffs[self.candidates[col]]["missing"].append(self.jd_skills[j])
+        return diffs
+
+    def _empty_diffs(self, removed):
+        pct = self._match_pcts()
+        return {c: {"matched": [], "missing": [], "removed": removed, "match_pct": int(pct[col])}
+                for c, col in self._column.items()}
+
+    # ---------- RESULTS ----------
+    def _match_pcts(self):
+        if not self.jd_skills:
+            return np.zeros(len(self.candidates), dtype=int)
+        return ((self._best >= self.threshold).sum(axis=0) / len(self.jd_skills) * 100).astype(int)
+
+    def _matched(self, candidate):
+        hit = self._best[:, self._column[candidate]] >= self.threshold
+        return {s for s, h in zip(self.jd_skills, hit) if h}
+
+    def _diff(self, before, after, new=False):
+        """Diff of one candidate's matched JD skills (the JD itself unchanged).
+
+        For a new candidate every unmatched JD skill counts as newly missing.
+        """
+        return {
+            "matched": [s for s in self.jd_skills if s in after and s not in before],
+            "missing": [s for s in self.jd_skills if s not in after and (new or s in before)],
+            "removed": [],
+            "match_pct": int(len(after) / len(self.jd_skills) * 100) if self.jd_skills else 0,
+        }
+
+    def result(self, candidate):
+        """compare_skill_sets-style result for one candidate."""
+        skills = self.resume_skills[candidate]
+        if not skills or not self.jd_skills:
+            return {"matches": [], "missing": list(self.jd_skills), "match_pct": 0,
+                    "fast_path_pct": 0}
+        col = self._column[candidate]
+        n_exact = len(lexical_matches(skills, self.jd_skills))
+        return _column_result(skills, self.jd_skills, self._best[:, col], self._best_pos[:, col],
+                              self.threshold, n_exact)
+
+    def ranking(self, top_k=None):
+        """[(candidate, match_pct)] ordered like nlp_utils.rank_resumes."""
+        n = len(self.candidates)
+        if not n:
+            return []
+        pct = self._match_pcts()
+        if self.jd_skills:
+            mean_best = np.where(np.isfinite(self._best), self._best, 0).mean(axis=0)
+        else:
+            mean_best = np.zeros(n)
+
+        order = np.lexsort((np.arange(n), -mean_best, -pct))
+        if top_k is not None:
+            order = order[:top_k]
+        return [(self.candidates[i], int(pct[i])) for i in order]
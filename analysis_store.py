@@ -0,0 +1,406 @@
+# analysis_store.py
+#
+# Persistent store of analysed documents and their results, so a candidate
+# pool can be searched and re-screened without re-running extraction and
+# encoding:
+#
+#   store = AnalysisStore("analyses.db")
+#   store.record(content_hash(resume_bytes), content_hash(jd_bytes), 0.60, result,
+#                resume_name="alice.pdf", jd_name="backend.pdf", candidate_name="Alice")
+#   store.search(jd_hash, skills=["docker", "aws"], min_pct=70)   # -> candidates, best first
+#   store.rescreen(jd_hash)    # every stored resume vs. a JD, from stored embeddings
+#
+#   python analysis_store.py search --store analyses.db --jd backend.pdf --skills docker aws --min-pct 70
+#
+# Documents are keyed by the SHA-256 of their bytes. Skills are indexed in
+# canonical form (aliases resolved): per resume, and per matched JD skill of
+# every analysis. Each resume keeps its skill embeddings. Rows carry
+# MODEL_VERSION, and rows from another pipeline version are ignored.
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+
+import metrics
+from nlp_utils import (canonical_skill, encode_skills, _segment_best, _apply_lexical_matches,
+                       _column_result, ENCODER_ID, MODEL_VERSION)
+
+
+DEFAULT_STORE_PATH = os.environ.get("SKILLGAP_STORE", "analyses.db")
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS documents ("
+    " hash TEXT PRIMARY KEY, kind TEXT NOT NULL, name TEXT NOT NULL,"
+    " candidate_name TEXT NOT NULL, skills TEXT NOT NULL, version TEXT NOT NULL,"
+    " added REAL NOT NULL)",
+    # Inverted index: canonical skill -> documents listing it
+    "CREATE TABLE IF NOT EXISTS document_skills ("
+    " skill TEXT NOT NULL, hash TEXT NOT NULL, PRIMARY KEY (skill, hash)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS embeddings ("
+    " hash TEXT NOT NULL, encoder TEXT NOT NULL, dim INTEGER NOT NULL,"
+    " vectors BLOB NOT NULL, PRIMARY KEY (hash, encoder))",
+    "CREATE TABLE IF NOT EXISTS analyses ("
+    " id INTEGER PRIMARY KEY, resume_hash TEXT NOT NULL, jd_hash TEXT NOT NULL,"
+    " threshold REAL NOT NULL, version TEXT NOT NULL, match_pct INTEGER NOT NULL,"
+    " result TEXT NOT NULL, added REAL NOT NULL,"
+    " UNIQUE (resume_hash, jd_hash, threshold, version))",
+    "CREATE INDEX IF NOT EXISTS analyses_by_jd"
+    " ON analyses (jd_hash, version, threshold, match_pct)",
+    # Inverted index: canonical matched JD skill -> analyses
+    "CREATE TABLE IF NOT EXISTS matched_skills ("
+    " skill TEXT NOT NULL, analysis_id INTEGER NOT NULL,"
+    " PRIMARY KEY (skill, analysis_id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS matched_skills_by_analysis ON matched_skills (analysis_id)",
+)
+
+RESULT_FIELDS = ("matches", "missing", "match_pct", "fast_path_pct")
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _threshold_key(threshold):
+    # Thresholds are compared for equality in SQL
+    return round(float(threshold), 4)
+
+
+class AnalysisStore:
+    """SQLite store of documents, skill embeddings and analyses.
+
+    One connection per store, shared by the threads of a process behind a
+    lock; separate processes (batch workers) open their own store on the
+    same file and rely on SQLite's locking.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, version=MODEL_VERSION, encoder=ENCODER_ID):
+        self.path = path
+        self.version = version
+        self.encoder = encoder
+        self._lock = threading.Lock()
+
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Durable at checkpoints rather than on every commit; the store can be rebuilt
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._db.execute(statement)
+
+    def close(self):
+        self._db.close()
+
+    def _write(self, fn):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._db)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return out
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # ---------- DOCUMENTS ----------
+    def put_document(self, doc_hash, kind, skills, name="", candidate_name=""):
+        skills = list(skills)
+        index = sorted({canonical_skill(s) for s in skills})
+
+        def write(db):
+            old = db.execute("SELECT skills, version FROM documents WHERE hash = ?",
+                             (doc_hash,)).fetchone()
+            db.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (doc_hash, kind, name, candidate_name, json.dumps(skills),
+                        self.version, time.time()))
+            if old == (json.dumps(skills), self.version):
+                return
+            db.execute("DELETE FROM document_skills WHERE hash = ?", (doc_hash,))
+            db.executemany("INSERT INTO document_skills VALUES (?, ?)",
+                           [(s, doc_hash) for s in index])
+            # Embeddings follow the skill list
+            db.execute("DELETE FROM embeddings WHERE hash = ?", (doc_hash,))
+
+        self._write(write)
+
+    def get_document(self, doc_hash):
+        """The stored document, or None if absent or from another pipeline version."""
+        rows = self._query("SELECT kind, name, candidate_name, skills FROM documents"
+                           " WHERE hash = ? AND version = ?", (doc_hash, self.version))
+        if not rows:
+            return None
+        kind, name, candidate_name, skills = rows[0]
+        return {"hash": doc_hash, "kind": kind, "name": name,
+                "candidate_name": candidate_name, "skills": json.loads(skills)}
+
+    def documents(self, kind):
+        rows = self._query("SELECT hash, name, candidate_name FROM documents"
+                           " WHERE kind = ? AND version = ? ORDER BY name, hash",
+                           (kind, self.version))
+        return [{"hash": h, "name": n, "candidate_name": c} for h, n, c in rows]
+
+    def put_embeddings(self, doc_hash, vectors):
+        self._put_embeddings([(doc_hash, vectors)])
+
+    def _put_embeddings(self, items):
+        rows = []
+        for doc_hash, vectors in items:
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            rows.append((doc_hash, self.encoder, vectors.shape[1] if vectors.ndim == 2 else 0,
+                         vectors.tobytes()))
+        self._write(lambda db: db.executemany(
+            "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows))
+
+    def get_embeddings(self, doc_hash):
+        rows = self._query("SELECT dim, vectors FROM embeddings WHERE hash = ? AND encoder = ?",
+                           (doc_hash, self.encoder))
+        if not rows:
+            return None
+        return _decode_vectors(*rows[0])
+
+    # ---------- ANALYSES ----------
+    def put_analysis(self, resume_hash, jd_hash, threshold, result):
+        self.put_analyses(jd_hash, threshold, [(resume_hash, result)])
+
+    def put_analyses(self, jd_hash, threshold, items):
+        """Store [(resume_hash, compare_skill_sets-style result)] for one JD."""
+        threshold = _threshold_key(threshold)
+
+        def write(db):
+            for resume_hash, result in items:
+                key = (resume_hash, jd_hash, threshold, self.version)
+                db.execute("DELETE FROM matched_skills WHERE analysis_id IN (SELECT id FROM"
+                           " analyses WHERE resume_hash = ? AND jd_hash = ? AND threshold = ?"
+                           " AND version = ?)", key)
+                db.execute("DELETE FROM analyses WHERE resume_hash = ? AND jd_hash = ?"
+                           " AND threshold = ? AND version = ?", key)
+                stored = {k: result[k] for k in RESULT_FIELDS if k in result}
+                cur = db.execute("INSERT INTO analyses (resume_hash, jd_hash, threshold, version,"
+                                 " match_pct, result, added) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 key + (result["match_pct"], json.dumps(stored), time.time()))
+                db.executemany("INSERT OR IGNORE INTO matched_skills VALUES (?, ?)",
+                               [(canonical_skill(m[1]), cur.lastrowid)
+                                for m in result["matches"]])
+
+        self._write(write)
+
+    def get_analysis(self, resume_hash, jd_hash, threshold):
+        """analyze_documents-style result, or None if it was never stored."""
+        rows = self._query(
+            "SELECT a.result, r.skills, j.skills FROM analyses a"
+            " JOIN documents r ON r.hash = a.resume_hash AND r.version = a.version"
+            " JOIN documents j ON j.hash = a.jd_hash AND j.version = a.version"
+            " WHERE a.resume_hash = ? AND a.jd_hash = ? AND a.threshold = ? AND a.version = ?",
+            (resume_hash, jd_hash, _threshold_key(threshold), self.version))
+        if not rows:
+            return None
+        result, resume_skills, jd_skills = rows[0]
+        result = json.loads(result)
+        matches = [tuple(m) for m in result["matches"]]
+        return dict(result, matches=matches, matched=[m[1] for m in matches],
+                    resume_skills=json.loads(resume_skills), jd_skills=json.loads(jd_skills))
+
+    def record(self, resume_hash, jd_hash, threshold, result, resume_name="", jd_name="",
+               candidate_name=""):
+        """Store both documents, the resume's embeddings and an analyze_documents result."""
+        self.put_document(resume_hash, "resume", result["resume_skills"], resume_name,
+                          candidate_name)
+        self.put_document(jd_hash, "jd", result["jd_skills"], jd_name)
+        if result["resume_skills"] and self.get_embeddings(resume_hash) is None:
+            self.put_embeddings(resume_hash, encode_skills(result["resume_skills"]))
+        self.put_analysis(resume_hash, jd_hash, threshold, result)
+
+    # ---------- QUERIES ----------
+    def search(self, jd_hash, skills=(), min_pct=0, threshold=0.60, limit=None):
+        """Candidates analysed against a JD with match_pct >= min_pct that
+        matched every one of `skills`, best first.
+
+        Walks the (JD, threshold, match_pct) index and probes the matched-skill
+        index per candidate, so nothing is re-extracted or re-encoded.
+        """
+        skills = list(dict.fromkeys(canonical_skill(s) for s in skills))
+        sql = ("SELECT a.resume_hash, d.name, d.candidate_name, a.match_pct FROM analyses a"
+               " JOIN documents d ON d.hash = a.resume_hash"
+               " WHERE a.jd_hash = ? AND a.version = ? AND a.threshold = ? AND a.match_pct >= ?")
+        params = [jd_hash, self.version, _threshold_key(threshold), min_pct]
+        for skill in skills:
+            sql += (" AND EXISTS (SELECT 1 FROM matched_skills m"
+                    " WHERE m.skill = ? AND m.analysis_id = a.id)")
+            params.append(skill)
+        sql += " ORDER BY a.match_pct DESC, d.name, a.resume_hash"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with metrics.span("store_search"):
+            rows = self._query(sql, params)
+        return [{"hash": h, "name": n, "candidate_name": c, "match_pct": p}
+                for h, n, c, p in rows]
+
+    def candidates_with(self, skills):
+        """Stored resumes listing every one of `skills` (exact or alias), by name."""
+        skills = list(dict.fromkeys(canonical_skill(s) for s in skills))
+        if not skills:
+            return []
+        sql = " INTERSECT ".join(["SELECT hash FROM document_skills WHERE skill = ?"] * len(skills))
+        rows = self._query(f"SELECT hash, name, candidate_name FROM documents"
+                           f" WHERE kind = 'resume' AND version = ? AND hash IN ({sql})"
+                           f" ORDER BY name, hash", [self.version] + skills)
+        return [{"hash": h, "name": n, "candidate_name": c} for h, n, c in rows]
+
+    # ---------- RE-SCREENING ----------
+    def rescreen(self, jd_hash, threshold=0.60):
+        """Analyse every stored resume without a result for this JD yet.
+
+        Uses the stored skills and embeddings, so only the JD skills (and any
+        resume stored without embeddings) are encoded. Results match
+        compare_skill_sets. Returns the number of new analyses.
+        """
+        jd = self.get_document(jd_hash)
+        if jd is None or jd["kind"] != "jd":
+            raise KeyError(f"no stored JD {jd_hash}")
+        jd_skills = jd["skills"]
+
+        rows = self._query(
+            "SELECT d.hash, d.skills, e.dim, e.vectors FROM documents d"
+            " LEFT JOIN embeddings e ON e.hash = d.hash AND e.encoder = ?"
+            " WHERE d.kind = 'resume' AND d.version = ? AND d.hash NOT IN"
+            " (SELECT resume_hash FROM analyses WHERE jd_hash = ? AND version = ?"
+            "  AND threshold = ?) ORDER BY d.hash",
+            (self.encoder, self.version, jd_hash, self.version, _threshold_key(threshold)))
+        if not rows:
+            return 0
+
+        with metrics.span("store_rescreen"):
+            pending, lists, blocks, unencoded = [], [], [], []
+            for doc_hash, skills, dim, blob in rows:
+                skills = json.loads(skills)
+                pending.append((doc_hash, skills))
+                if not skills:
+                    continue
+                lists.append(skills)
+                if blob is None:
+                    unencoded.append((len(blocks), doc_hash))
+                    blocks.append(None)
+                else:
+                    blocks.append(_decode_vectors(dim, blob))
+
+            if unencoded:
+                # One encoder call for every resume stored without embeddings
+                flat = [s for k, _ in unencoded for s in lists[k]]
+                vectors = np.split(encode_skills(flat),
+                                   np.cumsum([len(lists[k]) for k, _ in unencoded])[:-1])
+                for (k, _), v in zip(unencoded, vectors):
+                    blocks[k] = v
+                self._put_embeddings([(h, blocks[k]) for k, h in unencoded])
+
+            results = _screen(pending, lists, blocks, jd_skills, threshold)
+        self.put_analyses(jd_hash, threshold, results)
+        return len(results)
+
+    def stats(self):
+        counts = {}
+        for table in ("documents", "document_skills", "embeddings", "analyses", "matched_skills"):
+            counts[table] = self._query(f"SELECT COUNT(*) FROM {table}")[0][0]
+        return counts
+
+
+def _decode_vectors(dim, blob):
+    if not dim:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.frombuffer(blob, dtype=np.float32).reshape(-1, dim)
+
+
+def _screen(pending, lists, blocks, jd_skills, threshold):
+    """[(hash, result)] for every pending resume, all candidates in one matrix."""
+    if not jd_skills:
+        return [(h, {"matches": [], "missing": [], "match_pct": 0, "fast_path_pct": 0})
+                for h, _ in pending]
+
+    if lists:
+        lengths = np.array([len(s) for s in lists], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        sim = encode_skills(jd_skills) @ np.concatenate(blocks).T
+        best, best_cols = _segment_best(sim, offsets)
+        best_pos = best_cols - offsets
+        n_exact = _apply_lexical_matches(best, best_pos, lists, jd_skills)
+
+    results, c = [], 0
+    for doc_hash, skills in pending:
+        if not skills:
+            results.append((doc_hash, {"matches": [], "missing": list(jd_skills),
+                                       "match_pct": 0, "fast_path_pct": 0}))
+            continue
+        results.append((doc_hash, _column_result(lists[c], jd_skills, best[:, c],
+                                                 best_pos[:, c], threshold, n_exact[c])))
+        c += 1
+    return results
+
+
+# ---------- CLI ----------
+def _jd_hash(store, spec):
+    # A JD file, or the hash (or a unique prefix) of a stored one
+    if os.path.isfile(spec):
+        with open(spec, "rb") as f:
+            return content_hash(f.read())
+    matches = [d["hash"] for d in store.documents("jd") if d["hash"].startswith(spec)]
+    if len(matches) != 1:
+        raise SystemExit(f"error: {spec!r} matches {len(matches)} stored JDs")
+    return matches[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the analysis store")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    search = sub.add_parser("search", help="candidates for a JD by matched skills and score")
+    search.add_argument("--jd", required=True, help="JD file or stored JD hash (prefix)")
+    search.add_argument("--skills", nargs="*", default=[])
+    search.add_argument("--min-pct", type=int, default=0)
+    search.add_argument("--threshold", type=float, default=0.60)
+    search.add_argument("--limit", type=int)
+    search.add_argument("--rescreen", action="store_true",
+                        help="first analyse stored resumes not yet scored against this JD")
+
+    having = sub.add_parser("candidates", help="resumes listing all of the given skills")
+    having.add_argument("skills", nargs="+")
+
+    sub.add_parser("jds", help="stored job descriptions")
+    sub.add_parser("stats", help="row counts")
+    args = parser.parse_args(argv)
+
+    store = AnalysisStore(args.store)
+    if args.command == "search":
+        jd_hash = _jd_hash(store, args.jd)
+        if args.rescreen:
+            print(f"rescreened {store.rescreen(jd_hash, args.threshold)} resumes", file=sys.stderr)
+        rows = store.search(jd_hash, args.skills, args.min_pct, args.threshold, args.limit)
+        for r in rows:
+            print(f"{r['match_pct']:>4}%  {r['candidate_name'] or '-':<28} {r['name']}")
+        print(f"{len(rows)} candidates", file=sys.stderr)
+    elif args.command == "candidates":
+        for r in store.candidates_with(args.skills):
+            print(f"{r['candidate_name'] or '-':<28} {r['name']}")
+    elif args.command == "jds":
+        for d in store.documents("jd"):
+            print(f"{d['hash'][:12]}  {d['name']}")
+    else:
+        print(json.dumps(store.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+# api_server.py
+#
+# Async HTTP API for programmatic access (e.g. from an ATS):
+#
+#   python api_server.py --port 8080 --workers 4
+#
+#   POST /extract-text    PDF/DOCX upload (multipart field "file", or the raw body
+#                         with ?name=resume.pdf) -> text and candidate name
+#   POST /extract-skills  {"resume_text": ..., "jd_text": ...} -> skill lists
+#   POST /match           {"resume_text" | "resume_skills", "jd_text" | "jd_skills",
+#                          "threshold", "one_to_one"} -> matches, missing, match_pct
+#   POST /match/batch     {"jd_text" | "jd_skills", "resumes": [text | {"skills": [...]}],
+#                          "threshold", "top_k"} -> per-resume results and ranking
+#   GET  /health
+#   GET  /metrics         Prometheus text format
+#
+# The event loop only parses requests and runs the regex job-description
+# extraction; document parsing, resume skill extraction (mapped onto the
+# SKILLGAP_TAXONOMY_INDEX taxonomy when one is set) and encoding run in a
+# process pool so slow requests never block the loop.
+#
+# --preload loads the model in the server process and forks the pool from it,
+# so the workers share one copy of the weights (see shared_models.py).
+
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing as mp
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from aiohttp import web
+
+import metrics
+import shared_models
+
+
+MAX_BODY_MB = float(os.environ.get("SKILLGAP_API_MAX_BODY_MB", "10"))
+MAX_BATCH_RESUMES = int(os.environ.get("SKILLGAP_API_MAX_BATCH", "500"))
+DEFAULT_THRESHOLD = 0.60
+
+POOL_KEY = web.AppKey("pool", ProcessPoolExecutor)
+
+
+# ---------- WORKER SIDE ----------
+def _init_api_worker():
+    # Forked workers start with a copy of the server's metrics; report only their own
+    metrics.reset()
+    shared_models.init_worker()
+
+
+def _in_worker(fn, *args):
+    # The pipeline metrics (extract, encode, similarity, cache) are recorded
+    # here; they travel back with the result and are merged into /metrics
+    return fn(*args), metrics.drain()
+
+
+def _work_extract(data, name):
+    from doc_utils import extract_text, extract_candidate_name
+    text = extract_text(io.BytesIO(data), name)
+    return {"text": text, "candidate_name": extract_candidate_name(text)}
+
+
+def _parse_resume(resume):
+    # A resume is its text (parsed here, off the event loop) or its skill list
+    from nlp_utils import extract_resume_skills, get_taxonomy_index
+    if isinstance(resume, str):
+        return extract_resume_skills(resume, get_taxonomy_index())
+    return resume
+
+
+def _work_resume_skills(resume):
+    return _parse_resume(resume)
+
+
+def _work_match(resume, jd_skills, threshold, one_to_one):
+    from nlp_utils import compare_skill_sets
+    resume_skills = _parse_resume(resume)
+    result = compare_skill_sets(resume_skills, jd_skills, threshold, one_to_one)
+    return dict(_match_json(result), resume_skills=resume_skills)
+
+
+def _work_rank(resumes, jd_skills, threshold, top_k):
+    from nlp_utils import rank_resumes
+    out = rank_resumes([_parse_resume(r) for r in resumes], jd_skills, threshold, top_k)
+    return {
+        "results": [_match_json(r) for r in out["results"]],
+        "ranking": [{"index": i, "match_pct": pct} for i, pct in out["ranking"]],
+    }
+
+
+def _match_json(result):
+    return {
+        "matches": [{"resume_skill": r, "jd_skill": j, "score": round(s, 4)}
+                    for r, j, s in result["matches"]],
+        "missing": list(result["missing"]),
+        "match_pct": result["match_pct"],
+        "fast_path_pct": result["fast_path_pct"],
+    }
+
+
+# ---------- REQUEST HELPERS ----------
+def _bad_request(message, error_cls=web.HTTPBadRequest):
+    return error_cls(text=json.dumps({"error": message}), content_type="application/json")
+
+
+async def _json_body(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise _bad_request("request body must be JSON")
+    if not isinstance(body, dict):
+        raise _bad_request("request body must be a JSON object")
+    return body
+
+
+def _skill_list(value, field):
+    if not isinstance(value, list) or not all(isinstance(s, str) for s in value):
+        raise _bad_request(f"{field} must be a list of strings")
+    return value
+
+
+def _resume(body, text_field="resume_text", skills_field="resume_skills"):
+    # Validated only; the worker parses a text (see _parse_resume)
+    if skills_field in body:
+        return _skill_list(body[skills_field], skills_field)
+    if isinstance(body.get(text_field), str):
+        return body[text_field]
+    raise _bad_request(f"need {text_field} or {skills_field}")
+
+
+def _jd_skills(body):
+    from nlp_utils import get_jd_skills, filter_real_skills
+    if "jd_skills" in body:
+        return _skill_list(body["jd_skills"], "jd_skills")
+    if isinstance(body.get("jd_text"), str):
+        return filter_real_skills(get_jd_skills(body["jd_text"]))
+    raise _bad_request("need jd_text or jd_skills")
+
+
+def _threshold(body):
+    threshold = body.get("threshold", DEFAULT_THRESHOLD)
+    if not isinstance(threshold, (int, float)) or not -1 <= threshold <= 1:
+        raise _bad_request("threshold must be a number in [-1, 1]")
+    return float(threshold)
+
+
+async def _run(request, fn, *args):
+    loop = asyncio.get_running_loop()
+    result, recorded = await loop.run_in_executor(request.app[POOL_KEY], _in_worker, fn, *args)
+    metrics.merge(recorded)
+    return result
+
+
+# ---------- HANDLERS ----------
+async def extract_text_handler(request):
+    if request.content_type.startswith("multipart/"):
+        reader = await request.multipart()
+        part = await reader.next()
+        while part is not None and part.name != "file":
+            part = await reader.next()
+        if part is None:
+            raise _bad_request("multipart upload needs a 'file' field")
+        name, data = part.filename or "", await part.read()
+    else:
+        name, data = request.query.get("name", ""), await request.read()
+
+    if not name.lower().endswith((".pdf", ".docx")):
+        raise _bad_request("file name must end in .pdf or .docx")
+    if not data:
+        raise _bad_request("empty upload")
+
+    try:
+        return web.json_response(await _run(request, _work_extract, data, name))
+    except Exception as e:
+        raise _bad_request(f"could not read document: {type(e).__name__}",
+                           web.HTTPUnprocessableEntity)
+
+
+async def extract_skills_handler(request):
+    body = await _json_body(request)
+    out = {}
+    if "resume_text" in body:
+        out["resume_skills"] = await _run(request, _work_resume_skills, _resume(body))
+    if "jd_text" in body:
+        out["jd_skills"] = _jd_skills(body)
+    if not out:
+        raise _bad_request("need resume_text and/or jd_text")
+    return web.json_response(out)
+
+
+async def match_handler(request):
+    body = await _json_body(request)
+    resume, jd_skills = _resume(body), _jd_skills(body)
+    one_to_one = body.get("one_to_one", False)
+    if not isinstance(one_to_one, bool):
+        raise _bad_request("one_to_one must be true or false")
+    result = await _run(request, _work_match, resume, jd_skills, _threshold(body), one_to_one)
+    return web.json_response(dict(result, jd_skills=jd_skills))
+
+
+async def match_batch_handler(request):
+    body = await _json_body(request)
+    resumes = body.get("resumes")
+    if not isinstance(resumes, list) or not resumes:
+        raise _bad_request("resumes must be a non-empty list")
+    if len(resumes) > MAX_BATCH_RESUMES:
+        raise _bad_request(f"at most {MAX_BATCH_RESUMES} resumes per request")
+
+    # Only validated here; texts are parsed in the worker, so a large batch
+    # does not hold up the event loop
+    items = []
+    for r in resumes:
+        if isinstance(r, dict) and "skills" in r:
+            items.append(_skill_list(r["skills"], "skills"))
+        elif isinstance(r, dict) and isinstance(r.get("text"), str):
+            items.append(r["text"])
+        elif isinstance(r, str):
+            items.append(r)
+        else:
+            raise _bad_request("each resume must be a text or an object with 'skills'")
+
+    top_k = body.get("top_k")
+    if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+        raise _bad_request("top_k must be a positive integer")
+
+    jd_skills = _jd_skills(body)
+    result = await _run(request, _work_rank, items, jd_skills, _threshold(body), top_k)
+    return web.json_response(dict(result, jd_skills=jd_skills))
+
+
+async def health_handler(request):
+    return web.json_response({"status": "ok"})
+
+
+async def metrics_handler(request):
+    return web.Response(text=metrics.render_prometheus(),
+                        content_type="text/plain", charset="utf-8")
+
+
+@web.middleware
+async def metrics_middleware(request, handler):
+    route = request.match_info.route.resource
+    stage = "api" + (route.canonical.replace("/", "_").replace("-", "_") if route else "_unknown")
+    metrics.inc("api_requests")
+    with metrics.span(stage):
+        try:
+            return await handler(request)
+        except web.HTTPException as e:
+            if e.status >= 400:
+                metrics.inc("api_errors")
+            raise
+
+
+# ---------- APP ----------
+def create_app(workers=None, max_body_mb=MAX_BODY_MB, start_method="spawn", preload=False):
+    # Larger bodies are rejected with 413 before they are read
+    app = web.Application(client_max_size=int(max_body_mb * 2**20),
+                          middlewares=[metrics_middleware])
+    app.router.add_post("/extract-text", extract_text_handler)
+    app.router.add_post("/extract-skills", extract_skills_handler)
+    app.router.add_post("/match", match_handler)
+    app.router.add_post("/match/batch", match_batch_handler)
+    app.router.add_get("/health", health_handler)
+    app.router.add_get("/metrics", metrics_handler)
+
+    async def start_pool(app):
+        # With preload the models load here and the workers are forked
+        context = shared_models.pool_context(preload, start_method)
+        app[POOL_KEY] = ProcessPoolExecutor(workers or os.cpu_count(), mp_context=context,
+                                            initializer=_init_api_worker)
+
+    async def stop_pool(app):
+        app[POOL_KEY].shutdown(cancel_futures=True)
+
+    app.on_startup.append(start_pool)
+    app.on_cleanup.append(stop_pool)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skill gap analysis HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="processes for document parsing and encoding")
+    parser.add_argument("--max-body-mb", type=float, default=MAX_BODY_MB)
+    parser.add_argument("--start-method", default="spawn", choices=mp.get_all_start_methods())
+    shared_models.add_preload_argument(parser)
+    args = parser.parse_args(argv)
+
+    web.run_app(create_app(args.workers, args.max_body_mb, args.start_method, args.preload),
+                host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,27 @@
+import os
+import sys
+
 import streamlit as st
-import fitz
-import docx
-import matplotlib.pyplot as plt
-from fpdf import FPDF
-import datetime
-
-from nlp_utils import (
-    extract_resume_skills_strict,
-    get_jd_skills,
-    filter_real_skills,
-    compare_skill_sets
-)
+
+import metrics
+import model_registry
+from doc_utils import extract_text_pdf, extract_text_docx, extract_candidate_name
+from nlp_utils import analyze_documents, get_taxonomy_index, MODEL_VERSION
+from report_utils import build_report_pdf, build_combined_pdf
+from startup_profile import HEAVY_MODULES
 
 st.set_page_config(page_title="AI Skill Gap Analyzer", layout="wide")
 
+# Start loading the SBERT model in the background so the first Skill Report
+# does not pay for it (no-op once loaded or while loading).
+# SKILLGAP_WARM_UP=0 defers it to the first analysis instead.
+if os.environ.get("SKILLGAP_WARM_UP", "1") != "0":
+    model_registry.warm_up(["sbert", "skill_table", "taxonomy_index"])
+
+# Heavy libraries (pandas, PyMuPDF, python-docx, fpdf2, torch) are imported by
+# the pages and functions that use them, not at startup; the Admin page lists
+# which of startup_profile.HEAVY_MODULES are loaded
+
 
 # ----------------------------------------------------
 # PREMIUM UI + SIDEBAR NAVIGATION
@@ -144,80 +152,50 @@ st.markdown(page_bg, unsafe_allow_html=True)
 # SIDEBAR NAVIGATION
 # ----------------------------------------------------
 
+# Analyses are also kept in a persistent store when SKILLGAP_STORE names a
+# database file (see analysis_store.py), which adds the Candidate Search page
+STORE_PATH = os.environ.get("SKILLGAP_STORE")
+
 st.sidebar.title("🔍 Navigation")
 page = st.sidebar.radio(
     "Go to:",
     ["🏠 Home", "📄 Upload Resume", "🏢 Upload Job Description",
      "📊 Skill Report", "📥 Download PDF"]
+    + (["🔎 Candidate Search"] if STORE_PATH else [])
+    + ["🛠️ Admin"]
 )
 
 
 # ----------------------------------------------------
-# TEXT EXTRACTION FUNCTIONS
+# CACHED ANALYSIS PIPELINE
 # ----------------------------------------------------
 
-def extract_text_pdf(file):
-    file.seek(0)
-    pdf = fitz.open(stream=file.read(), filetype="pdf")
-    text = ""
-    for p in pdf:
-        text += p.get_text()
-    return text
+MATCH_THRESHOLD = 0.60
 
 
-def extract_text_docx(file):
-    file.seek(0)
-    d = docx.Document(file)
-    return "\n".join([p.text for p in d.paragraphs])
+# Keyed by a hash of all arguments and shared by every session, so reruns and
+# identical documents from different users skip extraction and encoding.
+# max_entries bounds the cache; the least recently used result is evicted.
+@st.cache_data(max_entries=256, show_spinner="Analyzing skills...")
+def run_analysis(resume_text, jd_text, threshold, model_version):
+    # Only counted on a cache miss; compare with "skill_reports"
+    metrics.inc("analysis_runs")
+    # model_version includes the taxonomy index (SKILLGAP_TAXONOMY_INDEX), if any
+    return analyze_documents(resume_text, jd_text, threshold, skill_index=get_taxonomy_index())
 
 
-# ----------------------------------------------------
-# UNICODE-SAFE TEXT CLEANER
-# ----------------------------------------------------
-
-def clean_text_for_pdf(text):
-    replace_map = {
-        "•": "-",
-        "✔": "-",
-        "✓": "-",
-        "–": "-",
-        "—": "-",
-        "“": '"',
-        "”": '"',
-        "’": "'",
-        "′": "'",
-        "‣": "-",
-        "·": "-",
-        "►": "-",
-        "→": "->",
-        "\u200b": "",
-    }
-    if text is None:
-        return ""
-    out = str(text)
-    for bad, good in replace_map.items():
-        out = out.replace(bad, good)
-    return out.encode("latin-1", "replace").decode("latin-1")
-# ----------------------------------------------------
-# CANDIDATE NAME EXTRACTION
-# ----------------------------------------------------
-
-def extract_candidate_name(text):
-    lines = [l.strip() for l in text.split("\n") if l.strip()]
+@st.cache_resource
+def get_store():
+    from analysis_store import AnalysisStore
+    return AnalysisStore(STORE_PATH)
 
-    for line in lines[:10]:  # look at top section only
-        clean = line.replace("-", " ").replace("–", " ").strip()
 
-        if (
-            clean.replace(" ", "").isalpha() and        # only letters
-            2 <= len(clean.split()) <= 4 and            # 2–4 words
-            not any(x in clean.lower() for x in 
-                    ["objective", "education", "skills", "project",
-                     "experience", "resume", "email", "@", "phone"])
-        ):
-            return clean.title()
-
-    return "Unknown Candidate"
+def remember_upload(kind, uploaded):
+    # Content hash and file name, for the analysis store
+    if STORE_PATH:
+        from analysis_store import content_hash
+        st.session_state[f"{kind}_hash"] = content_hash(uploaded.getvalue())
+        st.session_state[f"{kind}_name"] = uploaded.name
 
 
 # ====================================================
@@ -257,6 +235,7 @@ if page == "📄 Upload Resume":
         st.text_area("Extracted Resume Text:", resume_text, height=350)
 
         st.session_state["resume_text"] = resume_text
+        remember_upload("resume", resume_file)
         st.success("Resume uploaded successfully!")
 
 
@@ -276,6 +255,7 @@ if page == "🏢 Upload Job Description":
         st.text_area("Extracted JD Text:", jd_text, height=350)
 
         st.session_state["jd_text"] = jd_text
+        remember_upload("jd", jd_file)
         st.success("Job Description uploaded successfully!")
 
 
@@ -294,22 +274,33 @@ if page == "📊 Skill Report":
 
     st.header("📊 Skill Match Report")
 
-    # Extract skills
-    resume_skills = extract_resume_skills_strict(resume_text)
-    jd_skills = get_jd_skills(jd_text)
-
-    resume_skills = filter_real_skills(resume_skills)
-    jd_skills = filter_real_skills(jd_skills)
+    store = None
+    if STORE_PATH and "resume_hash" in st.session_state and "jd_hash" in st.session_state:
+        store = get_store()
+        resume_hash, jd_hash = st.session_state["resume_hash"], st.session_state["jd_hash"]
+
+    # Extract + compare skills (cached across reruns and sessions, and kept
+    # in the analysis store when one is configured)
+    metrics.inc("skill_reports")
+    with metrics.span("skill_report"):
+        result = store.get_analysis(resume_hash, jd_hash, MATCH_THRESHOLD) if store else None
+        if result is None:
+            result = run_analysis(resume_text, jd_text, MATCH_THRESHOLD, MODEL_VERSION)
+            if store:
+                store.record(resume_hash, jd_hash, MATCH_THRESHOLD, result,
+                             resume_name=st.session_state["resume_name"],
+                             jd_name=st.session_state["jd_name"],
+                             candidate_name=extract_candidate_name(resume_text))
+
+    resume_skills = result["resume_skills"]
+    jd_skills = result["jd_skills"]
 
     st.markdown("<div class='result-card'>", unsafe_allow_html=True)
     st.write("### Extracted Resume Skills:", resume_skills)
     st.write("### Extracted JD Skills:", jd_skills)
     st.markdown("</div>", unsafe_allow_html=True)
 
-    # Compare using SBERT
-    result = compare_skill_sets(resume_skills, jd_skills)
-
-    matched = [m[1] for m in result["matches"]]
+    matched = result["matched"]
     missing = result["missing"]
 
     # Animated progress display
@@ -317,18 +308,17 @@ if page == "📊 Skill Report":
     st.progress(result["match_pct"] / 100)
 
     st.write(f"### Match Score: **{result['match_pct']}%**")
-
-    # Pie Chart
-    labels = ["Matched", "Missing"]
-    sizes = [len(matched), len(missing)]
-    colors = ["#2ECC71", "#E74C3C"]
-
-    fig, ax = plt.subplots(figsize=(2.6, 2.6), dpi=110)
-    ax.pie(sizes, labels=labels, autopct="%1.1f%%", colors=colors, textprops={'fontsize': 8})
-    ax.set_title("Skill Match Breakdown", fontsize=10)
-    ax.axis("equal")
-
-    st.pyplot(fig)
+    st.caption(f"{result['fast_path_pct']}% of JD skills matched exactly or by alias")
+
+    # Match breakdown (native chart, nothing kept in session state)
+    import pandas as pd
+    st.bar_chart(
+        pd.DataFrame({"Matched": [len(matched)], "Missing": [len(missing)]},
+                     index=["Skills"]),
+        color=["#2ECC71", "#E74C3C"],
+        horizontal=True,
+        height=140,
+    )
 
     st.markdown("<div class='result-card'>", unsafe_allow_html=True)
     st.write("### ✔ Matched Skills:", matched)
@@ -339,106 +329,9 @@ if page == "📊 Skill Report":
     st.session_state["matched"] = matched
     st.session_state["missing"] = missing
     st.session_state["match_pct"] = result["match_pct"]
-    st.session_state["pie_chart"] = fig
 
     # Extract candidate name
     st.session_state["candidate_name"] = extract_candidate_name(resume_text)
-# ====================================================
-# ============ PERSONALIZED PLAN GENERATOR ===========
-# ====================================================
-
-def generate_personalized_plan(missing_skills):
-    missed = [m.lower() for m in missing_skills]
-    plan = []
-
-    # Programming languages
-    prog_keys = ("python", "java", "c++", "c#", "javascript", "js")
-    if any(k in s for s in missed for k in prog_keys):
-        plan += [
-            "- Programming Skills:",
-            "  * Build 2 small projects using Python/Java.",
-            "  * Practice 3 problems daily on HackerRank.",
-            "  * Follow Codebasics / FreeCodeCamp tutorials."
-        ]
-
-    # Git / GitHub
-    if any("git" in s or "github" in s for s in missed):
-        plan += [
-            "- Git & GitHub:",
-            "  * Learn Git basics: add, commit, branch, merge.",
-            "  * Upload all projects to GitHub.",
-            "  * Contribute to one open-source repo."
-        ]
-
-    # Machine Learning
-    if any("machine" in s or "ml" in s for s in missed):
-        plan += [
-            "- Machine Learning:",
-            "  * Learn regression & classification basics.",
-            "  * Train simple ML models using scikit-learn.",
-            "  * Take Coursera ML by Andrew Ng."
-        ]
-
-    # Cloud (AWS, Azure)
-    if any(x in s for s in missed for x in ("aws", "azure", "cloud", "gcp")):
-        plan += [
-            "- Cloud Fundamentals:",
-            "  * Learn basics of AWS EC2 and S3.",
-            "  * Deploy a small Flask/Streamlit app.",
-            "  * Watch AWS free tutorials on YouTube."
-        ]
-
-    # Databases
-    if any("sql" in s or "mongo" in s for s in missed):
-        plan += [
-            "- Databases:",
-            "  * Practice SQL joins, group-by, subqueries.",
-            "  * Learn MongoDB CRUD operations.",
-            "  * Build a mini project using a database."
-        ]
-
-    # Web development & APIs
-    if any(x in s for s in missed for x in ("html", "css", "js", "api", "frontend", "backend")):
-        plan += [
-            "- Web Development:",
-            "  * Build 3 simple web pages.",
-            "  * Integrate a public API (Weather, News).",
-            "  * Learn basics of frontend & backend flow."
-        ]
-
-    # Soft skills
-    if any(x in s for s in missed for x in ("communication", "team", "adapt", "problem")):
-        plan += [
-            "- Soft Skills:",
-            "  * Practice speaking 10 mins/day.",
-            "  * Participate in team coding discussions.",
-            "  * Improve problem-solving using puzzles."
-        ]
-
-    # General skills
-    if any(x in s for s in missed for x in ("initiative", "learn", "motivation", "collaboration")):
-        plan += [
-            "- Work Habits:",
-            "  * Build 1 project every week.",
-            "  * Maintain a learning journal.",
-            "  * Learn actively by implementing tutorials."
-        ]
-
-    # If no category matched
-    if not plan:
-        plan = [
-            "- Practice small projects weekly.",
-            "- Improve using YouTube tutorials.",
-            "- Push all work to GitHub."
-        ]
-
-    final_lines = []
-    for line in plan:
-        final_lines.append(clean_text_for_pdf(line))
-
-    return final_lines
-
-
 # ====================================================
 # =============== DOWNLOAD PDF PAGE ==================
 # ====================================================
@@ -455,98 +348,114 @@ if page == "📥 Download PDF":
     matched = st.session_state.get("matched", [])
     missing = st.session_state.get("missing", [])
     match_pct = st.session_state.get("match_pct", 0)
-    pie_chart = st.session_state.get("pie_chart", None)
 
     st.write(f"### Candidate Name Identified: **{candidate_name}**")
 
     if st.button("Generate PDF"):
 
-        pdf = FPDF()
-        pdf.add_page()
-
-        # ---------------- HEADER ----------------
-        pdf.set_font("Arial", "B", 18)
-        pdf.set_text_color(30, 60, 120)
-        pdf.cell(200, 12, txt="AI Skill Gap Analysis Report", ln=1, align="C")
-
-        # Candidate name
-        pdf.set_font("Arial", "B", 14)
-        pdf.set_text_color(0, 0, 0)
-        pdf.cell(200, 10, txt=clean_text_for_pdf(f"Candidate: {candidate_name}"), ln=1, align="C")
-
-        # Timestamp
-        pdf.set_font("Arial", size=11)
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d  %H:%M")
-        pdf.set_text_color(120, 120, 120)
-        pdf.cell(200, 6, txt=clean_text_for_pdf(f"Generated: {timestamp}"), ln=1, align="C")
-        pdf.ln(5)
-
-        # Summary Box
-        pdf.set_fill_color(230, 240, 255)
-        pdf.rect(10, pdf.get_y(), 190, 14, "F")
-        pdf.set_font("Arial", "B", 14)
-        pdf.set_text_color(20, 50, 120)
-        pdf.ln(1)
-        pdf.cell(200, 10, txt=clean_text_for_pdf(f"Skill Match Score: {match_pct}%"), ln=1, align="C")
-        pdf.ln(2)
-
-        # Save and insert pie chart
-        if pie_chart:
-            pie_chart.savefig("pie_chart.png", dpi=130, bbox_inches="tight")
-            pdf.image("pie_chart.png", x=55, y=pdf.get_y(), w=80)
-            pdf.ln(70)
-
-        # Matched Skills
-        pdf.set_font("Arial", "B", 14)
-        pdf.set_text_color(0, 80, 0)
-        pdf.cell(200, 10, txt="Matched Skills", ln=1)
-
-        pdf.set_font("Arial", size=12)
-        pdf.set_text_color(0, 0, 0)
-        for m in matched:
-            pdf.cell(200, 8, txt=clean_text_for_pdf(f"- {m}"), ln=1)
-        pdf.ln(3)
-
-        # Missing Skills
-        pdf.set_font("Arial", "B", 14)
-        pdf.set_text_color(150, 0, 0)
-        pdf.cell(200, 10, txt="Skills You Need To Learn", ln=1)
-
-        pdf.set_font("Arial", size=12)
-        pdf.set_text_color(0, 0, 0)
-        for m in missing:
-            pdf.cell(200, 8, txt=clean_text_for_pdf(f"- {m}"), ln=1)
-        pdf.ln(3)
-
-        # Personalized Plan
-        plan_lines = generate_personalized_plan(missing)
-
-        pdf.set_font("Arial", "B", 14)
-        pdf.set_text_color(20, 20, 120)
-        pdf.cell(200, 10, txt="Personalized Improvement Plan", ln=1)
-
-        pdf.set_font("Arial", size=12)
-        pdf.set_text_color(0, 0, 0)
-        for line in plan_lines:
-            pdf.cell(200, 7, txt=line, ln=1)
-
-        # Footer
-        pdf.set_y(275)
-        pdf.set_font("Arial", size=9)
-        pdf.set_text_color(120, 120, 120)
-        pdf.cell(0, 10, clean_text_for_pdf("Generated by AI SkillGap Analyzer • Powered by SBERT"), 0, 0, "C")
-
-        # Save PDF
-        pdf.output("FINAL_SkillGapReport.pdf")
+        pdf_bytes = build_report_pdf(candidate_name, matched, missing, match_pct)
 
         st.success("Your downloadable PDF is ready!")
 
         st.download_button(
             "📥 Download Final PDF",
-            data=open("FINAL_SkillGapReport.pdf", "rb").read(),
+            data=pdf_bytes,
             file_name="SkillGapReport.pdf",
             mime="application/pdf"
         )
+# ====================================================
+# ============  CANDIDATE SEARCH PAGE  ===============
+# ====================================================
+
+if page == "🔎 Candidate Search":
+    import pandas as pd
+
+    st.header("🔎 Candidate Search")
+
+    store = get_store()
+    jds = store.documents("jd")
+    if not jds:
+        st.info("No analyses stored yet. Skill Reports and batch_cli.py --store add them here.")
+        st.stop()
+
+    jd = st.selectbox("Job description", jds, format_func=lambda d: d["name"] or d["hash"][:12])
+    wanted = st.multiselect("Must match", store.get_document(jd["hash"])["skills"])
+    min_pct = st.slider("Minimum match %", 0, 100, 70)
+
+    if st.button("Re-screen all stored candidates"):
+        scored = store.rescreen(jd["hash"], MATCH_THRESHOLD)
+        st.success(f"Scored {scored} more candidates against this job description.")
+
+    rows = store.search(jd["hash"], wanted, min_pct, MATCH_THRESHOLD)
+    st.write(f"### Matching candidates: {len(rows)}")
+    if rows:
+        st.dataframe(pd.DataFrame(rows)[["candidate_name", "name", "match_pct"]],
+                     hide_index=True)
+
+        # Hiring-manager packet: ranking table plus one report per listed candidate
+        if st.button(f"Build PDF packet ({len(rows)} reports)"):
+            candidates = []
+            for row in rows:
+                result = store.get_analysis(row["hash"], jd["hash"], MATCH_THRESHOLD)
+                candidates.append({"candidate_name": row["candidate_name"] or row["name"],
+                                   "matched": result["matched"], "missing": result["missing"],
+                                   "match_pct": result["match_pct"]})
+            with st.spinner("Rendering reports..."):
+                packet = build_combined_pdf(candidates, f"Candidates for {jd['name'] or 'JD'}")
+            st.download_button("📥 Download packet", data=packet,
+                               file_name="CandidatePacket.pdf", mime="application/pdf")
+
+
+# ====================================================
+# ==================  ADMIN PAGE  ====================
+# ====================================================
+
+if page == "🛠️ Admin":
+    import pandas as pd
+
+    st.header("🛠️ Pipeline Metrics")
+
+    snap = metrics.snapshot()
+    if not snap["enabled"]:
+        st.info("Metrics are disabled (SKILLGAP_METRICS=0).")
+
+    st.subheader("Stage latency")
+    if snap["stages"]:
+        st.dataframe(pd.DataFrame(snap["stages"]).set_index("stage"))
+    else:
+        st.write("No stages recorded yet.")
+
+    st.subheader("Counters")
+    st.dataframe(pd.DataFrame({"value": snap["counters"]}))
+
+    st.subheader("Models")
+    st.dataframe(pd.DataFrame(model_registry.stats()).set_index("name"))
+
+    st.subheader("Process")
+    st.write(f"Resident memory: **{model_registry.rss_bytes() / 2**20:.0f} MiB**")
+    mem = model_registry.memory_breakdown()
+    if mem:
+        # USS is what this process alone costs; PSS adds its share of pages
+        # shared with other workers (preloaded or mapped models)
+        st.write(f"Unique (USS): **{mem['uss'] / 2**20:.0f} MiB** · "
+                 f"proportional (PSS): **{mem['pss'] / 2**20:.0f} MiB** · "
+                 f"shared: **{mem['shared'] / 2**20:.0f} MiB**")
+    st.caption("Shared model memory: python shared_models.py export DIR, then "
+               "SKILLGAP_SHARED_MODEL_DIR=DIR · all workers: python shared_models.py report")
+    st.dataframe(pd.DataFrame({"imported": {m: m in sys.modules for m in HEAVY_MODULES}}))
+    st.caption("Import-time breakdown: python startup_profile.py")
+
+    prometheus = metrics.render_prometheus()
+    st.download_button("📥 Prometheus metrics", data=prometheus,
+                       file_name="metrics.prom", mime="text/plain")
+    with st.expander("Prometheus text"):
+        st.code(prometheus, language="text")
+
+    if st.button("Reset metrics"):
+        metrics.reset()
+        st.rerun()
+
+
 # ====================================================
 # ===============  END OF APPLICATION  ===============
 # ====================================================
@@ -0,0 +1,285 @@
+# batch_cli.py
+#
+# Headless batch analysis: every resume against every JD, in a process pool.
+#
+#   python batch_cli.py --resumes resumes/ --jds "jds/*.pdf" --out results.jsonl
+#   python batch_cli.py --resumes resumes/ --jds jds/ --out results.csv --resume-run
+#   python batch_cli.py --resumes resumes/ --jds jds/ --preload   # workers share one model
+#   python batch_cli.py --resumes resumes/ --jds jds/ --store analyses.db
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+
+import shared_models
+
+
+DOC_EXTENSIONS = (".pdf", ".docx")
+CSV_FIELDS = ["resume", "jd", "candidate_name", "match_pct", "matched", "missing",
+              "resume_skills", "jd_skills", "error"]
+
+
+# ---------- INPUT DISCOVERY ----------
+def collect_files(specs):
+    files = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            for root, _, names in os.walk(spec):
+                files.extend(os.path.join(root, n) for n in names
+                             if n.lower().endswith(DOC_EXTENSIONS))
+        elif glob.has_magic(spec):
+            files.extend(p for p in glob.glob(spec, recursive=True)
+                         if p.lower().endswith(DOC_EXTENSIONS))
+        elif os.path.isfile(spec):
+            files.append(spec)
+        else:
+            print(f"warning: no such file or directory: {spec}", file=sys.stderr)
+    return sorted(dict.fromkeys(os.path.normpath(f) for f in files))
+
+
+# ---------- WORKER SIDE ----------
+_store = None
+
+
+def _get_store(path):
+    # One connection per worker process
+    global _store
+    if not path:
+        return None
+    if _store is None:
+        from analysis_store import AnalysisStore
+        _store = AnalysisStore(path)
+    return _store
+
+
+def _file_hash(path):
+    from analysis_store import content_hash
+    with open(path, "rb") as f:
+        return content_hash(f.read())
+
+
+def _extract_jd(task):
+    path, store_path = task
+
+    from doc_utils import extract_text_path
+    from nlp_utils import get_jd_skills, filter_real_skills
+    try:
+        store = _get_store(store_path)
+        digest = _file_hash(path) if store else None
+        doc = store.get_document(digest) if store else None
+        if doc is not None:
+            return path, doc["skills"], None, digest
+
+        text = extract_text_path(path)
+        skills = filter_real_skills(get_jd_skills(text))
+        if store:
+            store.put_document(digest, "jd", skills, path)
+        return path, skills, None, digest
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}", None
+
+
+def _analyze_resume(task, raise_errors=False):
+    path, jds, threshold, early_stop, store_path = task
+
+    from doc_utils import extract_text_path, extract_candidate_name
+    from nlp_utils import extract_resume_skills, get_taxonomy_index, compare_skill_sets, encode_skills
+
+    try:
+        # Documents already in the store skip extraction and encoding
+        store = _get_store(store_path)
+        digest = _file_hash(path) if store else None
+        doc = store.get_document(digest) if store else None
+        if doc is not None:
+            name, resume_skills = doc["candidate_name"], doc["skills"]
+        else:
+            text = extract_text_path(path, early_stop=early_stop)
+            name = extract_candidate_name(text)
+            resume_skills = extract_resume_skills(text, get_taxonomy_index())
+            if store:
+                store.put_document(digest, "resume", resume_skills, path, name)
+                if resume_skills:
+                    store.put_embeddings(digest, encode_skills(resume_skills))
+    except Exception as e:
+        if raise_errors:
+            raise
+        error = f"{type(e).__name__}: {e}"
+        return [_row(path, jd_path, error=error) for jd_path, _, _, _ in jds]
+
+    rows = []
+    for jd_path, jd_skills, jd_error, jd_hash in jds:
+        if jd_error:
+            rows.append(_row(path, jd_path, candidate_name=name, error=jd_error))
+            continue
+        result = store.get_analysis(digest, jd_hash, threshold) if store else None
+        if result is None:
+            result = compare_skill_sets(resume_skills, jd_skills, threshold)
+            if store:
+                store.put_analysis(digest, jd_hash, threshold, result)
+        rows.append(_row(
+            path, jd_path,
+            candidate_name=name,
+            match_pct=result["match_pct"],
+            matched=[m[1] for m in result["matches"]],
+            missing=list(result["missing"]),
+            resume_skills=len(resume_skills),
+            jd_skills=len(jd_skills),
+        ))
+    return rows
+
+
+def _analyze_resume_job(task):
+    # job_queue handler: a resume that fails to load raises, so the queue
+    # retries it with backoff instead of storing error rows as done
+    return _analyze_resume(task, raise_errors=True)
+
+
+def _row(resume, jd, candidate_name="", match_pct=None, matched=(), missing=(),
+         resume_skills=0, jd_skills=0, error=None):
+    return {
+        "resume": resume,
+        "jd": jd,
+        "candidate_name": candidate_name,
+        "match_pct": match_pct,
+        "matched": list(matched),
+        "missing": list(missing),
+        "resume_skills": resume_skills,
+        "jd_skills": jd_skills,
+        "error": error,
+    }
+
+
+# ---------- OUTPUT ----------
+class ResultWriter:
+    """Appends result rows as JSONL or CSV, flushing after every resume."""
+
+    def __init__(self, path, fmt, append):
+        self.fmt = fmt
+        if path == "-":
+            self.f = sys.stdout
+            new_file = True
+        else:
+            new_file = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+            self.f = open(path, "a" if append else "w", newline="", encoding="utf-8")
+
+        if fmt == "csv":
+            self.csv = csv.DictWriter(self.f, fieldnames=CSV_FIELDS)
+            if new_file:
+                self.csv.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.fmt == "csv":
+                self.csv.writerow(dict(row,
+                                       matched="; ".join(row["matched"]),
+                                       missing="; ".join(row["missing"]),
+                                       error=row["error"] or ""))
+            else:
+                self.f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.f.flush()
+
+    def close(self):
+        if self.f is not sys.stdout:
+            self.f.close()
+
+
+def load_completed(path, fmt):
+    """(resume, jd) pairs already written without error by a previous run."""
+    done = set()
+    if path == "-" or not os.path.exists(path):
+        return done
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        try:
+            for row in rows:
+                if not row.get("error"):
+                    done.add((row["resume"], row["jd"]))
+        except (json.JSONDecodeError, KeyError):
+            pass  # truncated last line from an interrupted run
+
+    return done
+
+
+# ---------- DRIVER ----------
+def run(args):
+    resumes = collect_files(args.resumes)
+    jd_paths = collect_files(args.jds)
+    if not resumes or not jd_paths:
+        print("error: need at least one resume and one JD (.pdf/.docx)", file=sys.stderr)
+        return 2
+
+    fmt = args.format or ("csv" if args.out.lower().endswith(".csv") else "jsonl")
+    done = load_completed(args.out, fmt) if args.resume_run else set()
+
+    start = time.perf_counter()
+    context = shared_models.pool_context(args.preload)
+    with context.Pool(args.workers, initializer=shared_models.init_worker) as pool:
+        jds = pool.map(_extract_jd, [(p, args.store) for p in jd_paths])
+
+        tasks = []
+        for path in resumes:
+            todo = [jd for jd in jds if (path, jd[0]) not in done]
+            if todo:
+                tasks.append((path, todo, args.threshold, args.early_stop, args.store))
+
+        skipped = len(resumes) - len(tasks)
+        if skipped:
+            print(f"resuming: {skipped} resumes already complete", file=sys.stderr)
+
+        writer = ResultWriter(args.out, fmt, append=args.resume_run)
+        load_done = time.perf_counter()
+        n_done = errors = 0
+        try:
+            for rows in pool.imap_unordered(_analyze_resume, tasks):
+                writer.write(rows)
+                n_done += 1
+                errors += any(r["error"] for r in rows)
+                rate = n_done / (time.perf_counter() - load_done)
+                print(f"\r[{n_done}/{len(tasks)}] {rate:.2f} files/s", end="", file=sys.stderr)
+        finally:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{n_done} resumes x {len(jds)} JDs in {elapsed:.1f}s "
+          f"({n_done / elapsed if elapsed else 0:.2f} files/s, {errors} with errors)",
+          file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch resume vs JD skill gap analysis")
+    parser.add_argument("--resumes", nargs="+", required=True,
+                        help="resume files, directories or glob patterns (.pdf/.docx)")
+    parser.add_argument("--jds", nargs="+", required=True,
+                        help="job description files, directories or glob patterns")
+    parser.add_argument("--out", default="-",
+                        help="output file (.jsonl or .csv); '-' writes JSONL to stdout")
+    parser.add_argument("--format", choices=["jsonl", "csv"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--threshold", type=float, default=0.60)
+    parser.add_argument("--early-stop", action="store_true",
+                        help="stop reading resume PDFs once the skills section has ended")
+    parser.add_argument("--resume-run", action="store_true",
+                        help="skip (resume, JD) pairs already in --out and append the rest")
+    parser.add_argument("--store", metavar="DB",
+                        help="keep documents and results in this analysis store and reuse "
+                             "them on later runs (see analysis_store.py)")
+    shared_models.add_preload_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.resume_run and args.out == "-":
+        parser.error("--resume-run needs --out to be a file")
+
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# benchmarks/_stub.py
+#
+# Shared by the benchmarks that can run without the model (--synthetic):
+# a stand-in encoder, best-of-N timing and a scratch embedding cache.
+# Importing it has no side effects; benchmarks call use_scratch_cache()
+# from their main().
+
+import os
+import tempfile
+import time
+import zlib
+
+import numpy as np
+
+
+class HashEncoder:
+    """Deterministic random unit vectors per string (no model download)."""
+
+    def get_sentence_embedding_dimension(self):
+        return 384
+
+    def encode(self, texts, **kwargs):
+        out = np.stack([np.random.default_rng(zlib.crc32(t.encode())).normal(size=384)
+                        for t in texts]).astype(np.float32)
+        return out / np.linalg.norm(out, axis=1, keepdims=True)
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def use_scratch_cache():
+    """Keep the benchmark's embeddings out of the user's cache, even one
+    configured with SKILLGAP_CACHE_DIR: --synthetic vectors would be stored
+    under the real encoder id and poison later matching.
+
+    The cache directory is read when nlp_utils is imported, so call this first.
+    """
+    os.environ["SKILLGAP_CACHE_DIR"] = tempfile.mkdtemp(prefix="skillgap-bench-")
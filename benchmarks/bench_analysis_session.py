@@ -0,0 +1,76 @@
+# benchmarks/bench_analysis_session.py
+#
+# JD edits against a fixed candidate pool: full re-ranking with rank_resumes
+# vs. incremental updates through AnalysisSession.
+#
+#   python benchmarks/bench_analysis_session.py --pool 1000 5000
+#   python benchmarks/bench_analysis_session.py --synthetic   # no model download
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _stub import HashEncoder, best_of, use_scratch_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental vs full re-analysis")
+    parser.add_argument("--pool", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--skills", type=int, default=15, help="skills per resume")
+    parser.add_argument("--jd-skills", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--synthetic", action="store_true",
+                        help="use hashed random embeddings instead of the model")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Imported only now: nlp_utils reads the cache directory on import
+    use_scratch_cache()
+    import model_registry
+    from analysis_session import AnalysisSession
+    from nlp_utils import SKILL_DB, rank_resumes
+
+    if args.synthetic:
+        model_registry.register("sbert", HashEncoder)
+
+    rng = random.Random(args.seed)
+    vocab = SKILL_DB + [f"{a} {b}" for a in SKILL_DB for b in SKILL_DB if a != b][:3000]
+
+    print(f"{'pool':>6} {'full rank ms':>13} {'jd +1 ms':>9} {'jd -1 ms':>9} "
+          f"{'resume ms':>10} {'threshold ms':>13}")
+    for n in args.pool:
+        pool = [rng.sample(vocab, args.skills) for _ in range(n)]
+        jd = rng.sample(vocab, args.jd_skills)
+        extra = [s for s in rng.sample(vocab, 50) if s not in jd][0]
+
+        session = AnalysisSession(jd)
+        for i, skills in enumerate(pool):
+            session.set_resume(i, skills)
+        rank_resumes(pool, jd + [extra])  # warm the embedding cache
+
+        full = best_of(lambda: rank_resumes(pool, jd + [extra]), args.repeat)
+
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            session.set_jd(jd + [extra])
+            mid = time.perf_counter()
+            session.set_jd(jd)
+            times.append((mid - start, time.perf_counter() - mid))
+        add = min(t[0] for t in times) * 1000
+        remove = min(t[1] for t in times) * 1000
+
+        edited = rng.sample(vocab, args.skills)
+        resume = best_of(lambda: session.set_resume(0, edited), args.repeat)
+        threshold = best_of(lambda: session.set_threshold(0.55), args.repeat)
+
+        print(f"{n:>6} {full:>13.2f} {add:>9.2f} {remove:>9.2f} {resume:>10.3f} {threshold:>13.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# benchmarks/bench_analysis_store.py
+#
+# Candidate search from the analysis store vs recomputing: "candidates that
+# match these JD skills at or above X%" answered from the index, against
+# re-ranking the pool with rank_resumes, plus re-screening the stored pool
+# against a new JD from stored embeddings.
+#
+#   python benchmarks/bench_analysis_store.py --pool 1000 10000
+#   python benchmarks/bench_analysis_store.py --synthetic   # no model download
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _stub import HashEncoder, best_of, use_scratch_cache
+
+
+def fill(store, pool, jd_hash, jd_skills, threshold):
+    from analysis_store import content_hash
+    store.put_document(jd_hash, "jd", jd_skills, "jd.pdf")
+    for i, skills in enumerate(pool):
+        store.put_document(content_hash(b"resume %d" % i), "resume", skills,
+                           f"resume_{i:05d}.pdf", f"Candidate {i}")
+    store.rescreen(jd_hash, threshold)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analysis store search vs recomputation")
+    parser.add_argument("--pool", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--skills", type=int, default=15, help="skills per resume")
+    parser.add_argument("--jd-skills", type=int, default=10)
+    parser.add_argument("--min-pct", type=int, default=70)
+    parser.add_argument("--threshold", type=float, default=0.60)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--synthetic", action="store_true",
+                        help="use hashed random embeddings instead of the model")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Imported only now: nlp_utils reads the cache directory on import
+    use_scratch_cache()
+    import model_registry
+    from analysis_store import AnalysisStore, content_hash
+    from nlp_utils import SKILL_DB, rank_resumes
+
+    if args.synthetic:
+        model_registry.register("sbert", HashEncoder)
+
+    rng = random.Random(args.seed)
+    vocab = SKILL_DB + [f"{a} {b}" for a in SKILL_DB for b in SKILL_DB if a != b][:3000]
+
+    print(f"{'pool':>6} {'hits':>5} {'rank ms':>9} {'search ms':>10} "
+          f"{'rescreen ms':>12} {'store MiB':>10}")
+    for n in args.pool:
+        # Resumes list a random share of the JD skills so the filters select some
+        jd = rng.sample(SKILL_DB, args.jd_skills)
+        pool = []
+        for _ in range(n):
+            shared = rng.sample(jd, rng.randint(0, args.jd_skills))
+            pool.append(shared + rng.sample([s for s in vocab if s not in shared],
+                                            max(0, args.skills - len(shared))))
+        wanted = jd[:2]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "analyses.db")
+            store = AnalysisStore(path)
+            jd_hash = content_hash(b"jd")
+            fill(store, pool, jd_hash, jd, args.threshold)
+
+            def recompute():
+                out = rank_resumes(pool, jd, args.threshold)
+                return [i for i, pct in out["ranking"] if pct >= args.min_pct
+                        and all(s in [m[1] for m in out["results"][i]["matches"]] for s in wanted)]
+
+            hits = store.search(jd_hash, wanted, args.min_pct, args.threshold)
+            assert len(hits) == len(recompute())
+
+            rank = best_of(recompute, args.repeat)
+            search = best_of(lambda: store.search(jd_hash, wanted, args.min_pct, args.threshold),
+                             args.repeat)
+
+            # A new JD against the whole stored pool (embeddings are not re-encoded)
+            new_jd = rng.sample(SKILL_DB, args.jd_skills)
+            new_hash = content_hash(b"new jd")
+            store.put_document(new_hash, "jd", new_jd, "new.pdf")
+            start = time.perf_counter()
+            store.rescreen(new_hash, args.threshold)
+            rescreen = (time.perf_counter() - start) * 1000
+
+            store.close()
+            size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)) / 2**20
+
+        print(f"{n:>6} {len(hits):>5} {rank:>9.1f} {search:>10.2f} {rescreen:>12.1f} {size:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
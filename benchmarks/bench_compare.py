@@ -0,0 +1,76 @@
+# benchmarks/bench_compare.py
+#
+# Match resolution on a precomputed similarity matrix: the former per-row
+# argmax loop vs resolve_matches, the one-to-one assignment, and a threshold
+# sweep with match_rates-style counting vs one pass per threshold.
+#
+#   python benchmarks/bench_compare.py --sizes 30 300 1000
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from nlp_utils import resolve_matches, _count_at_thresholds
+
+
+def legacy_resolve(sim, threshold):
+    matched = []
+    for j in range(len(sim)):
+        best_idx = np.argmax(sim[j])
+        best_score = sim[j][best_idx]
+        if best_score >= threshold:
+            matched.append((best_idx, j, float(best_score)))
+    return matched
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match resolution speed")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 1000],
+                        help="JD and resume skill counts (square matrices)")
+    parser.add_argument("--thresholds", type=int, default=101)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    thresholds = np.linspace(0.0, 1.0, args.thresholds)
+
+    print(f"{'size':>6} {'loop ms':>9} {'vector ms':>10} {'1:1 ms':>9} "
+          f"{'sweep loop ms':>14} {'sweep ms':>9}")
+    for n in args.sizes:
+        a = rng.normal(size=(n, 384)).astype(np.float32)
+        b = a + rng.normal(scale=1.2, size=(n, 384)).astype(np.float32)
+        a /= np.linalg.norm(a, axis=1, keepdims=True)
+        b /= np.linalg.norm(b, axis=1, keepdims=True)
+        sim = a @ b.T
+
+        cols, scores, hit = resolve_matches(sim, 0.60)
+        assert [(c, j) for c, j, _ in legacy_resolve(sim, 0.60)] == \
+            [(cols[j], j) for j in np.flatnonzero(hit)]
+
+        loop = best_of(lambda: legacy_resolve(sim, 0.60), args.repeat)
+        vec = best_of(lambda: resolve_matches(sim, 0.60), args.repeat)
+        one = best_of(lambda: resolve_matches(sim, 0.60, one_to_one=True), args.repeat)
+        sweep_loop = best_of(lambda: [resolve_matches(sim, t)[2].sum() for t in thresholds],
+                             args.repeat)
+        sweep = best_of(lambda: _count_at_thresholds(sim, thresholds), args.repeat)
+        print(f"{n:>6} {loop:>9.3f} {vec:>10.3f} {one:>9.2f} {sweep_loop:>14.2f} {sweep:>9.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# benchmarks/bench_encode_service.py
+#
+# Throughput and latency of encoding under concurrent clients: every client
+# calling the model directly vs. all clients sharing one EncodeService.
+#
+#   python benchmarks/bench_encode_service.py --clients 1 8 32
+#   python benchmarks/bench_encode_service.py --synthetic   # no model download
+
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from encode_service import EncodeService
+from encoders import BACKENDS, load_encoder
+from nlp_utils import MODEL_NAME, SKILL_DB
+
+
+class SyntheticEncoder:
+    """Stand-in with a transformer-like cost profile: a fixed cost per
+    forward pass plus a cost per string, both in GIL-releasing BLAS calls."""
+
+    def __init__(self, dim=384, call_cost=24, item_cost=2):
+        rng = np.random.default_rng(0)
+        self.w = rng.normal(size=(dim, dim)).astype(np.float32)
+        self.call_cost = call_cost
+        self.item_cost = item_cost
+
+    def encode(self, texts, **kwargs):
+        x = np.ones((64, len(self.w)), dtype=np.float32)
+        for _ in range(self.call_cost):
+            x = np.tanh(x @ self.w)
+        h = np.ones((len(texts), len(self.w)), dtype=np.float32)
+        for _ in range(self.item_cost * 4):
+            h = np.tanh(h @ self.w)
+        return h / np.linalg.norm(h, axis=1, keepdims=True)
+
+
+def make_requests(n, size, rng):
+    vocab = SKILL_DB + [f"{a} {b}" for a in SKILL_DB for b in ("basics", "advanced", "apis")]
+    return [rng.sample(vocab, size) for _ in range(n)]
+
+
+def run_clients(encode, requests, clients):
+    latencies = []
+    lock = threading.Lock()
+    per_client = [requests[i::clients] for i in range(clients)]
+
+    def client(reqs):
+        mine = []
+        for texts in reqs:
+            start = time.perf_counter()
+            encode(texts)
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(r,)) for r in per_client]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "req_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[math.ceil(0.99 * len(latencies)) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batched vs direct encoding")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=256, help="requests per run")
+    parser.add_argument("--skills", type=int, default=30, help="strings per request")
+    parser.add_argument("--max-batch", type=int, default=128)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--backend", default="torch", choices=BACKENDS)
+    parser.add_argument("--synthetic", action="store_true",
+                        help="use a synthetic encoder instead of loading the model")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        model = SyntheticEncoder()
+    else:
+        try:
+            model = load_encoder(args.model, args.backend)
+        except Exception as e:
+            print(f"model unavailable ({type(e).__name__}: {e}); try --synthetic")
+            return 1
+
+    def direct(texts):
+        return model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+    requests = make_requests(args.requests, args.skills, random.Random(args.seed))
+    direct(requests[0])  # warm-up
+
+    print(f"{'clients':>7} {'mode':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'req/batch':>10}")
+    for clients in args.clients:
+        r = run_clients(direct, requests, clients)
+        print(f"{clients:>7} {'direct':>8} {r['req_s']:>8.1f} {r['p50_ms']:>8.2f} "
+              f"{r['p99_ms']:>8.2f} {'1.00':>10}")
+
+        service = EncodeService(direct, args.max_batch, args.max_wait_ms / 1000)
+        try:
+            r = run_clients(service.encode, requests, clients)
+        finally:
+            service.close()
+        print(f"{clients:>7} {'batched':>8} {r['req_s']:>8.1f} {r['p50_ms']:>8.2f} "
+              f"{r['p99_ms']:>8.2f} {service.stats()['requests_per_batch']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
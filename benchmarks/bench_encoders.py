@@ -0,0 +1,116 @@
+# benchmarks/bench_encoders.py
+#
+# Compares encoder backends (see encoders.py) against the fp32 PyTorch model:
+# agreement of match/missing decisions at the 0.60 threshold on a synthetic
+# resume/JD corpus, per-request latency and bulk throughput.
+#
+#   python benchmarks/bench_encoders.py --backends torch int8 onnx onnx-int8
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from encoders import BACKENDS, load_encoder
+from nlp_utils import MODEL_NAME, SKILL_DB
+
+
+# Paraphrases and near-misses so decisions are not all trivially 0 or 1
+VARIANTS = [
+    "python programming", "core java", "c programming", "html5", "css3", "js",
+    "sql queries", "mongo db", "my sql", "postgres", "ml", "deep neural networks",
+    "natural language processing", "tensor flow", "torch", "scikit-learn",
+    "data analytics", "data visualization", "statistics", "version control",
+    "docker containers", "kubernetes", "flask api", "django rest framework",
+    "rest api", "amazon web services", "microsoft azure", "google cloud",
+    "problem solving", "creative thinking", "team player", "leadership",
+    "public speaking", "excel", "power bi", "tableau", "linux", "bash scripting",
+]
+
+
+def make_corpus(n_pairs, rng):
+    vocab = SKILL_DB + VARIANTS
+    return [(rng.sample(vocab, rng.randint(5, 25)), rng.sample(SKILL_DB, rng.randint(4, 15)))
+            for _ in range(n_pairs)]
+
+
+def decisions(emb, index, corpus, threshold):
+    out = []
+    for resume, jd in corpus:
+        sim = emb[[index[s] for s in jd]] @ emb[[index[s] for s in resume]].T
+        out.append(sim.max(axis=1) >= threshold)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encoder backend accuracy and speed")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--threshold", type=float, default=0.60)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = make_corpus(args.pairs, rng)
+    vocab = sorted({s for pair in corpus for side in pair for s in side})
+    index = {s: i for i, s in enumerate(vocab)}
+    request = corpus[0][0] + corpus[0][1]   # one resume + JD worth of skills
+    bulk = [f"{a} {b}" for a in vocab[:40] for b in vocab[:25]]
+
+    baseline = None
+    print(f"{'backend':>10} {'load s':>7} {'req p50 ms':>11} {'bulk str/s':>11} "
+          f"{'decision agree':>15} {'pct agree':>10} {'max |d cos|':>12}")
+
+    for backend in ["torch"] + [b for b in args.backends if b != "torch"]:
+        try:
+            start = time.perf_counter()
+            model = load_encoder(args.model, backend)
+            load = time.perf_counter() - start
+        except Exception as e:
+            print(f"{backend:>10} unavailable: {type(e).__name__}: {e}")
+            if backend == "torch":
+                return 1  # no fp32 baseline to compare against
+            continue
+
+        encode = lambda texts: model.encode(texts, convert_to_numpy=True,
+                                            normalize_embeddings=True, batch_size=64)
+        encode(request)  # warm-up
+
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            encode(request)
+            times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        encode(bulk)
+        throughput = len(bulk) / (time.perf_counter() - start)
+
+        emb = encode(vocab)
+        decided = decisions(emb, index, corpus, args.threshold)
+
+        if baseline is None:
+            baseline = (emb, decided)
+            agree = pct_agree = 1.0
+            max_diff = 0.0
+        else:
+            base_emb, base_decided = baseline
+            total = sum(len(d) for d in decided)
+            agree = sum(int((a == b).sum()) for a, b in zip(decided, base_decided)) / total
+            pct_agree = sum(int(a.sum() == b.sum()) for a, b in zip(decided, base_decided)) / len(decided)
+            max_diff = float(np.abs(emb @ emb.T - base_emb @ base_emb.T).max())
+
+        print(f"{backend:>10} {load:>7.1f} {statistics.median(times) * 1000:>11.1f} "
+              f"{throughput:>11.0f} {agree:>15.4f} {pct_agree:>10.4f} {max_diff:>12.4f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
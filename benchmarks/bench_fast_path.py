@@ -0,0 +1,91 @@
+# benchmarks/bench_fast_path.py
+#
+# How much encoder work the lexical (exact / alias) fast path saves: share
+# of JD skills resolved without the encoder, strings encoded and time per
+# comparison, with the fast path vs encoding every skill. `--overlap` is the
+# share of JD skills the resume lists (verbatim or as an alias).
+#
+#   python benchmarks/bench_fast_path.py --overlap 0.25 0.5 0.8 1.0
+#   python benchmarks/bench_fast_path.py --synthetic   # no model download
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+import model_registry
+from nlp_utils import SKILL_DB, SKILL_ALIASES, compare_skill_sets, skill_similarity, resolve_matches
+from _stub import HashEncoder
+from bench_encoders import VARIANTS
+
+
+def make_pairs(n, resume_size, jd_size, overlap, rng):
+    aliases = {}
+    for alias, skill in SKILL_ALIASES.items():
+        aliases.setdefault(skill, []).append(alias)
+
+    pairs = []
+    for _ in range(n):
+        jd = rng.sample(SKILL_DB, jd_size)
+        shared = [rng.choice(aliases.get(s, []) + [s])
+                  for s in rng.sample(jd, round(overlap * jd_size))]
+        others = [s for s in VARIANTS + SKILL_DB if s not in jd]
+        resume = shared + rng.sample(others, max(0, resume_size - len(shared)))
+        rng.shuffle(resume)
+        pairs.append((resume, jd))
+    return pairs
+
+
+def encode_everything(resume_skills, jd_skills, threshold):
+    return resolve_matches(skill_similarity(resume_skills, jd_skills), threshold)
+
+
+def run(fn, pairs, threshold):
+    metrics.reset()
+    start = time.perf_counter()
+    for resume_skills, jd_skills in pairs:
+        fn(resume_skills, jd_skills, threshold)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(pairs) * 1000, metrics.snapshot()["counters"].get("encoded_strings", 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lexical fast path vs full encoding")
+    parser.add_argument("--overlap", type=float, nargs="+", default=[0.25, 0.5, 0.8, 1.0])
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--skills", type=int, default=15)
+    parser.add_argument("--jd-skills", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.60)
+    parser.add_argument("--synthetic", action="store_true",
+                        help="use hashed random embeddings instead of the model")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Encode for real on every call so the two paths are compared fairly
+    os.environ["SKILLGAP_EMBED_CACHE"] = "0"
+    if args.synthetic:
+        model_registry.register("sbert", HashEncoder)
+
+    rng = random.Random(args.seed)
+
+    print(f"{'overlap':>7} {'fast path %':>12} {'all ms/pair':>12} {'fast ms/pair':>13} "
+          f"{'all strings':>12} {'fast strings':>13}")
+    for overlap in args.overlap:
+        pairs = make_pairs(args.pairs, args.skills, args.jd_skills, overlap, rng)
+        fast_pct = [compare_skill_sets(r, j, args.threshold)["fast_path_pct"] for r, j in pairs]
+
+        full_ms, full_strings = run(encode_everything, pairs, args.threshold)
+        fast_ms, fast_strings = run(compare_skill_sets, pairs, args.threshold)
+
+        print(f"{overlap:>7.2f} {statistics.mean(fast_pct):>12.1f} {full_ms:>12.2f} "
+              f"{fast_ms:>13.2f} {full_strings:>12} {fast_strings:>13}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
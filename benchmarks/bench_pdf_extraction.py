@@ -0,0 +1,117 @@
+# benchmarks/bench_pdf_extraction.py
+#
+# Latency and peak Python memory of PDF text extraction on long documents:
+# the old read-everything / `text +=` loop vs the streaming extractor,
+# page-parallel extraction and early stop after the skills section.
+#
+#   python benchmarks/bench_pdf_extraction.py --pages 10 50 200
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+
+import doc_utils
+from doc_utils import extract_text_pdf
+from nlp_utils import extract_resume_skills_strict
+
+
+LINE = "Delivered customer facing features across backend services and data pipelines."
+
+
+def make_pdf(path, pages):
+    pdf = fitz.open()
+    for i in range(pages):
+        page = pdf.new_page()
+        if i == 0:
+            body = "Jane Roe\nCore Skills\nPython, Java, SQL\nSkills\nDocker, AWS\nExperience\n"
+        elif i == 1:
+            body = "Education\nB.Tech 2020\n"
+        else:
+            body = ""
+        body += "\n".join(f"{LINE} ({i}.{k})" for k in range(50))
+        page.insert_text((40, 40), body, fontsize=8)
+    pdf.save(path)
+
+
+# A skills list whose sub-sections run over three pages
+SPLIT_SKILLS_PAGES = ("Jane Roe\nCore Skills\nPython, SQL\nIntermediate Skills\n",
+                      "Docker, Kubernetes\nSoft Skills\n",
+                      "Teamwork\nEducation\nB.Tech 2020\n",
+                      "Experience\n")
+
+
+def check_early_stop(path):
+    # Early stop must not end extraction before the last skills section closes
+    pdf = fitz.open()
+    for body in SPLIT_SKILLS_PAGES:
+        pdf.new_page().insert_text((40, 40), body, fontsize=8)
+    pdf.save(path)
+    full = extract_resume_skills_strict(extract_text_pdf(path, parallel=False))
+    early = extract_resume_skills_strict(extract_text_pdf(path, early_stop=True))
+    assert early == full, f"early stop lost skills: {early} vs {full}"
+
+
+def legacy_extract(path):
+    with open(path, "rb") as f:
+        pdf = fitz.open(stream=f.read(), filetype="pdf")
+        text = ""
+        for p in pdf:
+            text += p.get_text()
+        return text
+
+
+def measure(fn, repeat):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF extraction latency and memory")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"workers={doc_utils.PDF_WORKERS} parallel_min_pages={doc_utils.PARALLEL_MIN_PAGES}")
+    print(f"{'pages':>6} {'variant':>12} {'ms':>9} {'peak MiB':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_early_stop(os.path.join(tmp, "split_skills.pdf"))
+        for pages in args.pages:
+            path = os.path.join(tmp, f"doc_{pages}.pdf")
+            make_pdf(path, pages)
+            with open(path, "rb") as f:
+                data = f.read()
+
+            variants = {
+                "legacy": lambda: legacy_extract(path),
+                "sequential": lambda: extract_text_pdf(path, parallel=False),
+                "parallel": lambda: extract_text_pdf(path),
+                "early-stop": lambda: extract_text_pdf(path, early_stop=True),
+                "upload": lambda: extract_text_pdf(io.BytesIO(data)),
+            }
+            # Warm the worker pool and the section parser import so their
+            # start-up is not billed to one variant
+            extract_text_pdf(path)
+            extract_text_pdf(path, early_stop=True)
+
+            for name, fn in variants.items():
+                ms, peak = measure(fn, args.repeat)
+                print(f"{pages:>6} {name:>12} {ms:>9.1f} {peak:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_plan_rules.py
+#
+# Personalized plans as the rule catalog grows: the compiled matcher
+# (plan_rules.PlanRules, one pass over the missing skills) against checking
+# every rule's keywords in turn, as the former hard-coded
+# generate_personalized_plan did. Synthetic catalogs of --rules categories
+# with --keywords trigger keywords each.
+#
+#   python benchmarks/bench_plan_rules.py --rules 8 100 500 --keywords 10
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlp_utils import SKILL_DB
+from plan_rules import PlanRules
+from _stub import best_of
+
+
+def make_catalog(n_rules, n_keywords, rng):
+    # Real skills first, then made-up technology names, so larger catalogs
+    # keep firing on realistic missing skills
+    vocab = list(SKILL_DB)
+    while len(vocab) < n_rules * n_keywords:
+        vocab.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))))
+    rng.shuffle(vocab)
+    rules = [{"title": f"Category {i}", "keywords": vocab[i * n_keywords:(i + 1) * n_keywords],
+              "steps": [f"Step {j} for category {i}." for j in range(3)]}
+             for i in range(n_rules)]
+    return rules, vocab
+
+
+def rescan_plan(rules, fallback, missing_skills):
+    # One pass over the missing skills per rule
+    missed = [m.lower() for m in missing_skills]
+    plan = []
+    for rule in rules:
+        if any(k in s for s in missed for k in rule["keywords"]):
+            plan.append(f"- {rule['title']}:")
+            plan += [f"  * {step}" for step in rule["steps"]]
+    return plan or list(fallback)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiled plan rules vs per-rule rescans")
+    parser.add_argument("--rules", type=int, nargs="+", default=[8, 100, 500])
+    parser.add_argument("--keywords", type=int, default=10, help="keywords per rule")
+    parser.add_argument("--missing", type=int, default=12, help="missing skills per plan")
+    parser.add_argument("--plans", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fallback = ["- Practice small projects weekly."]
+
+    print(f"{'rules':>6} {'keywords':>9} {'compile ms':>11} {'rescan plans/s':>15} "
+          f"{'compiled plans/s':>17} {'speedup':>8}")
+    for n in args.rules:
+        rules, vocab = make_catalog(n, args.keywords, rng)
+        # Missing skills: catalog keywords, some inside longer phrases, and misses
+        inputs = [[rng.choice(["", "advanced ", "cloud "]) + rng.choice(vocab)
+                   if rng.random() < 0.5 else rng.choice(SKILL_DB) + " certification"
+                   for _ in range(args.missing)] for _ in range(args.plans)]
+
+        start = time.perf_counter()
+        compiled = PlanRules(rules, fallback)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        for m in inputs:
+            assert compiled.plan(m) == rescan_plan(rules, fallback, m)
+
+        rescan = best_of(lambda: [rescan_plan(rules, fallback, m) for m in inputs], args.repeat)
+        fast = best_of(lambda: [compiled.plan(m) for m in inputs], args.repeat)
+        print(f"{n:>6} {compiled.n_keywords:>9} {compile_ms:>11.1f} "
+              f"{args.plans / rescan * 1000:>15.0f} {args.plans / fast * 1000:>17.0f} "
+              f"{rescan / fast:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# benchmarks/bench_report.py
+#
+# Reports/sec for PDF report generation under concurrent callers, comparing
+# the in-memory builder with the old flow (matplotlib chart written to a PNG
+# and embedded, PDF written to disk and read back);
+# batched reports (build_reports / build_combined_pdf) per worker count; and
+# the text sanitizer against the former chain of str.replace calls.
+#
+#   python benchmarks/bench_report.py --threads 1 4 16 --reports 200
+#   python benchmarks/bench_report.py --workers 1 2 4 --candidates 200
+#
+# The old flow needs matplotlib: pip install -r benchmarks/requirements.txt
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_utils import (build_report_pdf, build_reports, build_combined_pdf, clean_text_for_pdf,
+                          generate_personalized_plan)
+
+
+MATCHED = ["python", "java", "sql", "docker", "git", "machine learning"]
+MISSING = ["aws", "kubernetes", "communication", "html", "mongodb"]
+
+
+def in_memory(i, tmp):
+    return build_report_pdf(f"Candidate {i}", MATCHED, MISSING, 54)
+
+
+_charts = threading.local()
+
+
+def _chart():
+    # The old app drew the pie chart with matplotlib on the Skill Report page;
+    # one figure per thread (pyplot is not thread-safe)
+    if not hasattr(_charts, "fig"):
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(4, 4))
+        fig.add_subplot().pie([len(MATCHED), len(MISSING)], labels=["Matched", "Missing"],
+                              colors=["#2ECC71", "#E74C3C"], autopct="%1.1f%%")
+        _charts.fig = fig
+    return _charts.fig
+
+
+def via_disk(i, tmp):
+    # Old flow: the chart saved as a PNG and embedded from disk, the PDF
+    # written to a file and read back (unique names here, the app used
+    # fixed ones and raced)
+    from fpdf import FPDF
+
+    png = os.path.join(tmp, f"pie_chart_{i}.png")
+    _chart().savefig(png, dpi=130, bbox_inches="tight")
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 18)
+    pdf.cell(200, 12, txt="AI Skill Gap Analysis Report", ln=1, align="C")
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(200, 10, txt=clean_text_for_pdf(f"Candidate: Candidate {i}"), ln=1, align="C")
+    pdf.cell(200, 10, txt=clean_text_for_pdf("Skill Match Score: 54%"), ln=1, align="C")
+    pdf.image(png, x=55, y=pdf.get_y(), w=80)
+    pdf.ln(70)
+    pdf.set_font("Arial", size=12)
+    for title, skills in (("Matched Skills", MATCHED), ("Skills You Need To Learn", MISSING)):
+        pdf.cell(200, 10, txt=title, ln=1)
+        for m in skills:
+            pdf.cell(200, 8, txt=clean_text_for_pdf(f"- {m}"), ln=1)
+    for line in generate_personalized_plan(MISSING):
+        pdf.cell(200, 7, txt=line, ln=1)
+
+    pdf_path = os.path.join(tmp, f"report_{i}.pdf")
+    pdf.output(pdf_path)
+    with open(pdf_path, "rb") as f:
+        return f.read()
+
+
+REPLACE_MAP = {"•": "-", "✔": "-", "✓": "-", "–": "-", "—": "-", "“": '"', "”": '"',
+               "’": "'", "′": "'", "‣": "-", "·": "-", "►": "-", "→": "->", "\u200b": ""}
+
+
+def replace_chain(text):
+    # Former clean_text_for_pdf: one str.replace pass per mapped character
+    out = str(text)
+    for bad, good in REPLACE_MAP.items():
+        out = out.replace(bad, good)
+    return out.encode("latin-1", "replace").decode("latin-1")
+
+
+def candidates(n):
+    return [{"candidate_name": f"Candidate {i}", "matched": MATCHED[:i % 6 + 1],
+             "missing": MISSING[:i % 5 + 1], "match_pct": (i * 37) % 101} for i in range(n)]
+
+
+def bench_batches(workers, n):
+    print(f"\n{'workers':>8} {'variant':>10} {'reports/s':>10}")
+    batch = candidates(n)
+    for w in workers:
+        for name, fn in (("separate", build_reports), ("combined", build_combined_pdf)):
+            start = time.perf_counter()
+            fn(batch, workers=w)
+            rate = n / (time.perf_counter() - start)
+            print(f"{w:>8} {name:>10} {rate:>10.1f}")
+
+
+def bench_clean(lines=20000):
+    text = [f"• {s} – “quoted” → next · item {i}" if i % 4 == 0 else f"- {s} {i}"
+            for i, s in enumerate((MATCHED + MISSING) * (lines // 11))]
+    assert [replace_chain(t) for t in text] == [clean_text_for_pdf(t) for t in text]
+    print(f"\n{'sanitizer':>14} {'lines/s':>12}")
+    for name, fn in (("str.replace", replace_chain), ("translate", clean_text_for_pdf)):
+        start = time.perf_counter()
+        for t in text:
+            fn(t)
+        print(f"{name:>14} {len(text) / (time.perf_counter() - start):>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent PDF report generation throughput")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="worker processes for batched reports")
+    parser.add_argument("--candidates", type=int, default=200, help="reports per batch")
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'variant':>10} {'reports/s':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        variants = [("in-memory", in_memory), ("via-disk", via_disk)]
+        try:
+            import matplotlib  # noqa: F401  (the old flow's chart; see benchmarks/requirements.txt)
+        except ImportError:
+            print("via-disk skipped: needs matplotlib (pip install -r benchmarks/requirements.txt)",
+                  file=sys.stderr)
+            variants.pop()
+        # Import fpdf / matplotlib and render once so no variant pays for it
+        for _, fn in variants:
+            fn(0, tmp)
+        for threads in args.threads:
+            for name, fn in variants:
+                start = time.perf_counter()
+                with ThreadPoolExecutor(threads) as pool:
+                    list(pool.map(lambda i: fn(i, tmp), range(args.reports)))
+                rate = args.reports / (time.perf_counter() - start)
+                print(f"{threads:>8} {name:>10} {rate:>10.1f}")
+
+    bench_batches(args.workers, args.candidates)
+    bench_clean()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/bench_section_parser.py
+#
+# Checks that the single-pass extract_resume_skills_strict returns exactly
+# what the previous five-regex version returned on a randomized resume
+# corpus, then times both on resumes of growing length.
+#
+#   python benchmarks/bench_section_parser.py --corpus 2000 --pages 1 5 20 50
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlp_utils import extract_resume_skills_strict
+
+
+# ---------- PREVIOUS IMPLEMENTATION (reference) ----------
+def legacy_extract_resume_skills_strict(text):
+    text = text.lower()
+
+    patterns = {
+        "core skills": r"core skills(.*?)(intermediate skills|familiar with|soft skills|education|languages|projects|$)",
+        "intermediate skills": r"intermediate skills(.*?)(core skills|familiar with|soft skills|education|languages|projects|$)",
+        "familiar with": r"familiar with(.*?)(core skills|intermediate skills|soft skills|education|languages|projects|$)",
+        "soft skills": r"soft skills(.*?)(core skills|intermediate skills|familiar with|education|languages|projects|$)",
+        "skills": r"skills(.*?)(core skills|intermediate skills|familiar with|soft skills|education|languages|projects|$)"
+    }
+
+    all_skills = []
+
+    for sec, patt in patterns.items():
+        match = re.search(patt, text, flags=re.S)
+        if match:
+            block = match.group(1)
+            items = re.split(r"[,\n•\-]+", block)
+            cleaned = [i.strip().lower() for i in items if len(i.strip()) > 1]
+            all_skills.extend(cleaned)
+
+    return list(dict.fromkeys(all_skills))
+
+
+# ---------- SYNTHETIC RESUMES ----------
+HEADERS = ["Core Skills", "Intermediate Skills", "Familiar With", "Soft Skills",
+           "Skills", "Technical Skills", "Education", "Languages", "Projects",
+           "Experience", "SKILLS:", "Projectskills", "softskills"]
+ITEMS = ["Python", "Java", "C++", "Machine Learning", "Docker", "AWS", "SQL",
+         "git", "Team-work", "Communication", "React.js", "B.Tech", "English",
+         "Tamil", "x", "data analysis", "education policy", "skills matrix"]
+SEPARATORS = [", ", "\n", " • ", " - ", "\n\n", " "]
+
+
+def make_resume(rng, n_sections):
+    parts = ["John Doe\njohn@example.com\n"]
+    for _ in range(n_sections):
+        parts.append(rng.choice(HEADERS))
+        parts.append(rng.choice(["\n", ": ", " "]))
+        for _ in range(rng.randint(0, 12)):
+            parts.append(rng.choice(ITEMS))
+            parts.append(rng.choice(SEPARATORS))
+    if rng.random() < 0.5:
+        parts.append("\n")
+    return "".join(parts)
+
+
+def make_long_resume(pages):
+    # Skill sections up front, then pages of experience prose, education last
+    prose = ("Led a team that delivered a customer facing platform used by "
+             "thousands of users daily. Improved latency and reliability. ")
+    return ("Jane Roe\nCore Skills\nPython, Java, SQL, Docker\n"
+            "Soft Skills\nTeamwork, Communication\nExperience\n"
+            + prose * 30 * pages + "\nEducation\nB.Tech, 2020\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Section parser regression check and timing")
+    parser.add_argument("--corpus", type=int, default=2000)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20, 50])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    for i in range(args.corpus):
+        text = make_resume(rng, rng.randint(0, 8))
+        expected = legacy_extract_resume_skills_strict(text)
+        got = extract_resume_skills_strict(text)
+        if got != expected:
+            print(f"MISMATCH on resume #{i}:\n{text!r}\nexpected {expected}\ngot      {got}")
+            sys.exit(1)
+    print(f"regression corpus: {args.corpus} resumes identical")
+
+    print(f"{'pages':>6} {'chars':>9} {'legacy ms':>10} {'single-pass ms':>15}")
+    for pages in args.pages:
+        text = make_long_resume(pages)
+        assert extract_resume_skills_strict(text) == legacy_extract_resume_skills_strict(text)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            legacy_extract_resume_skills_strict(text)
+        legacy = (time.perf_counter() - start) / args.repeat * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            extract_resume_skills_strict(text)
+        single = (time.perf_counter() - start) / args.repeat * 1000
+
+        print(f"{pages:>6} {len(text):>9} {legacy:>10.2f} {single:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
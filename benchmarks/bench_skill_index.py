@@ -0,0 +1,74 @@
+# benchmarks/bench_skill_index.py
+#
+# Recall and query throughput of the IVF SkillIndex against exact
+# brute-force search, on a synthetic clustered embedding set shaped like a
+# large skill taxonomy (unit vectors, MiniLM dimension).
+#
+#   python benchmarks/bench_skill_index.py --size 50000 --queries 2000
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from skill_index import SkillIndex
+
+
+def make_embeddings(n, dim, n_topics, rng):
+    # Skills cluster around topics (languages, cloud, data, ...)
+    topics = rng.normal(size=(n_topics, dim))
+    vecs = topics[rng.integers(0, n_topics, n)] + 1.5 * rng.normal(size=(n, dim))
+    return (vecs / np.linalg.norm(vecs, axis=1, keepdims=True)).astype(np.float32)
+
+
+def recall(ids, truth, k):
+    hits = sum(len(set(a[:k]) & set(b[:k])) for a, b in zip(ids, truth))
+    return hits / (len(truth) * k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF SkillIndex vs exact search")
+    parser.add_argument("--size", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    data = make_embeddings(args.size + args.queries, args.dim, 1000, rng)
+    base, queries = data[:args.size], data[args.size:]
+
+    start = time.perf_counter()
+    index = SkillIndex.build(base)
+    print(f"built {args.size} x {args.dim} index, {index.n_lists} lists "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        index.save(tmp)
+        index = SkillIndex.load(tmp)
+        print(f"save + mmap load in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        _, truth = index.search_exact(queries, args.k)
+        exact = time.perf_counter() - start
+
+        print(f"{'nprobe':>7} {'recall@1':>9} {'recall@' + str(args.k):>10} {'q/s':>9} {'speedup':>8}")
+        print(f"{'exact':>7} {1.0:>9.3f} {1.0:>10.3f} {args.queries / exact:>9.0f} {1.0:>8.1f}")
+        for nprobe in args.nprobe:
+            start = time.perf_counter()
+            _, ids = index.search(queries, args.k, nprobe=nprobe)
+            elapsed = time.perf_counter() - start
+            print(f"{nprobe:>7} {recall(ids, truth, 1):>9.3f} {recall(ids, truth, args.k):>10.3f} "
+                  f"{args.queries / elapsed:>9.0f} {exact / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_skill_matcher.py
+#
+# Throughput of the compiled SkillMatcher vs the old nested substring loop
+# as the skill dictionary grows.
+#
+#   python benchmarks/bench_skill_matcher.py --sizes 35 1000 10000 50000
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SkillMatcher
+
+
+def make_dictionary(size, rng):
+    words = set()
+    while len(words) < size:
+        n_tokens = rng.choice((1, 1, 2, 3))
+        words.add(" ".join(
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+            for _ in range(n_tokens)
+        ))
+    return sorted(words)
+
+
+def make_fragments(dictionary, n_fragments, rng):
+    filler = ["experience", "with", "strong", "knowledge", "of", "tools", "such", "as"]
+    fragments = []
+    for _ in range(n_fragments):
+        tokens = rng.sample(filler, 4) + rng.sample(dictionary, min(2, len(dictionary)))
+        rng.shuffle(tokens)
+        fragments.append(" ".join(tokens))
+    return fragments
+
+
+def naive_scan(dictionary, fragments):
+    found = 0
+    for item in fragments:
+        for skill in dictionary:
+            if skill in item:
+                found += 1
+    return found
+
+
+def matcher_scan(matcher, fragments):
+    found = 0
+    for item in fragments:
+        found += len(matcher.find_indices(item))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SkillMatcher vs substring loop throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[35, 1000, 10000, 50000])
+    parser.add_argument("--fragments", type=int, default=2000)
+    parser.add_argument("--naive-limit", type=int, default=10000,
+                        help="skip the naive loop above this dictionary size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'dict size':>10} {'build s':>9} {'matcher frag/s':>15} {'naive frag/s':>13}")
+
+    for size in args.sizes:
+        dictionary = make_dictionary(size, rng)
+        fragments = make_fragments(dictionary, args.fragments, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(dictionary)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher_scan(matcher, fragments)
+        fast = len(fragments) / (time.perf_counter() - start)
+
+        naive = "-"
+        if size <= args.naive_limit:
+            start = time.perf_counter()
+            naive_scan(dictionary, fragments)
+            naive = f"{len(fragments) / (time.perf_counter() - start):.0f}"
+
+        print(f"{size:>10} {build:>9.3f} {fast:>15.0f} {naive:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# benchmarks/corpus.py
+#
+# Reproducible synthetic resumes and job descriptions (PDF / DOCX / text)
+# with controllable length and skill density.
+#
+#   python benchmarks/corpus.py out/ --resumes 100 --jds 5 --pages 2 --skills 20
+
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlp_utils import SKILL_DB
+
+
+FIRST_NAMES = ["Arun", "Priya", "John", "Maria", "Wei", "Fatima", "Lucas", "Anika",
+               "Kavi", "Sara", "Omar", "Elena"]
+LAST_NAMES = ["Kumar", "Smith", "Garcia", "Chen", "Khan", "Silva", "Rao", "Novak"]
+EXTRA_SKILLS = ["excel", "power bi", "tableau", "linux", "bash", "kubernetes", "react",
+                "node", "rest api", "statistics", "leadership", "time management",
+                "jira", "agile", "spark", "hadoop", "redis", "graphql"]
+PROSE = [
+    "Designed and shipped features used by thousands of customers every day.",
+    "Worked closely with product and design teams to refine requirements.",
+    "Reduced report generation time by rewriting slow database queries.",
+    "Mentored junior engineers and reviewed code across several services.",
+    "Automated deployment pipelines and improved release reliability.",
+    "Analyzed user behaviour data to prioritise the product roadmap.",
+]
+
+# Roughly one A4 page of body text
+LINES_PER_PAGE = 45
+
+
+# ---------- TEXT ----------
+def _pick_skills(rng, n):
+    pool = SKILL_DB + EXTRA_SKILLS
+    return rng.sample(pool, min(n, len(pool)))
+
+
+def _prose(rng, lines):
+    return [rng.choice(PROSE) for _ in range(lines)]
+
+
+def make_resume_text(rng, pages=1, skills=15):
+    chosen = _pick_skills(rng, skills)
+    third = max(1, len(chosen) // 3)
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "candidate@example.com | +91 98765 43210",
+        "Core Skills",
+        ", ".join(chosen[:third]),
+        "Intermediate Skills",
+        ", ".join(chosen[third:2 * third]),
+        "Familiar With",
+        ", ".join(chosen[2 * third:]),
+        "Experience",
+    ]
+    lines += _prose(rng, max(1, pages * LINES_PER_PAGE - len(lines) - 4))
+    lines += ["Education", "B.Tech in Computer Science, 2021"]
+    return "\n".join(lines)
+
+
+def make_jd_text(rng, pages=1, skills=10, density=0.5):
+    """JD whose bullets carry `skills` skills; `density` is the share of
+    bullet lines that mention skills at all (the rest is boilerplate)."""
+    chosen = _pick_skills(rng, skills)
+    skill_bullets = []
+    for i in range(0, len(chosen), 3):
+        group = chosen[i:i + 3]
+        skill_bullets.append("• Experience with " + ", ".join(group[:-1]) +
+                             (" and " if len(group) > 1 else "") + group[-1])
+
+    n_filler = int(len(skill_bullets) * (1 - density) / max(density, 1e-6))
+    bullets = skill_bullets + ["• " + p for p in _prose(rng, n_filler)]
+    rng.shuffle(bullets)
+
+    lines = ["Software Engineer", "About the role", "Requirements"] + bullets
+    lines += _prose(rng, max(0, pages * LINES_PER_PAGE - len(lines)))
+    return "\n".join(lines)
+
+
+# ---------- FILES ----------
+def write_pdf(path, text):
+    # PyMuPDF's HTML story flows text over pages with Unicode fonts, so
+    # bullets ("•") survive into the PDF like in real JDs
+    import html
+    import fitz
+
+    body = "".join(f"<p style='margin:0'>{html.escape(line) or '&nbsp;'}</p>"
+                   for line in text.split("\n"))
+    story = fitz.Story(f"<body style='font-size:10pt'>{body}</body>")
+    writer = fitz.DocumentWriter(path)
+    page = fitz.paper_rect("a4")
+    more = 1
+    while more:
+        device = writer.begin_page(page)
+        more, _ = story.place(page + (50, 50, -50, -50))
+        story.draw(device)
+        writer.end_page()
+    writer.close()
+
+
+def write_docx(path, text):
+    import docx
+
+    d = docx.Document()
+    for line in text.split("\n"):
+        d.add_paragraph(line)
+    d.save(path)
+
+
+def generate_corpus(out_dir, resumes=20, jds=3, pages=1, skills=15, jd_skills=10,
+                    density=0.5, formats=("pdf", "docx"), seed=0):
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(out_dir, "resumes"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "jds"), exist_ok=True)
+
+    manifest = {"resumes": [], "jds": [],
+                "params": {"resumes": resumes, "jds": jds, "pages": pages, "skills": skills,
+                           "jd_skills": jd_skills, "density": density,
+                           "formats": list(formats), "seed": seed}}
+
+    for kind, count, make in (("resumes", resumes, lambda: make_resume_text(rng, pages, skills)),
+                              ("jds", jds, lambda: make_jd_text(rng, pages, jd_skills, density))):
+        for i in range(count):
+            text = make()
+            fmt = formats[i % len(formats)]
+            path = os.path.join(out_dir, kind, f"{kind[:-1]}_{i:04d}.{fmt}")
+            if fmt == "pdf":
+                write_pdf(path, text)
+            elif fmt == "docx":
+                write_docx(path, text)
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            manifest[kind].append(path)
+
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume/JD corpus")
+    parser.add_argument("out")
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--jds", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--skills", type=int, default=15, help="skills per resume")
+    parser.add_argument("--jd-skills", type=int, default=10, help="skills per JD")
+    parser.add_argument("--density", type=float, default=0.5,
+                        help="share of JD bullets that mention skills")
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx"],
+                        choices=["pdf", "docx", "txt"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.out, args.resumes, args.jds, args.pages, args.skills,
+                               args.jd_skills, args.density, tuple(args.formats), args.seed)
+    print(f"wrote {len(manifest['resumes'])} resumes and {len(manifest['jds'])} JDs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/load_test.py
+#
+# Drives a running api_server.py with concurrent clients and reports
+# requests/sec and latency percentiles per endpoint.
+#
+#   python api_server.py --port 8080 &
+#   python benchmarks/load_test.py --url http://127.0.0.1:8080 --concurrency 1 8 32
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+
+from corpus import make_resume_text, make_jd_text
+
+
+ENDPOINTS = ["extract-skills", "match", "match/batch"]
+
+
+def make_payloads(endpoint, n, batch_size, rng):
+    jd = make_jd_text(rng, pages=1, skills=12)
+    payloads = []
+    for _ in range(n):
+        if endpoint in ("extract-skills", "match"):
+            payloads.append({"resume_text": make_resume_text(rng, pages=1), "jd_text": jd})
+        else:
+            payloads.append({"jd_text": jd, "top_k": 10,
+                             "resumes": [make_resume_text(rng, pages=1)
+                                         for _ in range(batch_size)]})
+    return payloads
+
+
+async def run_load(url, payloads, concurrency):
+    latencies = []
+    statuses = Counter()
+    queue = list(reversed(payloads))
+
+    async def client(session):
+        while queue:
+            payload = queue.pop()
+            start = time.perf_counter()
+            try:
+                async with session.post(url, json=payload) as resp:
+                    await resp.read()
+                    statuses[resp.status] += 1
+            except aiohttp.ClientError as e:
+                statuses[type(e).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "req_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p99_ms": latencies[math.ceil(0.99 * len(latencies)) - 1] * 1000 if latencies else None,
+        "statuses": dict(statuses),
+    }
+
+
+async def main_async(args):
+    rng = random.Random(args.seed)
+    async with aiohttp.ClientSession() as session:
+        try:
+            async with session.get(f"{args.url}/health") as resp:
+                resp.raise_for_status()
+        except aiohttp.ClientError as e:
+            print(f"server not reachable at {args.url} ({type(e).__name__})")
+            return 1
+
+    print(f"{'endpoint':>14} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}  statuses")
+    for endpoint in args.endpoints:
+        payloads = make_payloads(endpoint, args.requests, args.batch_size, rng)
+        # Warm-up: first requests pay for worker start-up and model load
+        await run_load(f"{args.url}/{endpoint}", payloads[:2], 1)
+        for concurrency in args.concurrency:
+            r = await run_load(f"{args.url}/{endpoint}", payloads, concurrency)
+            p50 = f"{r['p50_ms']:>8.2f}" if r["p50_ms"] is not None else f"{'-':>8}"
+            p99 = f"{r['p99_ms']:>8.2f}" if r["p99_ms"] is not None else f"{'-':>8}"
+            print(f"{endpoint:>14} {concurrency:>7} {r['req_s']:>8.1f} {p50} {p99}  {r['statuses']}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for api_server.py")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--endpoints", nargs="+", default=ENDPOINTS, choices=ENDPOINTS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per run")
+    parser.add_argument("--batch-size", type=int, default=20, help="resumes per /match/batch")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
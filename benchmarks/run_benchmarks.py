@@ -0,0 +1,217 @@
+# benchmarks/run_benchmarks.py
+#
+# Times every pipeline stage separately and end to end on a synthetic corpus,
+# records peak memory, and writes machine-readable JSON for comparing versions.
+#
+#   python benchmarks/run_benchmarks.py --out results.json
+#   python benchmarks/run_benchmarks.py --out new.json --compare results.json
+#   python benchmarks/run_benchmarks.py --corpus existing_corpus/ --stages parse_resume jd_skills
+
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_corpus
+
+
+STAGES = ["extract_pdf", "extract_docx", "parse_resume", "jd_skills", "filter",
+          "compare", "report", "end_to_end"]
+
+
+# ---------- MEASUREMENT ----------
+def time_stage(fn, items, repeat=1):
+    """Wall time per item (timing pass), then peak Python heap (traced pass)."""
+    durations = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            fn(item)
+            durations.append(time.perf_counter() - start)
+
+    # tracemalloc slows Python code down, so memory is measured separately
+    tracemalloc.start()
+    for item in items:
+        fn(item)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    durations.sort()
+    total = sum(durations)
+    return {
+        "n": len(durations),
+        "total_s": round(total, 6),
+        "mean_ms": round(total / len(durations) * 1000, 4),
+        "p50_ms": round(statistics.median(durations) * 1000, 4),
+        "p95_ms": round(durations[math.ceil(0.95 * len(durations)) - 1] * 1000, 4),
+        "max_ms": round(durations[-1] * 1000, 4),
+        "items_per_s": round(len(durations) / total, 2) if total else None,
+        "peak_mib": round(peak / 2**20, 3),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------- STAGES ----------
+def run_stages(manifest, stages, repeat):
+    from doc_utils import extract_text_path, extract_candidate_name
+    from nlp_utils import (extract_resume_skills_strict, extract_resume_skills, get_jd_skills,
+                           filter_real_skills, compare_skill_sets, analyze_documents,
+                           get_taxonomy_index)
+    from report_utils import build_report_pdf
+
+    resumes, jds = manifest["resumes"], manifest["jds"]
+    docs = resumes + jds
+    texts = {p: extract_text_path(p) for p in docs}
+    resume_texts = [texts[p] for p in resumes]
+    jd_texts = [texts[p] for p in jds]
+
+    # Mapped onto the SKILLGAP_TAXONOMY_INDEX taxonomy when one is configured, as in the app
+    skill_index = get_taxonomy_index()
+    resume_skills = [extract_resume_skills(t, skill_index) for t in resume_texts]
+    jd_skills = filter_real_skills(get_jd_skills(jd_texts[0]))
+
+    def compare(skills):
+        return compare_skill_sets(skills, jd_skills)
+
+    def end_to_end(path):
+        text = extract_text_path(path)
+        result = analyze_documents(text, jd_texts[0], skill_index=skill_index)
+        return build_report_pdf(extract_candidate_name(text), result["matched"],
+                                result["missing"], result["match_pct"])
+
+    plans = {
+        "extract_pdf": (extract_text_path, [p for p in docs if p.endswith(".pdf")]),
+        "extract_docx": (extract_text_path, [p for p in docs if p.endswith(".docx")]),
+        "parse_resume": (extract_resume_skills_strict, resume_texts),
+        "jd_skills": (get_jd_skills, jd_texts),
+        "filter": (filter_real_skills, resume_skills),
+        "compare": (compare, resume_skills),
+        "report": (lambda s: build_report_pdf("Jane Roe", s[:len(s) // 2], s[len(s) // 2:], 50),
+                   resume_skills),
+        "end_to_end": (end_to_end, resumes),
+    }
+
+    results = {}
+    for name in stages:
+        fn, items = plans[name]
+        if not items:
+            results[name] = {"skipped": "no input documents for this stage"}
+            continue
+        try:
+            fn(items[0])  # warm-up: imports, model load, pools
+        except Exception as e:
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+            print(f"{name:>13}  skipped ({type(e).__name__})", file=sys.stderr)
+            continue
+        results[name] = time_stage(fn, items, repeat)
+        r = results[name]
+        print(f"{name:>13}  n={r['n']:<5} mean={r['mean_ms']:>9.3f} ms  p95={r['p95_ms']:>9.3f} ms  "
+              f"peak={r['peak_mib']:>7.2f} MiB", file=sys.stderr)
+    return results
+
+
+# ---------- COMPARISON ----------
+def compare_results(current, baseline, tolerance):
+    regressions = []
+    print(f"\n{'stage':>13} {'base ms':>10} {'new ms':>10} {'ratio':>7}", file=sys.stderr)
+    for name, cur in current["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or "mean_ms" not in base or "mean_ms" not in cur:
+            continue
+        ratio = cur["mean_ms"] / base["mean_ms"] if base["mean_ms"] else float("inf")
+        flag = "  REGRESSION" if ratio > 1 + tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:>13} {base['mean_ms']:>10.3f} {cur['mean_ms']:>10.3f} {ratio:>7.2f}{flag}",
+              file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage and end-to-end pipeline benchmark")
+    parser.add_argument("--out", help="write JSON results here (default: stdout)")
+    parser.add_argument("--corpus", help="use an existing corpus directory (with manifest.json)")
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--jds", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--skills", type=int, default=15)
+    parser.add_argument("--jd-skills", type=int, default=10)
+    parser.add_argument("--density", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="disable the persistent embedding cache while timing")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="mean slowdown allowed before a stage counts as a regression")
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ["SKILLGAP_EMBED_CACHE"] = "0"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            with open(os.path.join(args.corpus, "manifest.json")) as f:
+                manifest = json.load(f)
+        else:
+            manifest = generate_corpus(tmp, args.resumes, args.jds, args.pages, args.skills,
+                                       args.jd_skills, args.density, seed=args.seed)
+
+        start = time.perf_counter()
+        stages = run_stages(manifest, args.stages, args.repeat)
+        elapsed = time.perf_counter() - start
+
+    from nlp_utils import MODEL_VERSION  # includes the taxonomy index, if any
+
+    results = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "model_version": MODEL_VERSION,
+            "corpus": manifest.get("params"),
+            "repeat": args.repeat,
+            "wall_s": round(elapsed, 3),
+            "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        },
+        "stages": stages,
+    }
+
+    payload = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare_results(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# doc_utils.py
+
+import atexit
+import io
+import os
+
+import metrics
+
+# PyMuPDF (fitz) and python-docx are imported where they are used, so
+# importing this module (and starting the app) does not pay for them
+
+
+# ----------------------------------------------------
+# TEXT EXTRACTION FUNCTIONS
+# ----------------------------------------------------
+
+# Page-parallel extraction only pays off past this many pages
+PARALLEL_MIN_PAGES = int(os.environ.get("SKILLGAP_PDF_PARALLEL_MIN_PAGES", "32"))
+PDF_WORKERS = int(os.environ.get("SKILLGAP_PDF_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+_page_pool = None
+
+
+def _open_pdf(file):
+    import fitz
+
+    # Returns the open document and a picklable source workers can reopen
+    if isinstance(file, (str, os.PathLike)):
+        return fitz.open(file), os.fspath(file)
+
+    file.seek(0)
+    # BytesIO.getvalue() hands back the upload's own bytes without copying
+    # them, and unlike getbuffer() leaves no export pinning the upload
+    data = file.getvalue() if hasattr(file, "getvalue") else file.read()
+    return fitz.open(stream=data, filetype="pdf"), data
+
+
+def iter_pdf_pages(file, early_stop=False):
+    """Yield the text of each page in order.
+
+    With early_stop=True extraction ends once every skills section that
+    has been opened is also closed by a later section header, so pages
+    after that are never parsed.
+    """
+    pdf, _ = _open_pdf(file)
+    try:
+        yield from _iter_pages(pdf, early_stop)
+    finally:
+        pdf.close()
+
+
+def _iter_pages(pdf, early_stop):
+    seen = []
+    for page in pdf:
+        text = page.get_text()
+        yield text
+
+        if early_stop:
+            seen.append(text)
+            if _skills_section_closed(seen):
+                return
+
+
+def _skills_section_closed(pages):
+    from nlp_utils import SECTION_KEYWORD_RE, find_section_spans
+
+    # Only re-parse when the newest page can have changed the answer
+    if not SECTION_KEYWORD_RE.search(pages[-1].lower()):
+        return False
+    text = "".join(pages).lower()
+    # The generic "skills" span often closes at the next "... skills"
+    # sub-header, so wait until no section is still open at the end of the text
+    spans = find_section_spans(text).values()
+    return bool(spans) and all(end < len(text) for _, end in spans)
+
+
+def _extract_page_range(source, start, stop):
+    import fitz
+
+    if isinstance(source, str):
+        pdf = fitz.open(source)
+    else:
+        pdf = fitz.open(stream=source, filetype="pdf")
+    try:
+        return [pdf[i].get_text() for i in range(start, stop)]
+    finally:
+        pdf.close()
+
+
+def _get_page_pool():
+    global _page_pool
+    if _page_pool is None:
+        import multiprocessing as mp
+        from concurrent.futures import ProcessPoolExecutor
+        # spawn, not fork: the Streamlit server process is multi-threaded
+        _page_pool = ProcessPoolExecutor(PDF_WORKERS, mp_context=mp.get_context("spawn"))
+        atexit.register(_page_pool.shutdown, cancel_futures=True)
+    return _page_pool
+
+
+def _can_start_workers():
+    import multiprocessing as mp
+    # Daemonic processes (multiprocessing.Pool workers, e.g. batch_cli) may not have children
+    return PDF_WORKERS > 1 and not mp.current_process().daemon
+
+
+def _extract_pages_parallel(source, page_count):
+    tmp = None
+    if not isinstance(source, str):
+        # Spill an upload to disk once and hand the workers its path, rather
+        # than pickling a copy of the whole document into every task
+        import tempfile
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            f.write(source)
+        source = tmp = f.name
+    try:
+        step = -(-page_count // PDF_WORKERS)
+        futures = [_get_page_pool().submit(_extract_page_range, source, i, min(i + step, page_count))
+                   for i in range(0, page_count, step)]
+        for f in futures:
+            yield from f.result()
+    finally:
+        if tmp:
+            os.unlink(tmp)
+
+
+@metrics.timed("extract_pdf")
+def extract_text_pdf(file, early_stop=False, parallel=True):
+    pdf, source = _open_pdf(file)
+    try:
+        if (parallel and not early_stop and pdf.page_count >= PARALLEL_MIN_PAGES
+                and _can_start_workers()):
+            pages = _extract_pages_parallel(source, pdf.page_count)
+        else:
+            pages = _iter_pages(pdf, early_stop)
+        # Stream the pages into one buffer, so the page texts and the joined
+        # text are never held at the same time
+        out, n_pages = io.StringIO(), 0
+        for n_pages, text in enumerate(pages, 1):
+            out.write(text)
+        metrics.inc("document_pages", n_pages)
+        return out.getvalue()
+    finally:
+        pdf.close()
+
+
+@metrics.timed("extract_docx")
+def extract_text_docx(file):
+    import docx
+
+    file.seek(0)
+    d = docx.Document(file)
+    return "\n".join([p.text for p in d.paragraphs])
+
+
+def extract_text(file, name=None):
+    # Dispatch on the file extension; `file` is an open binary file or upload
+    name = name or getattr(file, "name", "")
+    if name.lower().endswith("pdf"):
+        return extract_text_pdf(file)
+    return extract_text_docx(file)
+
+
+def extract_text_path(path, early_stop=False):
+    if path.lower().endswith("pdf"):
+        # MuPDF reads the file itself; it is never loaded whole into memory
+        return extract_text_pdf(path, early_stop=early_stop)
+    with open(path, "rb") as f:
+        return extract_text_docx(f)
+
+
+# ----------------------------------------------------
+# CANDIDATE NAME EXTRACTION
+# ----------------------------------------------------
+
+def extract_candidate_name(text):
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
+
+    for line in lines[:10]:  # look at top section only
+        clean = line.replace("-", " ").replace("–", " ").strip()
+
+        if (
+            clean.replace(" ", "").isalpha() and        # only letters
+            2 <= len(clean.split()) <= 4 and            # 2–4 words
+            not any(x in clean.lower() for x in 
+                    ["objective", "education", "skills", "project",
+                     "experience", "resume", "email", "@", "phone"])
+        ):
+            return clean.title()
+
+    return "Unknown Candidate"
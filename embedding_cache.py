@@ -0,0 +1,225 @@
+# embedding_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+import metrics
+
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SKILLGAP_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "skillgap")
+)
+DEFAULT_CAPACITY = int(os.environ.get("SKILLGAP_CACHE_CAPACITY", "50000"))
+
+# Hits only rewrite their LRU timestamp when it is older than this,
+# so a hot skill does not cost a database write on every request.
+TOUCH_INTERVAL = 60.0
+
+
+# ---------- KEY NORMALIZATION ----------
+def normalize_skill_key(skill):
+    return " ".join(str(skill).lower().split())
+
+
+def cache_key(model_name, skill):
+    raw = f"{model_name}\0{normalize_skill_key(skill)}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+# ---------- MODEL DIMENSIONS ----------
+def model_dim(model_name, compute_dim, path=DEFAULT_CACHE_DIR):
+    """Embedding size of `model_name`, as recorded in the cache directory.
+
+    The first process to ask calls `compute_dim()` (which loads the model)
+    and records the answer, so later ones open the cache without the model.
+    """
+    os.makedirs(path, exist_ok=True)
+    db = sqlite3.connect(os.path.join(path, "models.db"), timeout=30, isolation_level=None)
+    try:
+        db.execute("CREATE TABLE IF NOT EXISTS models ("
+                   " name TEXT PRIMARY KEY,"
+                   " dim INTEGER NOT NULL)")
+        row = db.execute("SELECT dim FROM models WHERE name = ?", (model_name,)).fetchone()
+        if row:
+            return row[0]
+        dim = int(compute_dim())
+        db.execute("INSERT OR REPLACE INTO models VALUES (?, ?)", (model_name, dim))
+        return dim
+    finally:
+        db.close()
+
+
+# ---------- PERSISTENT EMBEDDING CACHE ----------
+class EmbeddingCache:
+    """Content-addressed skill embeddings shared by every process on the host.
+
+    Vectors live in a fixed-size memory-mapped file; a small SQLite index maps
+    each (model, normalized skill) key to its slot and keeps the LRU order.
+    Writers take an exclusive database lock before touching the mapped file,
+    readers copy vectors out while holding a shared lock.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_DIR, dim=384, capacity=DEFAULT_CAPACITY):
+        os.makedirs(path, exist_ok=True)
+        self.dim = dim
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        stem = os.path.join(path, f"embeddings_{dim}x{capacity}")
+        self.index_path = stem + ".db"
+        self.vectors_path = stem + ".f32"
+
+        self._db = sqlite3.connect(self.index_path, timeout=30,
+                                   isolation_level=None, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " slot INTEGER UNIQUE NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_used)")
+
+        size = dim * capacity * np.dtype(np.float32).itemsize
+        if not os.path.exists(self.vectors_path) or os.path.getsize(self.vectors_path) != size:
+            with open(self.vectors_path, "wb") as f:
+                f.truncate(size)
+            self._db.execute("DELETE FROM entries")
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32,
+                                 mode="r+", shape=(capacity, dim))
+
+    # ---------- LOOKUP ----------
+    def get_or_compute(self, model_name, skills, encode_fn):
+        """Return a (len(skills), dim) float32 array, encoding only the misses.
+
+        `encode_fn` receives the normalized skill strings that were not cached
+        and must return their embeddings in the same order.
+        """
+        out = np.empty((len(skills), self.dim), dtype=np.float32)
+        if not skills:
+            return out
+
+        keys = [cache_key(model_name, s) for s in skills]
+
+        with self._lock:
+            found, stale = self._read(keys, out)
+
+        pending = {}
+        for i, k in enumerate(keys):
+            if k not in found:
+                pending.setdefault(k, []).append(i)
+
+        n_misses = sum(len(v) for v in pending.values())
+        with self._lock:
+            self.hits += len(skills) - n_misses
+            self.misses += n_misses
+        metrics.inc("embedding_cache_hits", len(skills) - n_misses)
+        metrics.inc("embedding_cache_misses", n_misses)
+
+        if pending:
+            first = [idx[0] for idx in pending.values()]
+            texts = [normalize_skill_key(skills[i]) for i in first]
+            vecs = np.asarray(encode_fn(texts), dtype=np.float32)
+            for (k, idx), vec in zip(pending.items(), vecs):
+                out[idx] = vec
+            with self._lock:
+                self._write(list(pending), vecs, stale)
+        elif stale:
+            with self._lock:
+                self._touch(stale)
+
+        return out
+
+    def _read(self, keys, out):
+        found = {}
+        stale = []
+        now = time.time()
+        unique = list(dict.fromkeys(keys))
+
+        self._db.execute("BEGIN")
+        try:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, slot, last_used FROM entries WHERE key IN ({marks})",
+                    chunk
+                ).fetchall()
+                for key, slot, last_used in rows:
+                    found[key] = slot
+                    if now - last_used > TOUCH_INTERVAL:
+                        stale.append(key)
+
+            for i, k in enumerate(keys):
+                if k in found:
+                    out[i] = self.vectors[found[k]]
+        finally:
+            self._db.execute("COMMIT")
+
+        return found, stale
+
+    # ---------- INSERT / EVICT ----------
+    def _write(self, keys, vecs, stale):
+        now = time.time()
+        self._db.execute("BEGIN EXCLUSIVE")
+        try:
+            if stale:
+                self._db.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                                     [(now, k) for k in stale])
+
+            size = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            for key, vec in zip(keys, vecs):
+                if self._db.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone():
+                    continue  # another process stored it meanwhile
+
+                if size < self.capacity:
+                    slot = size
+                    size += 1
+                    self._db.execute("INSERT INTO entries VALUES (?, ?, ?)", (key, slot, now))
+                else:
+                    old_key, slot = self._db.execute(
+                        "SELECT key, slot FROM entries ORDER BY last_used LIMIT 1"
+                    ).fetchone()
+                    self._db.execute("UPDATE entries SET key = ?, last_used = ? WHERE key = ?",
+                                     (key, now, old_key))
+
+                self.vectors[slot] = vec
+
+            self.vectors.flush()
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _touch(self, keys):
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                             [(now, k) for k in keys])
+        self._db.execute("COMMIT")
+
+    # ---------- STATS ----------
+    def stats(self):
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": size,
+                "capacity": self.capacity,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,120 @@
+# encode_service.py
+#
+# Coalesces concurrent encode requests (one per Streamlit session or API
+# request) into shared forward passes. Callers block in encode() while a
+# single background thread drains the queue:
+#
+#   1. wait for the first pending request
+#   2. keep collecting requests until max_batch strings are queued or
+#      max_wait seconds have passed since the first one arrived
+#   3. encode the distinct strings of the whole batch in one call
+#   4. hand every caller its own rows
+#
+# The wait in step 2 only happens while the service is busy (the previous
+# batch served several callers), so a lone caller is never delayed; under
+# load, requests that queue up during a forward pass join the next batch.
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+import metrics
+
+
+class EncodeService:
+    def __init__(self, encode_fn, max_batch=128, max_wait=0.005):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._last_batch = 1
+        self._thread = threading.Thread(target=self._run, name="encode-service", daemon=True)
+        self._thread.start()
+
+        self.requests = 0
+        self.batches = 0
+        self.strings = 0
+
+    # ---------- CALLER SIDE ----------
+    def submit(self, texts):
+        """Queue `texts` for encoding; the Future resolves to their embeddings."""
+        if self._closed:
+            raise RuntimeError("EncodeService is closed")
+        future = Future()
+        self._queue.put((list(texts), future))
+        return future
+
+    def encode(self, texts):
+        return self.submit(texts).result()
+
+    def close(self):
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    # ---------- BATCHING LOOP ----------
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        size = len(first[0])
+        wait = self.max_wait if self._last_batch > 1 else 0
+        deadline = time.perf_counter() + wait
+        while size < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # finish this batch, then stop
+                break
+            batch.append(item)
+            size += len(item[0])
+        self._last_batch = len(batch)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            self._process(batch)
+
+    def _process(self, batch):
+        # Sessions often share skills ("python", "sql"): encode each once
+        unique = {}
+        for texts, _ in batch:
+            for t in texts:
+                unique.setdefault(t, len(unique))
+
+        try:
+            vecs = np.asarray(self.encode_fn(list(unique)) if unique else np.empty((0, 0)))
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for texts, future in batch:
+            future.set_result(vecs[[unique[t] for t in texts]] if texts else vecs[:0])
+
+        self.requests += len(batch)
+        self.batches += 1
+        self.strings += len(unique)
+        metrics.inc("encode_batches")
+        metrics.inc("encode_requests", len(batch))
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "strings": self.strings,
+            "requests_per_batch": round(self.requests / self.batches, 2) if self.batches else None,
+        }
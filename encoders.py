@@ -0,0 +1,54 @@
+# encoders.py
+#
+# Pluggable CPU backends for the sentence encoder. Every backend returns a
+# SentenceTransformer-compatible object (encode, get_sentence_embedding_dimension).
+#
+#   SKILLGAP_ENCODER_BACKEND=torch      full-precision PyTorch (default)
+#   SKILLGAP_ENCODER_BACKEND=int8       PyTorch with dynamically int8-quantized Linear layers
+#   SKILLGAP_ENCODER_BACKEND=onnx       ONNX Runtime, fp32 export
+#   SKILLGAP_ENCODER_BACKEND=onnx-int8  ONNX Runtime, int8-quantized export
+#
+# The ONNX backends need `onnxruntime` (pip install "sentence-transformers[onnx]").
+
+import os
+
+
+BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+
+ENCODER_BACKEND = os.environ.get("SKILLGAP_ENCODER_BACKEND", "torch")
+
+# Quantized export shipped in the model repo; pick the one matching the CPU
+# (e.g. onnx/model_qint8_avx512.onnx, onnx/model_qint8_arm64.onnx)
+ONNX_INT8_FILE = os.environ.get("SKILLGAP_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+
+
+def load_encoder(model_name, backend=None):
+    backend = backend or ENCODER_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown encoder backend {backend!r}; expected one of {BACKENDS}")
+
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name, device="cpu")
+
+    if backend == "int8":
+        import torch
+        from torch.ao.quantization import quantize_dynamic
+
+        model = SentenceTransformer(model_name, device="cpu")
+        model.eval()
+        # Weights stored as int8, activations quantized on the fly per batch
+        quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        return model
+
+    if backend == "onnx":
+        return SentenceTransformer(model_name, device="cpu", backend="onnx")
+
+    return SentenceTransformer(model_name, device="cpu", backend="onnx",
+                               model_kwargs={"file_name": ONNX_INT8_FILE})
+
+
+def encoder_id(model_name, backend=None):
+    # Embeddings from different backends differ slightly, so caches key on both
+    return f"{model_name}:{backend or ENCODER_BACKEND}"
@@ -0,0 +1,431 @@
+# job_queue.py
+#
+# Durable local job queue for long screening runs (SQLite, no broker).
+# Every resume is a job; worker processes claim jobs under a lease, store
+# each result as soon as it is done, and retry failures with exponential
+# backoff. A run can be stopped at any point and resumed, and more workers
+# (or hosts sharing the file system) can join while it runs.
+#
+#   python job_queue.py submit --db queue.db --run june --resumes resumes/ --jds jds/
+#   python job_queue.py work   --db queue.db --workers 4        # Ctrl-C stops, rerun resumes
+#   python job_queue.py status --db queue.db --run june
+#   python job_queue.py export --db queue.db --run june --out june.csv
+#
+# Job states: pending -> running -> done | failed. A running job whose
+# lease runs out (worker killed, host lost) is claimed again by the next
+# worker; a failed attempt waits RETRY_BASE * 2^(attempt - 1) seconds
+# (at most RETRY_MAX) before it is retried, up to max_attempts.
+
+import argparse
+import importlib
+import json
+import os
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+import shared_models
+
+
+LEASE_SECONDS = float(os.environ.get("SKILLGAP_QUEUE_LEASE", "300"))
+MAX_ATTEMPTS = int(os.environ.get("SKILLGAP_QUEUE_MAX_ATTEMPTS", "3"))
+RETRY_BASE = 2.0
+RETRY_MAX = 300.0
+POLL_SECONDS = 0.5
+
+# Job kind -> "module:function" run by the workers on the job payload
+HANDLERS = {
+    "analyze_resume": "batch_cli:_analyze_resume_job",
+}
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    " id INTEGER PRIMARY KEY, run TEXT NOT NULL, key TEXT NOT NULL, kind TEXT NOT NULL,"
+    " payload TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'pending',"
+    " attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL,"
+    " available_at REAL NOT NULL, lease_until REAL, worker TEXT,"
+    " result TEXT, error TEXT, created REAL NOT NULL, started REAL, finished REAL,"
+    " UNIQUE (run, key))",
+    "CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, available_at)",
+    "CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (status, lease_until)",
+    "CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (run, status, finished)",
+)
+
+STATES = ("pending", "running", "done", "failed")
+
+
+def retry_delay(attempts):
+    # Exponential backoff with jitter so failed jobs do not retry in lockstep
+    delay = min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX)
+    return delay * random.uniform(1.0, 1.25)
+
+
+class JobQueue:
+    """Jobs in one SQLite file; every state change is its own transaction."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            self._db.execute(statement)
+
+    def close(self):
+        self._db.close()
+
+    def _write(self, fn):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._db)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return out
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # ---------- PRODUCER ----------
+    def enqueue(self, run, kind, jobs, max_attempts=MAX_ATTEMPTS):
+        """Add [(key, payload)] to a run; keys already in the run are skipped,
+        so submitting the same inputs again only adds the new ones."""
+        now = time.time()
+        rows = [(run, key, kind, json.dumps(payload), max_attempts, now, now)
+                for key, payload in jobs]
+
+        def write(db):
+            before = db.total_changes
+            db.executemany("INSERT OR IGNORE INTO jobs (run, key, kind, payload, max_attempts,"
+                           " available_at, created) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            return db.total_changes - before
+
+        return self._write(write)
+
+    def requeue_failed(self, run=None):
+        """Give failed jobs a fresh set of attempts."""
+        sql = ("UPDATE jobs SET status = 'pending', attempts = 0, available_at = ?, error = NULL"
+               " WHERE status = 'failed'")
+        params = [time.time()]
+        if run is not None:
+            sql += " AND run = ?"
+            params.append(run)
+        return self._write(lambda db: db.execute(sql, params).rowcount)
+
+    # ---------- WORKER ----------
+    def claim(self, worker, run=None, lease=LEASE_SECONDS):
+        """Lease the next runnable job to `worker`; None if there is none yet."""
+        run_filter, run_params = ("AND run = ?", [run]) if run is not None else ("", [])
+
+        def write(db):
+            now = time.time()
+            # Jobs of lost workers: retried, or failed once out of attempts
+            db.execute("UPDATE jobs SET status = 'failed', error = 'lease expired', finished = ?"
+                       " WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts "
+                       + run_filter, [now, now] + run_params)
+            row = db.execute("SELECT id FROM jobs WHERE ((status = 'pending' AND available_at <= ?)"
+                             " OR (status = 'running' AND lease_until < ?)) " + run_filter +
+                             " ORDER BY id LIMIT 1", [now, now] + run_params).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE jobs SET status = 'running', attempts = attempts + 1,"
+                       " lease_until = ?, worker = ?, started = COALESCE(started, ?) WHERE id = ?",
+                       (now + lease, worker, now, row[0]))
+            return db.execute("SELECT id, run, key, kind, payload, attempts FROM jobs"
+                              " WHERE id = ?", row).fetchone()
+
+        row = self._write(write)
+        if row is None:
+            return None
+        job_id, run, key, kind, payload, attempts = row
+        return {"id": job_id, "run": run, "key": key, "kind": kind,
+                "payload": json.loads(payload), "attempts": attempts}
+
+    def extend(self, job_id, worker, lease=LEASE_SECONDS):
+        """Renew a lease; False if the job is no longer this worker's."""
+        return self._write(lambda db: db.execute(
+            "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + lease, job_id, worker)).rowcount) == 1
+
+    def complete(self, job_id, worker, result):
+        return self._write(lambda db: db.execute(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL,"
+            " finished = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (json.dumps(result), time.time(), job_id, worker)).rowcount) == 1
+
+    def fail(self, job_id, worker, error):
+        """Schedule a retry with backoff, or mark the job failed when out of attempts."""
+        def write(db):
+            row = db.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND worker = ?"
+                             " AND status = 'running'", (job_id, worker)).fetchone()
+            if row is None:
+                return False
+            attempts, max_attempts = row
+            now = time.time()
+            if attempts >= max_attempts:
+                db.execute("UPDATE jobs SET status = 'failed', error = ?, lease_until = NULL,"
+                           " finished = ? WHERE id = ?", (error, now, job_id))
+            else:
+                db.execute("UPDATE jobs SET status = 'pending', error = ?, lease_until = NULL,"
+                           " available_at = ? WHERE id = ?",
+                           (error, now + retry_delay(attempts), job_id))
+            return True
+
+        return self._write(write)
+
+    def release(self, job_id, worker):
+        """Hand an interrupted job back without counting the attempt."""
+        return self._write(lambda db: db.execute(
+            "UPDATE jobs SET status = 'pending', attempts = attempts - 1, lease_until = NULL,"
+            " available_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time(), job_id, worker)).rowcount) == 1
+
+    # ---------- PROGRESS ----------
+    def progress(self, run=None, window=60.0):
+        """Job counts per state, recent and overall throughput, and an ETA."""
+        run_filter, params = (" WHERE run = ?", [run]) if run is not None else ("", [])
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(self._query("SELECT status, COUNT(*) FROM jobs" + run_filter +
+                                  " GROUP BY status", params))
+
+        now = time.time()
+        recent, first, last, run_start = self._query(
+            "SELECT SUM(status = 'done' AND finished >= ?),"
+            " MIN(CASE WHEN status = 'done' THEN started END),"
+            " MAX(CASE WHEN status = 'done' THEN finished END), MIN(started) FROM jobs"
+            + run_filter, [now - window] + params)[0]
+        # A run younger than the window has only been working for its age
+        elapsed = min(window, now - run_start) if run_start is not None else window
+        rate = (recent or 0) / elapsed if elapsed > 0 else 0.0
+        remaining = counts["pending"] + counts["running"]
+        return {
+            **counts,
+            "total": sum(counts.values()),
+            "jobs_per_s": round(rate, 3),
+            "overall_jobs_per_s": round(counts["done"] / (last - first), 3)
+            if first is not None and last > first else 0.0,
+            "eta_s": round(remaining / rate) if rate else None,
+        }
+
+    def outstanding(self, run=None):
+        """Pending or running jobs left (including ones waiting to be retried)."""
+        p = self.progress(run)
+        return p["pending"] + p["running"]
+
+    def finished_jobs(self, run):
+        """(key, payload, status, result, error) of done and failed jobs, in submission order."""
+        rows = self._query("SELECT key, payload, status, result, error FROM jobs WHERE run = ?"
+                           " AND status IN ('done', 'failed') ORDER BY id", (run,))
+        return [(k, json.loads(p), s, json.loads(r) if r else None, e) for k, p, s, r, e in rows]
+
+    def runs(self):
+        return [r[0] for r in self._query("SELECT DISTINCT run FROM jobs ORDER BY run")]
+
+
+# ---------- WORKERS ----------
+def _handler(kind):
+    module, name = HANDLERS[kind].split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+class _LeaseKeeper:
+    """Renews a job's lease in the background while the handler runs."""
+
+    def __init__(self, queue, job_id, worker, lease):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._renew, daemon=True,
+                                        args=(queue, job_id, worker, lease))
+
+    def _renew(self, queue, job_id, worker, lease):
+        while not self._stop.wait(lease / 3):
+            if not queue.extend(job_id, worker, lease):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def work(path, run=None, lease=LEASE_SECONDS, exit_when_idle=True):
+    """Claim and run jobs until none are left (or forever); returns the attempts run."""
+    queue = JobQueue(path)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    attempts = 0
+    try:
+        while True:
+            job = queue.claim(worker, run, lease)
+            if job is None:
+                if exit_when_idle and not queue.outstanding(run):
+                    return attempts
+                time.sleep(POLL_SECONDS)
+                continue
+
+            try:
+                with _LeaseKeeper(queue, job["id"], worker, lease):
+                    result = _handler(job["kind"])(job["payload"])
+            except KeyboardInterrupt:
+                queue.release(job["id"], worker)
+                raise
+            except Exception as e:
+                queue.fail(job["id"], worker, f"{type(e).__name__}: {e}")
+            else:
+                queue.complete(job["id"], worker, result)
+            attempts += 1
+    except KeyboardInterrupt:
+        return attempts
+    finally:
+        queue.close()
+
+
+def _worker_main(path, run, lease, exit_when_idle):
+    shared_models.init_worker()
+    work(path, run, lease, exit_when_idle)
+
+
+def _print_progress(p, end="\n"):
+    eta = f", ETA {p['eta_s']}s" if p["eta_s"] is not None else ""
+    print(f"\r{p['done']}/{p['total']} done, {p['running']} running, {p['pending']} pending, "
+          f"{p['failed']} failed | {p['jobs_per_s']:.2f} jobs/s{eta}   ",
+          end=end, file=sys.stderr)
+
+
+def run_workers(path, n, run=None, lease=LEASE_SECONDS, exit_when_idle=True, preload=False):
+    """Start n worker processes and report progress until they exit (Ctrl-C stops them)."""
+    context = shared_models.pool_context(preload)
+
+    procs = [context.Process(target=_worker_main, args=(path, run, lease, exit_when_idle))
+             for _ in range(n)]
+    for p in procs:
+        p.start()
+
+    queue = JobQueue(path)
+    try:
+        while any(p.is_alive() for p in procs):
+            _print_progress(queue.progress(run), end="")
+            time.sleep(2)
+    except KeyboardInterrupt:
+        # Workers get the same SIGINT, hand back their jobs and exit
+        print("\nstopping; running jobs are returned to the queue", file=sys.stderr)
+    finally:
+        for p in procs:
+            p.join()
+        _print_progress(queue.progress(run))
+        queue.close()
+
+
+# ---------- CLI ----------
+def submit(args):
+    import batch_cli
+
+    resumes = batch_cli.collect_files(args.resumes)
+    jd_paths = batch_cli.collect_files(args.jds)
+    if not resumes or not jd_paths:
+        print("error: need at least one resume and one JD (.pdf/.docx)", file=sys.stderr)
+        return 2
+
+    # JDs are few: extracted once here and carried in every job
+    jds = [batch_cli._extract_jd((p, args.store)) for p in jd_paths]
+    for path, _, error, _ in jds:
+        if error:
+            print(f"warning: {path}: {error}", file=sys.stderr)
+
+    queue = JobQueue(args.db)
+    added = queue.enqueue(args.run, "analyze_resume",
+                          [(path, [path, jds, args.threshold, args.early_stop, args.store])
+                           for path in resumes],
+                          args.max_attempts)
+    print(f"run {args.run!r}: {added} jobs added, {len(resumes) - added} already queued",
+          file=sys.stderr)
+    return 0
+
+
+def export(args):
+    import batch_cli
+
+    queue = JobQueue(args.db)
+    fmt = args.format or ("csv" if args.out.lower().endswith(".csv") else "jsonl")
+    writer = batch_cli.ResultWriter(args.out, fmt, append=False)
+    n = 0
+    try:
+        for key, payload, status, result, error in queue.finished_jobs(args.run):
+            if status == "done":
+                writer.write(result)
+            else:
+                writer.write([batch_cli._row(key, jd[0], error=error) for jd in payload[1]])
+            n += 1
+    finally:
+        writer.close()
+    print(f"{n} resumes exported", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Durable job queue for batch screening")
+    sub = parser.add_subparsers(dest="command", required=True)
+    # --db goes after the subcommand, like the other options
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", default="queue.db", help="queue database file")
+
+    sp = sub.add_parser("submit", parents=[common],
+                        help="queue every resume of a run against the JDs")
+    sp.add_argument("--run", required=True, help="run name; resubmitting adds only new resumes")
+    sp.add_argument("--resumes", nargs="+", required=True)
+    sp.add_argument("--jds", nargs="+", required=True)
+    sp.add_argument("--threshold", type=float, default=0.60)
+    sp.add_argument("--early-stop", action="store_true")
+    sp.add_argument("--store", metavar="DB", help="also record results in this analysis store")
+    sp.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+
+    wp = sub.add_parser("work", parents=[common],
+                        help="run worker processes until the queue is drained")
+    wp.add_argument("--run", help="only this run (default: all)")
+    wp.add_argument("--workers", type=int, default=os.cpu_count())
+    wp.add_argument("--lease", type=float, default=LEASE_SECONDS)
+    wp.add_argument("--forever", action="store_true", help="keep polling for new jobs")
+    shared_models.add_preload_argument(wp)
+
+    st = sub.add_parser("status", parents=[common], help="progress and throughput")
+    st.add_argument("--run")
+    st.add_argument("--json", action="store_true")
+
+    rq = sub.add_parser("retry", parents=[common], help="give failed jobs another set of attempts")
+    rq.add_argument("--run")
+
+    ex = sub.add_parser("export", parents=[common], help="write a run's results like batch_cli.py")
+    ex.add_argument("--run", required=True)
+    ex.add_argument("--out", default="-")
+    ex.add_argument("--format", choices=["jsonl", "csv"])
+    args = parser.parse_args(argv)
+
+    if args.command == "submit":
+        return submit(args)
+    if args.command == "work":
+        run_workers(args.db, args.workers, args.run, args.lease, not args.forever, args.preload)
+        return 0
+    if args.command == "status":
+        queue = JobQueue(args.db)
+        p = queue.progress(args.run)
+        if args.json:
+            print(json.dumps(p, indent=2))
+        else:
+            _print_progress(p)
+        return 0
+    if args.command == "retry":
+        print(f"{JobQueue(args.db).requeue_failed(args.run)} jobs requeued", file=sys.stderr)
+        return 0
+    return export(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# metrics.py
+#
+# In-process stage timings and counters for the analysis pipeline.
+#
+#   with metrics.span("encode"): ...        time a block
+#   @metrics.timed("parse_resume")          time every call of a function
+#   metrics.inc("encoded_strings", n)       bump a counter
+#
+# Durations land in one latency histogram per stage. Everything can be read
+# with snapshot() or exported with render_prometheus(); worker processes
+# return drain() to a parent that merge()s it. Set SKILLGAP_METRICS=0
+# to disable: timed() then returns functions unwrapped and span() / inc() are
+# a single flag check.
+
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+
+
+ENABLED = os.environ.get("SKILLGAP_METRICS", "1") != "0"
+
+PREFIX = "skillgap"
+
+# Upper bounds in seconds, from a cached regex pass to a cold model load
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_NULL_SPAN = contextlib.nullcontext()
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+
+
+# ---------- HISTOGRAM ----------
+class Histogram:
+    """Fixed-bucket latency histogram (non-cumulative counts, +Inf last)."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def add(self, counts, total):
+        # Bucket counts and sum of a histogram with the same buckets
+        for i, c in enumerate(counts):
+            self.counts[i] += c
+        self.count += sum(counts)
+        self.sum += total
+
+    def quantile(self, q):
+        """Estimate by linear interpolation inside the bucket holding rank q."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c and seen + c >= rank:
+                lo = self.buckets[i - 1] if i else 0.0
+                hi = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lo + (hi - lo) * (rank - seen) / c
+            seen += c
+        return self.buckets[-1]
+
+
+# ---------- RECORDING ----------
+def observe(stage, seconds):
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = Histogram()
+        hist.observe(seconds)
+
+
+@contextlib.contextmanager
+def _span(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def span(stage):
+    return _span(stage) if ENABLED else _NULL_SPAN
+
+
+def timed(stage):
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def inc(name, value=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# ---------- ACROSS PROCESSES ----------
+def drain():
+    """Everything recorded since the last drain, as plain picklable data;
+    the registry is cleared.
+
+    Worker processes hand this back with their results so the parent can
+    merge() it and export one view (see api_server.py).
+    """
+    with _lock:
+        delta = {"stages": {stage: (h.counts, h.sum) for stage, h in _histograms.items()},
+                 "counters": dict(_counters)}
+        _histograms.clear()
+        _counters.clear()
+    return delta
+
+
+def merge(delta):
+    with _lock:
+        for stage, (counts, total) in delta["stages"].items():
+            hist = _histograms.get(stage)
+            if hist is None:
+                hist = _histograms[stage] = Histogram()
+            hist.add(counts, total)
+        for name, value in delta["counters"].items():
+            _counters[name] = _counters.get(name, 0) + value
+
+
+# ---------- REPORTING ----------
+def snapshot():
+    """Per-stage latency summaries and counter values, as plain dicts."""
+    with _lock:
+        stages = [{
+            "stage": name,
+            "count": h.count,
+            "total_s": round(h.sum, 6),
+            "mean_ms": round(h.sum / h.count * 1000, 3) if h.count else None,
+            "p50_ms": round(h.quantile(0.50) * 1000, 3) if h.count else None,
+            "p95_ms": round(h.quantile(0.95) * 1000, 3) if h.count else None,
+        } for name, h in sorted(_histograms.items())]
+        counters = dict(sorted(_counters.items()))
+    return {"enabled": ENABLED, "stages": stages, "counters": counters}
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    name = f"{PREFIX}_stage_duration_seconds"
+    lines = [f"# HELP {name} Wall time per pipeline stage.", f"# TYPE {name} histogram"]
+
+    with _lock:
+        for stage, h in sorted(_histograms.items()):
+            cumulative = 0
+            for bound, c in zip(h.buckets + (float("inf"),), h.counts):
+                cumulative += c
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {h.sum:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+
+        for counter, value in sorted(_counters.items()):
+            metric = f"{PREFIX}_{counter}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+    return "\n".join(lines) + "\n"
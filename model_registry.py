@@ -0,0 +1,123 @@
+# model_registry.py
+
+import os
+import threading
+import time
+
+
+_loaders = {}
+_models = {}
+_stats = {}
+_locks = {}
+_warming = set()
+_registry_lock = threading.Lock()
+
+
+# ---------- MEMORY PROBE ----------
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        # ru_maxrss is a high-water mark (KiB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def memory_breakdown(pid="self"):
+    """RSS, PSS, USS and shared bytes of a process, from /proc/<pid>/smaps_rollup.
+
+    USS (private pages) is what the process alone costs; PSS also charges it
+    an equal share of every page it shares, so PSS summed over workers is
+    their real combined footprint. None where smaps_rollup is unavailable.
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    except (OSError, ValueError):
+        return None
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+# ---------- REGISTRATION ----------
+def register(name, loader):
+    with _registry_lock:
+        _loaders[name] = loader
+        _locks.setdefault(name, threading.Lock())
+
+
+def is_loaded(name):
+    return name in _models
+
+
+# ---------- LAZY LOADING ----------
+def get(name):
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _loaders:
+        raise KeyError(f"Unknown model: {name}")
+
+    with _locks[name]:
+        if name in _models:
+            return _models[name]
+
+        rss_before = rss_bytes()
+        start = time.perf_counter()
+        model = _loaders[name]()
+        elapsed = time.perf_counter() - start
+
+        _stats[name] = {
+            "name": name,
+            "load_seconds": round(elapsed, 3),
+            # Delta of the process RSS; approximate if other models load concurrently
+            "rss_mb": round(max(rss_bytes() - rss_before, 0) / 2**20, 1),
+        }
+        _models[name] = model
+        return model
+
+
+def warm_up(names=None, background=True):
+    """Load the given models (default: all registered) ahead of first use."""
+    names = list(_loaders) if names is None else list(names)
+    with _registry_lock:
+        pending = [n for n in names if not is_loaded(n) and n not in _warming]
+        _warming.update(pending)
+
+    def _load_all():
+        try:
+            for n in pending:
+                get(n)
+        finally:
+            _warming.difference_update(pending)
+
+    if not background:
+        _load_all()
+        return None
+
+    thread = threading.Thread(target=_load_all, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def unload(name):
+    with _locks.get(name, _registry_lock):
+        _models.pop(name, None)
+        _stats.pop(name, None)
+
+
+# ---------- REPORTING ----------
+def stats():
+    return [dict(_stats[n], loaded=True) if n in _stats else {"name": n, "loaded": False}
+            for n in _loaders]
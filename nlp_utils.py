@@ -1,9 +1,18 @@
 # nlp_utils.py
 
+import os
 import re
-import spacy
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
+
+import encoders
+import metrics
+from encode_service import EncodeService
+import model_registry
+import shared_models
+from embedding_cache import EmbeddingCache, DEFAULT_CACHE_DIR, model_dim, normalize_skill_key
+from skill_matcher import SkillMatcher
+from skill_index import SkillIndex
 
 
 # Strict skill dictionary
@@ -28,11 +37,116 @@ SKILL_DB = [
     "problem-solving","creativity","adaptability","communication","teamwork"
 ]
 
-# Load sentence-BERT model
-sbert_model = SentenceTransformer("all-MiniLM-L6-v2")
+# Compiled once; scans a JD fragment in one pass whatever the dictionary size
+SKILL_MATCHER = SkillMatcher(SKILL_DB)
+
+# Common alternative spellings, mapped to their SKILL_DB form
+SKILL_ALIASES = {
+    "py": "python", "python3": "python", "core java": "java", "cpp": "c++",
+    "html5": "html", "css3": "css", "js": "javascript", "ecmascript": "javascript",
+    "mongo": "mongodb", "mongo db": "mongodb", "my sql": "mysql",
+    "postgres": "postgresql", "postgre sql": "postgresql", "psql": "postgresql",
+    "ml": "machine learning", "dl": "deep learning",
+    "natural language processing": "nlp", "tf": "tensorflow", "torch": "pytorch",
+    "scikit-learn": "sklearn", "scikit learn": "sklearn", "neural nets": "neural networks",
+    "data analytics": "data analysis", "git hub": "github",
+    "rest api integration": "api integration", "api integrations": "api integration",
+    "amazon web services": "aws", "microsoft azure": "azure",
+    "google cloud": "gcp", "google cloud platform": "gcp",
+    "problem solving": "problem-solving", "team work": "teamwork", "team player": "teamwork",
+    "communication skills": "communication",
+}
+
+# ---------- MODELS (loaded on first use) ----------
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Model + backend (torch / int8 / onnx / onnx-int8, see encoders.py)
+ENCODER_ID = encoders.encoder_id(MODEL_NAME)
+
+# Optional taxonomy index built with `python skill_index.py taxonomy.txt DIR`;
+# when set, skills extracted from resumes are mapped onto its labels
+TAXONOMY_INDEX_DIR = os.environ.get("SKILLGAP_TAXONOMY_INDEX")
+
+
+def _taxonomy_tag(directory):
+    # Content hash of the index labels, so a rebuilt taxonomy gets a new version
+    import hashlib
+    try:
+        with open(os.path.join(directory, "labels.json"), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:12]
+    except OSError:
+        return "unreadable"
+
+
+# Part of every cached analysis key; bump when extraction or matching
+# logic changes so stale cached results are not served
+PIPELINE_VERSION = 2
+MODEL_VERSION = f"{ENCODER_ID}/v{PIPELINE_VERSION}" + (
+    f"/taxonomy-{_taxonomy_tag(TAXONOMY_INDEX_DIR)}" if TAXONOMY_INDEX_DIR else "")
+
+
+def _load_sbert():
+    # Maps exported weights read-only when SKILLGAP_SHARED_MODEL_DIR is set
+    return shared_models.load_encoder(MODEL_NAME)
+
+
+def _load_skill_table():
+    # Precomputed SKILL_DB embeddings shared between processes (empty if not exported)
+    return shared_models.load_skill_table(ENCODER_ID)
+
+
+def _load_taxonomy_index():
+    # None when no index is configured
+    return SkillIndex.load(TAXONOMY_INDEX_DIR) if TAXONOMY_INDEX_DIR else None
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load("en_core_web_sm")
+
+
+model_registry.register("sbert", _load_sbert)
+model_registry.register("skill_table", _load_skill_table)
+model_registry.register("taxonomy_index", _load_taxonomy_index)
+model_registry.register("spacy", _load_spacy)
+
+
+def get_sbert_model():
+    return model_registry.get("sbert")
+
+
+def get_nlp():
+    return model_registry.get("spacy")
+
+
+def get_taxonomy_index():
+    return model_registry.get("taxonomy_index")
+
+
+# Persistent skill embedding cache (set SKILLGAP_EMBED_CACHE=0 to disable)
+_embedding_cache = None
+_cache_lock = threading.Lock()
 
-# Load spaCy
-nlp = spacy.load("en_core_web_sm")
+
+def get_embedding_cache():
+    global _embedding_cache
+    if os.environ.get("SKILLGAP_EMBED_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _embedding_cache is None:
+            # Only loads the model the first time this host sees ENCODER_ID;
+            # after that the model waits for the first cache miss
+            dim = model_dim(ENCODER_ID,
+                            lambda: get_sbert_model().get_sentence_embedding_dimension(),
+                            DEFAULT_CACHE_DIR)
+            _embedding_cache = EmbeddingCache(DEFAULT_CACHE_DIR, dim)
+    return _embedding_cache
+
+
+def canonical_skill(skill):
+    """Lower-cased, whitespace-normalized skill with aliases resolved."""
+    key = normalize_skill_key(skill)
+    return SKILL_ALIASES.get(key, key)
 
 
 # ---------- CLEAN TEXT ----------
@@ -44,40 +158,87 @@ def clean_text(text):
 
 
 # ---------- STRICT RESUME SKILL EXTRACTION ----------
-def extract_resume_skills_strict(text):
-    text = text.lower()
+# Each section runs from its first header to the first of its stop words
+SECTION_STOPS = {
+    "core skills": ("intermediate skills", "familiar with", "soft skills",
+                    "education", "languages", "projects"),
+    "intermediate skills": ("core skills", "familiar with", "soft skills",
+                            "education", "languages", "projects"),
+    "familiar with": ("core skills", "intermediate skills", "soft skills",
+                      "education", "languages", "projects"),
+    "soft skills": ("core skills", "intermediate skills", "familiar with",
+                    "education", "languages", "projects"),
+    "skills": ("core skills", "intermediate skills", "familiar with", "soft skills",
+               "education", "languages", "projects"),
+}
 
-    sections = {
-        "core skills": [],
-        "intermediate skills": [],
-        "familiar with": [],
-        "soft skills": [],
-        "skills": []
-    }
+SECTION_KEYWORDS = ("core skills", "intermediate skills", "familiar with", "soft skills",
+                    "skills", "education", "languages", "projects")
 
-    patterns = {
-        "core skills": r"core skills(.*?)(intermediate skills|familiar with|soft skills|education|languages|projects|$)",
-        "intermediate skills": r"intermediate skills(.*?)(core skills|familiar with|soft skills|education|languages|projects|$)",
-        "familiar with": r"familiar with(.*?)(core skills|intermediate skills|soft skills|education|languages|projects|$)",
-        "soft skills": r"soft skills(.*?)(core skills|intermediate skills|familiar with|education|languages|projects|$)",
-        "skills": r"skills(.*?)(core skills|intermediate skills|familiar with|soft skills|education|languages|projects|$)"
-    }
+# Consumes only the first letter of each keyword so overlapping keywords are
+# all reported (e.g. both "soft skills" and the "skills" inside it); the group
+# that matched tells which keyword it was
+SECTION_KEYWORD_RE = re.compile(
+    "|".join(f"{re.escape(k[0])}(?=({re.escape(k[1:])}))" for k in SECTION_KEYWORDS)
+)
+ITEM_SPLIT_RE = re.compile(r"[,\n•\-]+")
+
+
+def iter_section_markers(text):
+    """Yield (position, keyword) section markers of lower-cased text, in order."""
+    for m in SECTION_KEYWORD_RE.finditer(text):
+        yield m.start(), SECTION_KEYWORDS[m.lastindex - 1]
+
+
+def find_section_spans(text):
+    """Map each section found in lower-cased text to its (start, end) span.
+
+    One left-to-right pass over the markers; it stops as soon as every
+    section is closed, so text after the last section is never scanned.
+    """
+    spans = {}
+    open_sections = {}
+
+    for pos, keyword in iter_section_markers(text):
+        for sec in [s for s, start in open_sections.items()
+                    if pos >= start and keyword in SECTION_STOPS[s]]:
+            spans[sec] = (open_sections.pop(sec), pos)
+
+        if keyword in SECTION_STOPS and keyword not in spans and keyword not in open_sections:
+            open_sections[keyword] = pos + len(keyword)
+
+        if len(spans) == len(SECTION_STOPS):
+            break
+
+    for sec, start in open_sections.items():
+        spans[sec] = (start, len(text))
+
+    return spans
+
+
+@metrics.timed("parse_resume")
+def extract_resume_skills_strict(text):
+    text = text.lower()
+    spans = find_section_spans(text)
 
     all_skills = []
 
-    for sec, patt in patterns.items():
-        match = re.search(patt, text, flags=re.S)
-        if match:
-            block = match.group(1)
-            items = re.split(r"[,\n•\-]+", block)
-            cleaned = [i.strip().lower() for i in items if len(i.strip()) > 1]
-            all_skills.extend(cleaned)
+    for sec in SECTION_STOPS:
+        if sec not in spans:
+            continue
+
+        start, end = spans[sec]
+        items = ITEM_SPLIT_RE.split(text[start:end])
+        cleaned = [i.strip().lower() for i in items if len(i.strip()) > 1]
+        all_skills.extend(cleaned)
 
     return list(dict.fromkeys(all_skills))
 
 
 # ---------- CLEAN JD SKILL EXTRACTION ----------
-def get_jd_skills(text):
+@metrics.timed("parse_jd")
+def get_jd_skills(text, matcher=None):
+    matcher = matcher or SKILL_MATCHER
     text = text.lower()
     lines = re.split(r"\n+", text)
 
@@ -90,12 +251,10 @@ def get_jd_skills(text):
         parts = re.split(r"[,&/]| and ", b)
         raw_items.extend([p.strip() for p in parts])
 
-    # Step 3: Keep ONLY skills that match SKILL_DB
+    # Step 3: Keep ONLY skills that match the dictionary (whole words)
     clean = []
     for item in raw_items:
-        for skill in SKILL_DB:
-            if skill in item:
-                clean.append(skill)
+        clean.extend(matcher.find(item))
 
     # Step 4: Remove duplicates
     clean = list(dict.fromkeys(clean))
@@ -119,32 +278,333 @@ def filter_real_skills(skill_list):
     return list(dict.fromkeys(real))
 
 
+# ---------- SKILL EMBEDDINGS ----------
+# Concurrent callers share forward passes through one EncodeService
+# (SKILLGAP_ENCODE_BATCH=0 encodes every request directly)
+ENCODE_MAX_BATCH = int(os.environ.get("SKILLGAP_ENCODE_BATCH", "128"))
+ENCODE_MAX_WAIT = float(os.environ.get("SKILLGAP_ENCODE_MAX_WAIT_MS", "5")) / 1000
+
+_encode_service = None
+_encode_service_pid = None
+_service_lock = threading.Lock()
+
+
+def get_encode_service():
+    global _encode_service, _encode_service_pid
+    if ENCODE_MAX_BATCH <= 0:
+        return None
+    with _service_lock:
+        # A forked worker inherits the object but not its thread
+        if _encode_service is None or _encode_service_pid != os.getpid():
+            _encode_service = EncodeService(_encode_batch, ENCODE_MAX_BATCH, ENCODE_MAX_WAIT)
+            _encode_service_pid = os.getpid()
+    return _encode_service
+
+
+def _encode_batch(texts):
+    model = get_sbert_model()
+    metrics.inc("encoded_strings", len(texts))
+    with metrics.span("encode"):
+        return model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+
+def _encode(texts):
+    service = get_encode_service()
+    if service is None:
+        return _encode_batch(texts)
+    return service.encode(texts)
+
+
+def _lookup(skills):
+    cache = get_embedding_cache()
+    if cache is None:
+        return _encode(skills)
+    return cache.get_or_compute(ENCODER_ID, skills, _encode)
+
+
+def encode_skills(skills):
+    # Unit-length embeddings, so cosine similarity is a plain dot product.
+    # Aliases share their canonical form's embedding.
+    skills = [canonical_skill(s) for s in skills]
+    table = model_registry.get("skill_table")
+    if not table.labels:
+        return _lookup(skills)
+
+    # Skills in the shared table are read from it; the rest go through the cache
+    rows = table.rows(skills)
+    known = rows >= 0
+    metrics.inc("skill_table_hits", int(known.sum()))
+    if known.all():
+        return table.vectors[rows]
+    out = np.empty((len(skills), table.vectors.shape[1]), dtype=table.vectors.dtype)
+    out[known] = table.vectors[rows[known]]
+    out[~known] = _lookup([s for s, k in zip(skills, known) if not k])
+    return out
+
+
 # ---------- SBERT SEMANTIC MATCHING ----------
-def compare_skill_sets(resume_skills, jd_skills, threshold=0.60):
+def skill_similarity(resume_skills, jd_skills):
+    """(n_jd, n_resume) cosine similarity matrix."""
+    return encode_skills(jd_skills) @ encode_skills(resume_skills).T
+
+
+def resolve_matches(sim, threshold=0.60, one_to_one=False):
+    """Best resume column and its score for every JD row, plus the hit mask.
+
+    By default each JD skill takes its most similar resume skill, so one
+    resume skill can satisfy several JD skills. With one_to_one=True every
+    resume skill is used at most once: the assignment maximizes the number
+    of matches at or above the threshold, then their total similarity.
+    Rows left without a match get column -1.
+    """
+    if not one_to_one:
+        cols = sim.argmax(axis=1)
+        scores = sim[np.arange(len(sim)), cols]
+        return cols, scores, scores >= threshold
+
+    from scipy.optimize import linear_sum_assignment
+
+    hit = sim >= threshold
+    # One match is worth more than any similarity total of fewer matches
+    weight = np.where(hit, sim + (len(sim) + 1), 0.0)
+    rows, assigned = linear_sum_assignment(weight, maximize=True)
+
+    cols = np.full(len(sim), -1, dtype=np.int64)
+    scores = np.full(len(sim), -np.inf, dtype=sim.dtype)
+    keep = hit[rows, assigned]
+    cols[rows[keep]] = assigned[keep]
+    scores[rows[keep]] = sim[rows[keep], assigned[keep]]
+    return cols, scores, cols >= 0
+
+
+def lexical_matches(resume_skills, jd_skills, one_to_one=False):
+    """{jd index: resume index} for JD skills that equal a resume skill
+    once both are normalized and aliases resolved (a hash lookup each)."""
+    positions = {}
+    for i, s in enumerate(resume_skills):
+        positions.setdefault(canonical_skill(s), []).append(i)
+
+    found = {}
+    for j, s in enumerate(jd_skills):
+        candidates = positions.get(canonical_skill(s))
+        if candidates:
+            found[j] = candidates.pop(0) if one_to_one else candidates[0]
+    return found
+
+
+def compare_skill_sets(resume_skills, jd_skills, threshold=0.60, one_to_one=False):
     if not resume_skills or not jd_skills:
-        return {"matches": [], "missing": jd_skills, "match_pct": 0}
+        return {"matches": [], "missing": jd_skills, "match_pct": 0, "fast_path_pct": 0}
 
-    emb_resume = sbert_model.encode(resume_skills, convert_to_tensor=True)
-    emb_jd = sbert_model.encode(jd_skills, convert_to_tensor=True)
+    # Exact and alias matches are settled without the encoder (score 1.0);
+    # only the remaining JD skills are compared semantically
+    exact = lexical_matches(resume_skills, jd_skills, one_to_one)
+    rest = [j for j in range(len(jd_skills)) if j not in exact]
 
-    sim = util.cos_sim(emb_jd, emb_resume).cpu().numpy()
+    cols = np.full(len(jd_skills), -1, dtype=np.int64)
+    scores = np.full(len(jd_skills), -np.inf, dtype=np.float32)
+    cols[list(exact)] = list(exact.values())
+    scores[list(exact)] = 1.0
 
-    matches = []
-    missing = []
+    used = set(exact.values()) if one_to_one else ()
+    free = [i for i in range(len(resume_skills)) if i not in used]
+    if rest and free:
+        sim = skill_similarity([resume_skills[i] for i in free], [jd_skills[j] for j in rest])
+        with metrics.span("similarity"):
+            c, s, h = resolve_matches(sim, threshold, one_to_one)
+        cols[rest] = np.where(h, np.asarray(free)[np.maximum(c, 0)], -1)
+        scores[rest] = s
 
-    for j_idx, j_skill in enumerate(jd_skills):
-        best_idx = np.argmax(sim[j_idx])
-        best_score = sim[j_idx][best_idx]
+    metrics.inc("fast_path_skills", len(exact))
+    metrics.inc("encoder_path_skills", len(rest))
 
-        if best_score >= threshold:
-            matches.append((resume_skills[best_idx], j_skill, float(best_score)))
-        else:
-            missing.append(j_skill)
+    hit = cols >= 0
+
+    matches = [(resume_skills[c], j_skill, float(s))
+               for j_skill, c, s, h in zip(jd_skills, cols.tolist(), scores.tolist(), hit) if h]
+    missing = [j_skill for j_skill, h in zip(jd_skills, hit) if not h]
 
     match_pct = int((len(matches) / len(jd_skills)) * 100)
 
     return {
         "matches": matches,
         "missing": missing,
-        "match_pct": match_pct
+        "match_pct": match_pct,
+        "fast_path_pct": int(len(exact) / len(jd_skills) * 100),
+    }
+
+
+def _count_at_thresholds(sim, thresholds):
+    # A JD skill matches at threshold t iff its best score is >= t
+    best = np.sort(sim.max(axis=1))
+    return len(best) - np.searchsorted(best, thresholds.astype(best.dtype), side="left")
+
+
+def match_rates(resume_skills, jd_skills, thresholds, one_to_one=False):
+    """match_pct at each of `thresholds`, all from one similarity matrix.
+
+    Used to calibrate the threshold: [(threshold, match_pct), ...].
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    if not resume_skills or not jd_skills:
+        return [(float(t), 0) for t in thresholds]
+
+    sim = skill_similarity(resume_skills, jd_skills)
+
+    with metrics.span("similarity"):
+        if one_to_one:
+            counts = [int(resolve_matches(sim, t, True)[2].sum()) for t in thresholds]
+        else:
+            counts = _count_at_thresholds(sim, thresholds)
+
+    return [(float(t), int(c / len(jd_skills) * 100)) for t, c in zip(thresholds, counts)]
+
+
+# ---------- TAXONOMY NORMALIZATION (ANN index) ----------
+def load_taxonomy(path):
+    # One canonical skill per line; blank lines and '#' comments are skipped
+    with open(path, encoding="utf-8") as f:
+        skills = [l.strip().lower() for l in f if l.strip() and not l.startswith("#")]
+    return list(dict.fromkeys(skills))
+
+
+def build_taxonomy_index(taxonomy, n_lists=None):
+    return SkillIndex.build(encode_skills(taxonomy), labels=taxonomy, n_lists=n_lists)
+
+
+def normalize_skills(skills, index, min_score=0.75, nprobe=8):
+    """Map free-text skill phrases onto canonical taxonomy labels.
+
+    Phrases whose nearest taxonomy entry scores below min_score are kept as-is.
+    """
+    if not skills:
+        return []
+
+    scores, ids = index.search(encode_skills(skills), k=1, nprobe=nprobe)
+
+    out = []
+    for skill, score, idx in zip(skills, scores[:, 0], ids[:, 0]):
+        out.append(index.labels[idx] if idx >= 0 and score >= min_score else skill)
+    return list(dict.fromkeys(out))
+
+
+def extract_resume_skills(text, skill_index=None):
+    """Skills listed in a resume, mapped onto the taxonomy labels when an
+    index is given (entry points pass get_taxonomy_index())."""
+    skills = filter_real_skills(extract_resume_skills_strict(text))
+    if skill_index is not None:
+        skills = normalize_skills(skills, skill_index)
+    return skills
+
+
+# ---------- FULL PIPELINE (resume text + JD text) ----------
+@metrics.timed("analyze")
+def analyze_documents(resume_text, jd_text, threshold=0.60, skill_index=None):
+    resume_skills = extract_resume_skills(resume_text, skill_index)
+    jd_skills = filter_real_skills(get_jd_skills(jd_text))
+
+    result = compare_skill_sets(resume_skills, jd_skills, threshold)
+
+    return {
+        "resume_skills": resume_skills,
+        "jd_skills": jd_skills,
+        "matches": result["matches"],
+        "matched": [m[1] for m in result["matches"]],
+        "missing": result["missing"],
+        "match_pct": result["match_pct"],
+        "fast_path_pct": result["fast_path_pct"],
     }
+
+
+# ---------- BATCH RANKING (one JD vs many resumes) ----------
+def _segment_best(sim, offsets):
+    """Best score and best column per (row, segment) of a column-segmented matrix.
+
+    `offsets` are the start columns of consecutive, non-empty segments.
+    Returns (best_scores, best_cols), both shaped (n_rows, n_segments);
+    best_cols are global column indices into `sim`.
+    """
+    best = np.maximum.reduceat(sim, offsets, axis=1)
+    lengths = np.diff(np.append(offsets, sim.shape[1]))
+
+    # First column in each segment that reaches the segment maximum
+    cols = np.arange(sim.shape[1])
+    hit = sim == np.repeat(best, lengths, axis=1)
+    best_cols = np.minimum.reduceat(np.where(hit, cols, sim.shape[1]), offsets, axis=1)
+
+    return best, best_cols
+
+
+def _apply_lexical_matches(best, best_pos, skill_lists, jd_skills):
+    """Settle exact and alias matches as compare_skill_sets does, in place.
+
+    `best` / `best_pos` are (n_jd, n_lists) best scores and positions within
+    each list; lexically matched JD skills get score 1.0 at the resume skill
+    lexical_matches picks. Returns the number settled per list.
+    """
+    n_exact = np.zeros(len(skill_lists), dtype=np.int64)
+    for c, skills in enumerate(skill_lists):
+        exact = lexical_matches(skills, jd_skills)
+        if exact:
+            best[list(exact), c] = 1.0
+            best_pos[list(exact), c] = list(exact.values())
+            n_exact[c] = len(exact)
+    metrics.inc("fast_path_skills", int(n_exact.sum()))
+    metrics.inc("encoder_path_skills", len(jd_skills) * len(skill_lists) - int(n_exact.sum()))
+    return n_exact
+
+
+def _column_result(skills, jd_skills, best, best_pos, threshold, n_exact):
+    """compare_skill_sets result for one list from its column of best scores."""
+    hit = best >= threshold
+    matches = [(skills[best_pos[j]], j_skill, float(best[j]))
+               for j, j_skill in enumerate(jd_skills) if hit[j]]
+    return {
+        "matches": matches,
+        "missing": [j_skill for j, j_skill in enumerate(jd_skills) if not hit[j]],
+        "match_pct": int(len(matches) / len(jd_skills) * 100),
+        "fast_path_pct": int(n_exact / len(jd_skills) * 100),
+    }
+
+
+def rank_resumes(resume_skill_lists, jd_skills, threshold=0.60, top_k=None):
+    n = len(resume_skill_lists)
+    results = [{"matches": [], "missing": list(jd_skills), "match_pct": 0, "fast_path_pct": 0}
+               for _ in range(n)]
+    mean_best = np.zeros(n)
+
+    keep = [i for i, skills in enumerate(resume_skill_lists) if skills]
+    if jd_skills and keep:
+        # Encode every distinct resume skill once, then lay all candidates
+        # side by side as column segments of one matrix
+        lists = [resume_skill_lists[i] for i in keep]
+        flat = [s for skills in lists for s in skills]
+        vocab = list(dict.fromkeys(flat))
+        position = {s: k for k, s in enumerate(vocab)}
+
+        emb_vocab = encode_skills(vocab)
+        emb_jd = encode_skills(jd_skills)
+
+        lengths = np.array([len(skills) for skills in lists])
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        with metrics.span("similarity"):
+            sim = (emb_jd @ emb_vocab.T)[:, [position[s] for s in flat]]
+            best, best_cols = _segment_best(sim, offsets)
+        best_pos = best_cols - offsets
+        n_exact = _apply_lexical_matches(best, best_pos, lists, jd_skills)
+
+        for c, i in enumerate(keep):
+            results[i] = _column_result(lists[c], jd_skills, best[:, c], best_pos[:, c],
+                                        threshold, n_exact[c])
+        mean_best[keep] = best.mean(axis=0)
+
+    # Rank by match %, then by average best similarity, then input order
+    scores = np.array([r["match_pct"] for r in results])
+    order = np.lexsort((np.arange(n), -mean_best, -scores))
+    if top_k is not None:
+        order = order[:top_k]
+
+    ranking = [(int(i), results[i]["match_pct"]) for i in order]
+
+    return {"results": results, "ranking": ranking}
@@ -0,0 +1,126 @@
+# plan_rules.py
+#
+# Personalized improvement plans from an editable rule catalog (JSON):
+#
+#   {"rules": [{"title": "Cloud Fundamentals",
+#               "keywords": ["aws", "azure", "cloud", "gcp"],
+#               "steps": ["Learn basics of AWS EC2 and S3.", ...]}, ...],
+#    "fallback": ["- Practice small projects weekly.", ...]}
+#
+# A rule fires when any of its keywords occurs anywhere in a missing skill
+# (case-insensitive substring, so "js" fires on "node.js"). Fired rules are
+# listed in catalog order; the fallback lines are used when none fires.
+#
+# All keywords of all rules are compiled once into a single SkillMatcher,
+# so a plan costs one pass over the missing skills however large the
+# catalog. The shipped catalog is plan_rules.json; set SKILLGAP_PLAN_RULES
+# to use another one.
+#
+#   python plan_rules.py "node.js" "aws lambda"          # print the plan
+#   python plan_rules.py --rules my_rules.json --check   # validate a catalog
+
+import argparse
+import json
+import os
+import sys
+
+from skill_matcher import SkillMatcher
+
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plan_rules.json")
+RULES_PATH = os.environ.get("SKILLGAP_PLAN_RULES", DEFAULT_RULES_PATH)
+
+# Joins the missing skills into one text to scan; keywords may not contain it,
+# so no hit can span two skills
+SEPARATOR = "\n"
+
+
+class PlanRules:
+    """A rule catalog compiled into one multi-keyword matcher."""
+
+    def __init__(self, rules, fallback=()):
+        self.rules = []
+        keyword_rules = {}
+        for i, rule in enumerate(rules):
+            title = rule.get("title")
+            keywords = rule.get("keywords") or []
+            if not title or not keywords:
+                raise ValueError(f"plan rule {i} needs a title and at least one keyword")
+            for k in keywords:
+                if not isinstance(k, str) or not k.strip() or SEPARATOR in k:
+                    raise ValueError(f"plan rule {title!r}: invalid keyword {k!r}")
+                keyword_rules.setdefault(k.lower(), []).append(i)
+            self.rules.append({"title": title, "keywords": list(keywords),
+                               "steps": list(rule.get("steps", []))})
+        self.fallback = list(fallback)
+
+        self._matcher = SkillMatcher(keyword_rules, whole_words=False)
+        # Matcher phrase index -> rules that keyword triggers
+        self._rules_of = [tuple(keyword_rules[k]) for k in self._matcher.phrases]
+
+    @classmethod
+    def load(cls, path=RULES_PATH):
+        with open(path, encoding="utf-8") as f:
+            catalog = json.load(f)
+        return cls(catalog.get("rules", []), catalog.get("fallback", []))
+
+    def __len__(self):
+        return len(self.rules)
+
+    @property
+    def n_keywords(self):
+        return len(self._matcher)
+
+    def triggered(self, missing_skills):
+        """Indices of the rules the missing skills fire, in catalog order."""
+        text = SEPARATOR.join(str(s).lower() for s in missing_skills)
+        fired = set()
+        for _, _, idx in self._matcher.finditer(text):
+            fired.update(self._rules_of[idx])
+            if len(fired) == len(self.rules):
+                break
+        return sorted(fired)
+
+    def plan(self, missing_skills):
+        lines = []
+        for i in self.triggered(missing_skills):
+            rule = self.rules[i]
+            lines.append(f"- {rule['title']}:")
+            lines += [f"  * {step}" for step in rule["steps"]]
+        return lines or list(self.fallback)
+
+
+_catalogs = {}
+
+
+def get_rules(path=None):
+    """The catalog at `path` (default RULES_PATH), compiled on first use."""
+    path = path or RULES_PATH
+    if path not in _catalogs:
+        _catalogs[path] = PlanRules.load(path)
+    return _catalogs[path]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Personalized plan from the rule catalog")
+    parser.add_argument("skills", nargs="*", help="missing skills")
+    parser.add_argument("--rules", default=RULES_PATH, help="rule catalog (JSON)")
+    parser.add_argument("--check", action="store_true",
+                        help="only validate the catalog and print its size")
+    args = parser.parse_args(argv)
+
+    try:
+        rules = PlanRules.load(args.rules)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    if args.check:
+        print(f"{args.rules}: {len(rules)} rules, {rules.n_keywords} distinct keywords")
+        return 0
+    print("\n".join(rules.plan(args.skills)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
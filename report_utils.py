@@ -0,0 +1,326 @@
+# report_utils.py
+
+import datetime
+import math
+import os
+
+import metrics
+import plan_rules
+
+
+# ----------------------------------------------------
+# UNICODE-SAFE TEXT CLEANER
+# ----------------------------------------------------
+
+# Characters fpdf's core fonts cannot encode, mapped once to ASCII stand-ins;
+# anything else outside Latin-1 becomes "?"
+PDF_TRANSLATION = str.maketrans({
+    "•": "-",
+    "✔": "-",
+    "✓": "-",
+    "–": "-",
+    "—": "-",
+    "“": '"',
+    "”": '"',
+    "’": "'",
+    "′": "'",
+    "‣": "-",
+    "·": "-",
+    "►": "-",
+    "→": "->",
+    "\u200b": "",
+})
+
+
+def clean_text_for_pdf(text):
+    if text is None:
+        return ""
+    out = str(text)
+    if out.isascii():
+        return out
+    out = out.translate(PDF_TRANSLATION)
+    return out.encode("latin-1", "replace").decode("latin-1")
+
+
+# ----------------------------------------------------
+# PERSONALIZED PLAN GENERATOR
+# ----------------------------------------------------
+
+def generate_personalized_plan(missing_skills):
+    # Rules come from the catalog (see plan_rules.py), compiled once per process
+    plan = plan_rules.get_rules().plan(missing_skills)
+    return [clean_text_for_pdf(line) for line in plan]
+
+
+# ----------------------------------------------------
+# VECTOR PIE CHART (drawn with FPDF primitives)
+# ----------------------------------------------------
+
+CHART_LABELS = ("Matched", "Missing")
+CHART_COLORS = ((46, 204, 113), (231, 76, 60))   # #2ECC71, #E74C3C
+
+
+def draw_pie_chart(pdf, cx, cy, r, sizes, labels=CHART_LABELS, colors=CHART_COLORS,
+                   title="Skill Match Breakdown"):
+    total = sum(sizes)
+
+    pdf.set_font("Arial", "B", 10)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_xy(cx - 40, cy - r - 9)
+    pdf.cell(80, 5, txt=title, align="C")
+
+    pdf.set_draw_color(255, 255, 255)
+    pdf.set_line_width(0.4)
+
+    if total == 0:
+        pdf.set_fill_color(200, 200, 200)
+        pdf.ellipse(cx - r, cy - r, 2 * r, 2 * r, "F")
+    else:
+        # Slices run clockwise from 12 o'clock; arcs are ~2 degree polygons
+        start = 0.0
+        for size, color in zip(sizes, colors):
+            if not size:
+                continue
+            sweep = 2 * math.pi * size / total
+            pdf.set_fill_color(*color)
+            if size == total:
+                pdf.ellipse(cx - r, cy - r, 2 * r, 2 * r, "F")
+            else:
+                steps = max(2, int(math.degrees(sweep) / 2))
+                points = [(cx, cy)] + [
+                    (cx + r * math.sin(start + sweep * k / steps),
+                     cy - r * math.cos(start + sweep * k / steps))
+                    for k in range(steps + 1)
+                ]
+                pdf.polygon(points, style="DF")
+            start += sweep
+
+        # Percentage labels at the middle of each slice
+        pdf.set_font("Arial", "B", 8)
+        pdf.set_text_color(255, 255, 255)
+        start = 0.0
+        for size in sizes:
+            if size:
+                mid = start + math.pi * size / total
+                x = cx + 0.6 * r * math.sin(mid) if size != total else cx
+                y = cy - 0.6 * r * math.cos(mid) if size != total else cy
+                pdf.set_xy(x - 10, y - 2.5)
+                pdf.cell(20, 5, txt=f"{100 * size / total:.1f}%", align="C")
+            start += 2 * math.pi * size / total
+
+    # Legend to the right of the pie
+    pdf.set_font("Arial", size=9)
+    pdf.set_text_color(0, 0, 0)
+    for i, (label, size, color) in enumerate(zip(labels, sizes, colors)):
+        y = cy - 5 + 7 * i
+        pdf.set_fill_color(*color)
+        pdf.rect(cx + r + 8, y, 4, 4, "F")
+        pdf.set_xy(cx + r + 14, y - 0.5)
+        pdf.cell(30, 5, txt=f"{label} ({size})")
+
+    pdf.set_draw_color(0, 0, 0)
+    pdf.set_line_width(0.2)
+
+
+# ----------------------------------------------------
+# PDF REPORT (built entirely in memory)
+# ----------------------------------------------------
+
+@metrics.timed("report_build")
+def build_report_pdf(candidate_name, matched, missing, match_pct, timestamp=None):
+    # fpdf2 pulls in Pillow and fontTools; only pay for them when a report is built
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    render_report(pdf, candidate_name, matched, missing, match_pct, timestamp)
+    return bytes(pdf.output())
+
+
+def render_report(pdf, candidate_name, matched, missing, match_pct, timestamp=None):
+    """Add one candidate's report, starting on a new page, to an FPDF document."""
+    pdf.add_page()
+
+    # ---------------- HEADER ----------------
+    pdf.set_font("Arial", "B", 18)
+    pdf.set_text_color(30, 60, 120)
+    pdf.cell(200, 12, txt="AI Skill Gap Analysis Report", ln=1, align="C")
+
+    # Candidate name
+    pdf.set_font("Arial", "B", 14)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(200, 10, txt=clean_text_for_pdf(f"Candidate: {candidate_name}"), ln=1, align="C")
+
+    # Timestamp
+    pdf.set_font("Arial", size=11)
+    timestamp = (timestamp or datetime.datetime.now()).strftime("%Y-%m-%d  %H:%M")
+    pdf.set_text_color(120, 120, 120)
+    pdf.cell(200, 6, txt=clean_text_for_pdf(f"Generated: {timestamp}"), ln=1, align="C")
+    pdf.ln(5)
+
+    # Summary Box
+    pdf.set_fill_color(230, 240, 255)
+    pdf.rect(10, pdf.get_y(), 190, 14, "F")
+    pdf.set_font("Arial", "B", 14)
+    pdf.set_text_color(20, 50, 120)
+    pdf.ln(1)
+    pdf.cell(200, 10, txt=clean_text_for_pdf(f"Skill Match Score: {match_pct}%"), ln=1, align="C")
+    pdf.ln(2)
+
+    # Pie chart (vector, no raster image)
+    chart_top = pdf.get_y()
+    draw_pie_chart(pdf, 95, chart_top + 36, 25, (len(matched), len(missing)))
+    pdf.set_xy(10, chart_top + 70)
+
+    # Matched Skills
+    pdf.set_font("Arial", "B", 14)
+    pdf.set_text_color(0, 80, 0)
+    pdf.cell(200, 10, txt="Matched Skills", ln=1)
+
+    pdf.set_font("Arial", size=12)
+    pdf.set_text_color(0, 0, 0)
+    for m in matched:
+        pdf.cell(200, 8, txt=clean_text_for_pdf(f"- {m}"), ln=1)
+    pdf.ln(3)
+
+    # Missing Skills
+    pdf.set_font("Arial", "B", 14)
+    pdf.set_text_color(150, 0, 0)
+    pdf.cell(200, 10, txt="Skills You Need To Learn", ln=1)
+
+    pdf.set_font("Arial", size=12)
+    pdf.set_text_color(0, 0, 0)
+    for m in missing:
+        pdf.cell(200, 8, txt=clean_text_for_pdf(f"- {m}"), ln=1)
+    pdf.ln(3)
+
+    # Personalized Plan
+    plan_lines = generate_personalized_plan(missing)
+
+    pdf.set_font("Arial", "B", 14)
+    pdf.set_text_color(20, 20, 120)
+    pdf.cell(200, 10, txt="Personalized Improvement Plan", ln=1)
+
+    pdf.set_font("Arial", size=12)
+    pdf.set_text_color(0, 0, 0)
+    for line in plan_lines:
+        pdf.cell(200, 7, txt=line, ln=1)
+
+    # Footer (inside the bottom margin, so it must not trigger a page break)
+    pdf.set_auto_page_break(False)
+    pdf.set_y(275)
+    pdf.set_font("Arial", size=9)
+    pdf.set_text_color(120, 120, 120)
+    pdf.cell(0, 10, clean_text_for_pdf("Generated by AI SkillGap Analyzer • Powered by SBERT"), 0, 0, "C")
+    pdf.set_auto_page_break(True, margin=20)
+
+
+# ----------------------------------------------------
+# BATCHED REPORTS (many candidates, worker processes)
+# ----------------------------------------------------
+#
+# candidates: [{"candidate_name", "matched", "missing", "match_pct"}, ...]
+
+REPORTS_PER_WORKER = 8
+
+
+def _build_report(candidate):
+    return build_report_pdf(candidate["candidate_name"], candidate["matched"],
+                            candidate["missing"], candidate["match_pct"],
+                            candidate.get("timestamp"))
+
+
+def build_reports(candidates, workers=None, timestamp=None):
+    """One PDF (bytes) per candidate, in input order, rendered in parallel.
+
+    By default one worker process per REPORTS_PER_WORKER reports, up to
+    the CPU count; workers=1 renders in this process.
+    """
+    timestamp = timestamp or datetime.datetime.now()
+    items = [dict(c, timestamp=timestamp) for c in candidates]
+    if workers is None:
+        workers = min(os.cpu_count() or 1, max(1, len(items) // REPORTS_PER_WORKER))
+
+    metrics.inc("reports_built", len(items))
+    with metrics.span("report_batch"):
+        if workers <= 1 or len(items) <= 1:
+            return [_build_report(c) for c in items]
+
+        import multiprocessing as mp
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, math.ceil(len(items) / (workers * 4)))
+        # spawn, not fork: the Streamlit server process is multi-threaded
+        with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as pool:
+            return list(pool.map(_build_report, items, chunksize=chunksize))
+
+
+def render_ranking_table(pdf, candidates, title="Candidate Ranking", timestamp=None):
+    """Summary page(s): every candidate with score and skill counts, best first."""
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 18)
+    pdf.set_text_color(30, 60, 120)
+    pdf.cell(190, 12, txt=clean_text_for_pdf(title), ln=1, align="C")
+
+    pdf.set_font("Arial", size=11)
+    pdf.set_text_color(120, 120, 120)
+    stamp = (timestamp or datetime.datetime.now()).strftime("%Y-%m-%d  %H:%M")
+    pdf.cell(190, 6, txt=f"{len(candidates)} candidates - generated {stamp}", ln=1, align="C")
+    pdf.ln(4)
+
+    widths = (14, 96, 26, 27, 27)
+    header = ("#", "Candidate", "Match", "Matched", "Missing")
+
+    def header_row():
+        pdf.set_font("Arial", "B", 11)
+        pdf.set_fill_color(230, 240, 255)
+        pdf.set_text_color(20, 50, 120)
+        for w, h in zip(widths, header):
+            pdf.cell(w, 8, txt=h, border=1, fill=True, align="C")
+        pdf.ln()
+        pdf.set_font("Arial", size=10)
+        pdf.set_text_color(0, 0, 0)
+
+    header_row()
+    for rank, c in enumerate(candidates, 1):
+        if pdf.get_y() > 270:
+            pdf.add_page()
+            header_row()
+        cells = (str(rank), clean_text_for_pdf(c["candidate_name"]), f"{c['match_pct']}%",
+                 str(len(c["matched"])), str(len(c["missing"])))
+        for i, (w, text) in enumerate(zip(widths, cells)):
+            pdf.cell(w, 7, txt=text, border=1, align="L" if i == 1 else "C")
+        pdf.ln()
+
+
+def ranked(candidates):
+    # Best match first; ties keep their input order
+    return sorted(candidates, key=lambda c: -c["match_pct"])
+
+
+def build_combined_pdf(candidates, title="Candidate Ranking", workers=None, timestamp=None):
+    """One document: the ranking table, then every candidate's report in
+    ranking order, with a bookmark per candidate.
+
+    The reports are rendered in parallel (see build_reports) and merged
+    with PyMuPDF.
+    """
+    from fpdf import FPDF
+    import fitz
+
+    timestamp = timestamp or datetime.datetime.now()
+    candidates = ranked(candidates)
+
+    summary = FPDF()
+    render_ranking_table(summary, candidates, title, timestamp)
+    reports = build_reports(candidates, workers, timestamp)
+
+    with metrics.span("report_merge"):
+        doc = fitz.open(stream=bytes(summary.output()), filetype="pdf")
+        toc = [[1, clean_text_for_pdf(title), 1]]
+        for c, data in zip(candidates, reports):
+            toc.append([1, f"{c['match_pct']}% {c['candidate_name']}", doc.page_count + 1])
+            with fitz.open(stream=data, filetype="pdf") as part:
+                doc.insert_pdf(part)
+        doc.set_toc(toc)
+        out = doc.tobytes(garbage=1, deflate=True)
+        doc.close()
+    return out
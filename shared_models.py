@@ -0,0 +1,263 @@
+# shared_models.py
+#
+# Lets the worker processes on one host share a single read-only copy of the
+# encoder weights and of the SKILL_DB embedding table instead of each
+# loading its own.
+#
+# Preload-then-fork (--preload of api_server.py, batch_cli.py and
+# job_queue.py work; see pool_context): the parent imports the libraries and
+# loads the models once, then forks the workers, which share those pages
+# copy-on-write.
+#
+# Shared files, for processes that are not forked from one parent (e.g.
+# several Streamlit servers):
+#
+#   python shared_models.py export /srv/skillgap-shared
+#   SKILLGAP_SHARED_MODEL_DIR=/srv/skillgap-shared streamlit run app.py
+#
+# Every process then maps the exported weights (torch.load(mmap=True)) and
+# table (np.load(mmap_mode="r")) read-only, so the page cache holds one copy
+# for all of them. Weight sharing needs the torch encoder backend; the table
+# works with any backend.
+#
+#   python shared_models.py report --match "streamlit|api_server"   # USS / PSS per process
+
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import os
+import re
+import sys
+
+import numpy as np
+
+import encoders
+import model_registry
+
+
+SHARED_DIR = os.environ.get("SKILLGAP_SHARED_MODEL_DIR")
+
+
+# ---------- FILE LAYOUT ----------
+def _stem(directory, encoder_id):
+    return os.path.join(directory, re.sub(r"[^\w.-]+", "_", encoder_id))
+
+
+def weights_path(directory, model_name):
+    return _stem(directory, encoders.encoder_id(model_name, "torch")) + ".pt"
+
+
+def table_paths(directory, encoder_id):
+    stem = _stem(directory, encoder_id)
+    return stem + "-skills.npy", stem + "-skills.json"
+
+
+# ---------- SKILL TABLE ----------
+class SkillTable:
+    """Embeddings of a fixed skill list, memory-mapped read-only."""
+
+    def __init__(self, labels=(), vectors=None):
+        self.labels = list(labels)
+        self.vectors = vectors
+        self._row = {s: i for i, s in enumerate(self.labels)}
+
+    @classmethod
+    def load(cls, directory, encoder_id):
+        npy, names = table_paths(directory, encoder_id)
+        with open(names, encoding="utf-8") as f:
+            labels = json.load(f)
+        return cls(labels, np.load(npy, mmap_mode="r"))
+
+    def rows(self, skills):
+        """Row of every skill in the table, -1 where it is not in it."""
+        return np.array([self._row.get(s, -1) for s in skills], dtype=np.int64)
+
+
+def load_skill_table(encoder_id, directory=SHARED_DIR):
+    # An empty table when nothing was exported for this encoder
+    if directory and all(os.path.exists(p) for p in table_paths(directory, encoder_id)):
+        return SkillTable.load(directory, encoder_id)
+    return SkillTable()
+
+
+# ---------- ENCODER ----------
+def load_encoder(model_name, directory=SHARED_DIR):
+    model = encoders.load_encoder(model_name)
+    if directory and encoders.ENCODER_BACKEND == "torch":
+        path = weights_path(directory, model_name)
+        if os.path.exists(path):
+            map_weights(model, path)
+    return model
+
+
+def map_weights(model, path):
+    """Swap the model's parameters for read-only mapped views of a saved state dict."""
+    import torch
+
+    state = torch.load(path, mmap=True, weights_only=True)
+    model.load_state_dict(state, assign=True)
+    model.eval()
+    del state
+    gc.collect()
+    _release_free_heap()
+
+
+def _release_free_heap():
+    # The replaced weights are freed, but glibc keeps their pages until asked
+    try:
+        import ctypes
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+# ---------- PRELOAD-THEN-FORK ----------
+def preload(names=("sbert", "skill_table", "taxonomy_index")):
+    """Load the models in this process before forking workers from it."""
+    import nlp_utils  # noqa: F401  (registers the models)
+
+    model_registry.warm_up(names, background=False)
+    gc.collect()
+    # Objects that exist now are never scanned again, so the collector does
+    # not write to (and copy) the pages the workers share
+    gc.freeze()
+
+
+class _PreloadAction(argparse.Action):
+    def __init__(self, option_strings, dest, **kwargs):
+        super().__init__(option_strings, dest, nargs=0, default=False, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if "fork" not in mp.get_all_start_methods():
+            parser.error(f"{option_string} needs the fork start method")
+        setattr(namespace, self.dest, True)
+
+
+def add_preload_argument(parser):
+    """The --preload flag of the worker-pool entry points (see pool_context)."""
+    parser.add_argument("--preload", action=_PreloadAction,
+                        help="load the model once and fork the workers from it (shared weights)")
+
+
+def pool_context(preload_models=False, start_method=None):
+    """multiprocessing context for a worker pool.
+
+    With preload_models the models are loaded in this process first and
+    the workers are forked from it; otherwise `start_method` (None for the
+    platform default) is used.
+    """
+    if preload_models:
+        preload()
+        return mp.get_context("fork")
+    return mp.get_context(start_method)
+
+
+def init_worker():
+    """Pool initializer: one BLAS thread per process, model loaded up front."""
+    # The pool provides the parallelism
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    if "torch" in sys.modules:
+        # Forked after torch was imported, so the variable comes too late
+        sys.modules["torch"].set_num_threads(1)
+    import nlp_utils  # noqa: F401  (registers the models)
+    model_registry.warm_up(["sbert"], background=False)
+
+
+# ---------- EXPORT ----------
+def _replace(path, write):
+    # Running processes may have the old file mapped; give them a new inode
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def export(directory, model_name, skills, backend=None):
+    """Write the weights (torch backend) and the skill table; returns the paths."""
+    backend = backend or encoders.ENCODER_BACKEND
+    os.makedirs(directory, exist_ok=True)
+    model = encoders.load_encoder(model_name, backend)
+    written = []
+
+    if backend == "torch":
+        import torch
+        state = {k: v.contiguous() for k, v in model.state_dict().items()}
+        path = weights_path(directory, model_name)
+        _replace(path, lambda f: torch.save(state, f))
+        written.append(path)
+
+    labels = list(dict.fromkeys(skills))
+    vectors = model.encode(labels, convert_to_numpy=True, normalize_embeddings=True)
+    npy, names = table_paths(directory, encoders.encoder_id(model_name, backend))
+    _replace(npy, lambda f: np.save(f, vectors.astype(np.float32)))
+    _replace(names, lambda f: f.write(json.dumps(labels).encode("utf-8")))
+    return written + [npy, names]
+
+
+# ---------- MEMORY REPORT ----------
+def process_report(pattern):
+    """memory_breakdown of every process whose command line matches `pattern`."""
+    rows = []
+    for pid in sorted(int(p) for p in os.listdir("/proc") if p.isdigit()):
+        if pid == os.getpid():
+            continue
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmd = f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+        except OSError:
+            continue
+        if not cmd or not re.search(pattern, cmd):
+            continue
+        mem = model_registry.memory_breakdown(pid)
+        if mem:
+            rows.append(dict(mem, pid=pid, cmd=cmd))
+    return rows
+
+
+def _print_report(rows):
+    mib = 2**20
+    print(f"{'pid':>7} {'RSS MiB':>8} {'PSS MiB':>8} {'USS MiB':>8} {'shared MiB':>11}  command")
+    for r in rows:
+        print(f"{r['pid']:>7} {r['rss'] / mib:>8.0f} {r['pss'] / mib:>8.0f} "
+              f"{r['uss'] / mib:>8.0f} {r['shared'] / mib:>11.0f}  {r['cmd'][:60]}")
+    # Summed RSS counts shared pages once per process; summed PSS is the real total
+    print(f"{len(rows)} processes: {sum(r['rss'] for r in rows) / mib:.0f} MiB summed RSS, "
+          f"{sum(r['pss'] for r in rows) / mib:.0f} MiB summed PSS, "
+          f"{sum(r['uss'] for r in rows) / mib:.0f} MiB summed USS")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared read-only model memory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    exp = sub.add_parser("export", help="write the weights and skill table to share")
+    exp.add_argument("directory")
+    exp.add_argument("--taxonomy", help="also embed these skills (one per line)")
+
+    rep = sub.add_parser("report", help="per-process memory of running workers")
+    rep.add_argument("--match", default=r"app\.py|api_server|batch_cli",
+                     help="regex over the process command line")
+    rep.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        import nlp_utils
+        skills = list(nlp_utils.SKILL_DB)
+        if args.taxonomy:
+            skills += nlp_utils.load_taxonomy(args.taxonomy)
+        for path in export(args.directory, nlp_utils.MODEL_NAME,
+                           [nlp_utils.canonical_skill(s) for s in skills]):
+            print(path)
+        return 0
+
+    rows = process_report(args.match)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_report(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# skill_index.py
+#
+# Build a persisted index for a taxonomy file (one skill per line):
+#   python skill_index.py taxonomy.txt taxonomy_index/
+
+import json
+import os
+
+import numpy as np
+
+
+# ---------- IVF (INVERTED FILE) ANN INDEX ----------
+class SkillIndex:
+    """Approximate nearest-neighbour index over unit-length skill embeddings.
+
+    Vectors are clustered with spherical k-means; each query only scores the
+    vectors of its `nprobe` closest clusters. nprobe trades recall for
+    latency: nprobe == n_lists is an exact search.
+    """
+
+    def __init__(self, centroids, offsets, ids, vectors, labels=None):
+        self.centroids = centroids      # (n_lists, dim)
+        self.offsets = offsets          # (n_lists + 1,) start of each list in `vectors`
+        self.ids = ids                  # original row id of each stored vector
+        self.vectors = vectors          # (n, dim), grouped by list
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    # ---------- BUILD ----------
+    @classmethod
+    def build(cls, vectors, labels=None, n_lists=None, n_iter=15, seed=0):
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        n = len(vectors)
+        n_lists = n_lists or max(1, int(np.sqrt(n)))
+        n_lists = min(n_lists, n)
+
+        centroids, assign = _spherical_kmeans(vectors, n_lists, n_iter, seed)
+
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=n_lists)
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+        return cls(centroids, offsets, order.astype(np.int64),
+                   np.ascontiguousarray(vectors[order]),
+                   list(labels) if labels is not None else None)
+
+    # ---------- SEARCH ----------
+    def search(self, queries, k=1, nprobe=8):
+        """Top-k (scores, ids) for a batch of queries, both shaped (n_queries, k).
+
+        Missing neighbours (fewer than k candidates probed) have id -1.
+        """
+        queries = _as_queries(queries)
+        nq = len(queries)
+        if nq == 0:
+            return _no_results(k)
+        nprobe = min(nprobe, self.n_lists)
+
+        coarse = queries @ self.centroids.T
+        if nprobe < self.n_lists:
+            probes = np.argpartition(-coarse, nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            probes = np.tile(np.arange(self.n_lists), (nq, 1))
+
+        best_scores = np.full((nq, k), -np.inf, dtype=np.float32)
+        best_pos = np.full((nq, k), -1, dtype=np.int64)
+
+        # Visit each probed list once and score all queries that probe it together
+        flat_lists = probes.ravel()
+        flat_queries = np.repeat(np.arange(nq), nprobe)
+        order = np.argsort(flat_lists, kind="stable")
+        flat_lists, flat_queries = flat_lists[order], flat_queries[order]
+        bounds = np.flatnonzero(np.diff(flat_lists)) + 1
+
+        for qs, lst in zip(np.split(flat_queries, bounds), flat_lists[np.r_[0, bounds]]):
+            start, stop = self.offsets[lst], self.offsets[lst + 1]
+            if start == stop:
+                continue
+            scores = queries[qs] @ self.vectors[start:stop].T
+            pos = np.broadcast_to(np.arange(start, stop), scores.shape)
+
+            merged_scores = np.concatenate((best_scores[qs], scores), axis=1)
+            merged_pos = np.concatenate((best_pos[qs], pos), axis=1)
+            if merged_scores.shape[1] > k:
+                top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+                merged_scores = np.take_along_axis(merged_scores, top, axis=1)
+                merged_pos = np.take_along_axis(merged_pos, top, axis=1)
+            best_scores[qs], best_pos[qs] = merged_scores, merged_pos
+
+        return self._finish(best_scores, best_pos)
+
+    def search_exact(self, queries, k=1):
+        queries = _as_queries(queries)
+        if len(queries) == 0:
+            return _no_results(k)
+        scores = queries @ self.vectors.T
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        return self._finish(np.take_along_axis(scores, top, axis=1), top)
+
+    def _finish(self, scores, pos):
+        order = np.argsort(-scores, axis=1, kind="stable")
+        scores = np.take_along_axis(scores, order, axis=1)
+        pos = np.take_along_axis(pos, order, axis=1)
+        ids = np.where(pos >= 0, self.ids[np.maximum(pos, 0)], -1)
+        return scores, ids
+
+    # ---------- PERSISTENCE ----------
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "centroids.npy"), self.centroids)
+        np.save(os.path.join(path, "offsets.npy"), self.offsets)
+        np.save(os.path.join(path, "ids.npy"), self.ids)
+        np.save(os.path.join(path, "vectors.npy"), self.vectors)
+        with open(os.path.join(path, "labels.json"), "w", encoding="utf-8") as f:
+            json.dump(self.labels, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        # Memory-mapped arrays are shared through the page cache by every
+        # process that loads the same index
+        mode = "r" if mmap else None
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+                  for name in ("centroids", "offsets", "ids", "vectors")]
+        with open(os.path.join(path, "labels.json"), encoding="utf-8") as f:
+            labels = json.load(f)
+        return cls(*arrays, labels=labels)
+
+
+# ---------- HELPERS ----------
+def _as_queries(queries):
+    queries = np.asarray(queries, dtype=np.float32)
+    if queries.size == 0:
+        return queries.reshape(0, 0)
+    return _normalize(np.atleast_2d(queries))
+
+
+def _no_results(k):
+    return np.empty((0, k), dtype=np.float32), np.empty((0, k), dtype=np.int64)
+
+
+def _normalize(x):
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def _assign(vectors, centroids, chunk=8192):
+    out = np.empty(len(vectors), dtype=np.int64)
+    for i in range(0, len(vectors), chunk):
+        out[i:i + chunk] = np.argmax(vectors[i:i + chunk] @ centroids.T, axis=1)
+    return out
+
+
+def _spherical_kmeans(vectors, n_lists, n_iter, seed):
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assign = _assign(vectors, centroids)
+        counts = np.bincount(assign, minlength=n_lists)
+
+        # Per-list sums in one segmented reduction over list-sorted vectors
+        sums = np.zeros_like(centroids)
+        used = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts[used])[:-1]))
+        sums[used] = np.add.reduceat(vectors[np.argsort(assign, kind="stable")], starts, axis=0)
+
+        # Re-seed empty lists with random vectors so every list stays in use
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+
+        centroids = _normalize(sums)
+
+    return centroids, _assign(vectors, centroids)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build a taxonomy skill index")
+    parser.add_argument("taxonomy", help="text file with one canonical skill per line")
+    parser.add_argument("out", help="output directory")
+    parser.add_argument("--lists", type=int, help="number of IVF lists (default sqrt(n))")
+    args = parser.parse_args(argv)
+
+    from nlp_utils import load_taxonomy, build_taxonomy_index
+
+    start = time.perf_counter()
+    taxonomy = load_taxonomy(args.taxonomy)
+    index = build_taxonomy_index(taxonomy, n_lists=args.lists)
+    index.save(args.out)
+    print(f"indexed {len(index)} skills into {index.n_lists} lists "
+          f"in {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# skill_matcher.py
+
+from collections import deque
+
+
+# Characters that belong to a skill token, so "c" does not match inside
+# "c++" or "javascript" and "git" does not match inside "github".
+# Trailing digits are allowed so version suffixes ("html5", "python3") still hit.
+WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#_"
+                       "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+TRAILING_WORD_CHARS = WORD_CHARS - frozenset("0123456789")
+
+
+# ---------- AHO-CORASICK MULTI-PATTERN MATCHER ----------
+class SkillMatcher:
+    """Finds every dictionary phrase in a text in one left-to-right pass.
+
+    The automaton is built once from the dictionary; scanning costs
+    O(len(text) + number of hits) whatever the dictionary size.
+    With whole_words=True a hit only counts when it is not glued to
+    other word characters on either side.
+    """
+
+    def __init__(self, phrases, whole_words=True):
+        self.phrases = list(dict.fromkeys(p for p in phrases if p))
+        self.whole_words = whole_words
+
+        # Node 0 is the root; goto[n] maps a character to the next node
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for idx, phrase in enumerate(self.phrases):
+            node = 0
+            for ch in phrase:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] = self._out[node] + ((idx, len(phrase)),)
+
+        # Breadth-first pass to wire failure links and inherit their outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def finditer(self, text):
+        """Yield (start, end, phrase_index) for every hit, ordered by end position."""
+        goto, fail, out = self._goto, self._fail, self._out
+        whole_words = self.whole_words
+        n = len(text)
+        node = 0
+
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            if not out[node]:
+                continue
+
+            end = i + 1
+            for idx, length in out[node]:
+                start = end - length
+                if whole_words and (
+                    (start > 0 and text[start - 1] in WORD_CHARS) or
+                    (end < n and text[end] in TRAILING_WORD_CHARS)
+                ):
+                    continue
+                yield start, end, idx
+
+    def find_indices(self, text):
+        """Distinct dictionary indices found in the text, in dictionary order."""
+        return sorted({idx for _, _, idx in self.finditer(text)})
+
+    def find(self, text):
+        return [self.phrases[i] for i in self.find_indices(text)]
@@ -0,0 +1,108 @@
+# startup_profile.py
+#
+# Cold-start profile: imports the app (or given modules) in a fresh
+# interpreter under `python -X importtime` and reports wall time, peak RSS
+# and where the import time went.
+#
+#   python startup_profile.py                         # the Streamlit app, bare mode
+#   python startup_profile.py --modules nlp_utils doc_utils --top 15
+#   python startup_profile.py --json startup.json     # for tracking across versions
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+
+# Libraries the app must not import at startup (also listed on its Admin page)
+HEAVY_MODULES = ("pandas", "fitz", "docx", "fpdf", "PIL", "torch",
+                 "sentence_transformers", "transformers", "spacy", "matplotlib")
+
+CHILD = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+wall = time.perf_counter() - start
+print(json.dumps({{
+    "wall_s": round(wall, 4),
+    "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    "heavy_imported": [m for m in {heavy!r} if m in sys.modules],
+    "modules_loaded": len(sys.modules),
+}}))
+"""
+
+
+def _parse_row(line):
+    # "import time:  <self us> | <cumulative us> | <indent><module>"
+    head, cumulative, name = line.split("|", 2)
+    self_us = int(head.split(":", 1)[1])
+    depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+    return name.strip(), self_us, int(cumulative), depth
+
+
+def profile(modules, warm_up=False):
+    env = dict(os.environ)
+    if not warm_up:
+        # Keep the background model load out of the import profile
+        env["SKILLGAP_WARM_UP"] = "0"
+    code = CHILD.format(modules=list(modules), heavy=HEAVY_MODULES)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=os.path.dirname(os.path.abspath(__file__)),
+                          env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+
+    summary = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = [_parse_row(l) for l in proc.stderr.splitlines()
+            if l.startswith("import time:") and "self [us]" not in l]
+
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+
+    summary["import_s"] = round(sum(r[1] for r in rows) / 1e6, 4)
+    summary["packages"] = sorted(({"package": p, "self_ms": round(us / 1000, 2)}
+                                  for p, us in by_package.items()),
+                                 key=lambda r: -r["self_ms"])
+    summary["top_level"] = sorted(({"module": n, "cumulative_ms": round(c / 1000, 2)}
+                                   for n, _, c, depth in rows if depth == 0),
+                                  key=lambda r: -r["cumulative_ms"])
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time and memory profile of a cold start")
+    parser.add_argument("--modules", nargs="+", default=["app"],
+                        help="modules to import (default: the Streamlit app)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--warm-up", action="store_true",
+                        help="let the app start its background model load")
+    parser.add_argument("--json", help="also write the full profile here")
+    args = parser.parse_args(argv)
+
+    result = profile(args.modules, args.warm_up)
+
+    print(f"cold start: {result['wall_s'] * 1000:.0f} ms wall, "
+          f"{result['import_s'] * 1000:.0f} ms in imports, "
+          f"{result['max_rss_mib']:.0f} MiB peak RSS, {result['modules_loaded']} modules")
+    print(f"heavy libraries imported: {', '.join(result['heavy_imported']) or 'none'}")
+
+    print(f"\n{'package':<28} {'self ms':>9}")
+    for r in result["packages"][:args.top]:
+        print(f"{r['package']:<28} {r['self_ms']:>9.1f}")
+
+    print(f"\n{'top-level import':<28} {'cumulative ms':>14}")
+    for r in result["top_level"][:args.top]:
+        print(f"{r['module']:<28} {r['cumulative_ms']:>14.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())